@@ -8,7 +8,7 @@ from django.forms import Media
 from django.http import HttpRequest
 from django.template.loader import render_to_string
 from django.templatetags.static import static
-from django.urls import NoReverseMatch, reverse
+from django.urls import NoReverseMatch, URLPattern, path, reverse
 from django.utils.html import format_html
 from django.utils.safestring import SafeString
 from wagtail import hooks
@@ -96,6 +96,31 @@ def register_partners_menu_item() -> MenuItem:
     )
 
 
+class ImportSnippetsMenuItem(MenuItem):
+    def is_shown(self, request: HttpRequest) -> bool:
+        from apps.cms_integration.admin_views import can_import  # noqa: WPS433
+
+        return can_import(request.user)
+
+
+@hooks.register("register_admin_urls")
+def register_import_snippets_url() -> list[URLPattern]:
+    from apps.cms_integration.admin_views import ImportSnippetsView  # noqa: WPS433
+
+    return [path("import-snippets/", ImportSnippetsView.as_view(), name="odin_import_snippets")]
+
+
+@hooks.register("register_admin_menu_item")
+def register_import_snippets_menu_item() -> MenuItem:
+    return ImportSnippetsMenuItem(
+        "Import",
+        safe_reverse("odin_import_snippets"),
+        icon_name="upload",
+        order=212,
+        classname="odin-menu-import",
+    )
+
+
 @hooks.register("construct_main_menu")
 def clean_sidebar_menu(_request: Any, menu_items: list[Any]) -> None:
     hidden = {"help", "reports"}
@@ -0,0 +1,69 @@
+"""
+Wagtail admin views (registered in apps/admin_branding/wagtail_hooks.py).
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django import forms
+from django.core.exceptions import PermissionDenied
+from django.http import HttpRequest, HttpResponse
+from django.views.generic import FormView
+from wagtail.admin.views.generic import WagtailAdminTemplateMixin
+
+from . import importing
+
+
+def can_import(user: Any, model_key: str | None = None) -> bool:
+    """
+    Importing creates and changes snippets, so both permissions are required.
+    """
+    keys = [model_key] if model_key else list(importing.SPECS)
+    for key in keys:
+        opts = importing.SPECS[key].model._meta
+        if user.has_perm(f"{opts.app_label}.add_{opts.model_name}") and user.has_perm(
+            f"{opts.app_label}.change_{opts.model_name}"
+        ):
+            return True
+    return False
+
+
+class SnippetImportForm(forms.Form):
+    model = forms.ChoiceField(
+        choices=[(key, spec.model._meta.verbose_name_plural.title()) for key, spec in importing.SPECS.items()]
+    )
+    file = forms.FileField(help_text="CSV with a header row, JSON Lines (.jsonl) or a JSON array (.json).")
+    dry_run = forms.BooleanField(required=False, label="Dry run", help_text="Validate only; nothing is saved.")
+
+
+class ImportSnippetsView(WagtailAdminTemplateMixin, FormView):
+    form_class = SnippetImportForm
+    template_name = "cms_integration/admin/import_snippets.html"
+    page_title = "Import snippets"
+    header_icon = "upload"
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if not can_import(request.user):
+            raise PermissionDenied
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context["submit_button_label"] = "Import"
+        context["submit_button_active_label"] = "Importing…"
+        return context
+
+    def form_valid(self, form: SnippetImportForm) -> HttpResponse:
+        key = form.cleaned_data["model"]
+        if not can_import(self.request.user, key):
+            raise PermissionDenied
+
+        upload = form.cleaned_data["file"]
+        report = importing.import_file(
+            importing.SPECS[key],
+            upload.file,
+            importing.detect_format(upload.name),
+            dry_run=form.cleaned_data["dry_run"],
+        )
+        return self.render_to_response(self.get_context_data(form=form, report=report))
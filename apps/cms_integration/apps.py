@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CmsIntegrationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.cms_integration"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
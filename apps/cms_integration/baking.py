@@ -0,0 +1,309 @@
+"""
+Static "bake" mode: pre-render live pages (and routable detail pages) to disk.
+
+Files are written to ``BAKE_ROOT/<hostname>/<path>/index.html`` plus a ``.gz``
+(and ``.br`` when Brotli is installed) sibling. They are served by
+``BakedPageMiddleware`` (or directly by the web server with ``try_files``),
+with Django as the fallback whenever a file is missing.
+
+Writes are content-addressed: a file is only rewritten when the rendered bytes
+change, so re-baking after a snippet/settings edit only touches affected files.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import os
+import posixpath
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import RequestFactory
+from wagtail.models import Page, ReferenceIndex, Site, get_page_models
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.html"
+
+# Sent by the baker so BakedPageMiddleware renders live instead of serving the old file.
+BYPASS_HEADER = "X-Odin-Bake"
+
+
+@dataclass
+class BakeReport:
+    written: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+    def merge(self, other: BakeReport) -> None:
+        self.written.extend(other.written)
+        self.unchanged.extend(other.unchanged)
+        self.removed.extend(other.removed)
+        self.failed.extend(other.failed)
+
+
+def is_enabled() -> bool:
+    return bool(getattr(settings, "BAKE_ENABLED", False))
+
+
+def bake_root() -> Path:
+    return Path(getattr(settings, "BAKE_ROOT", Path(settings.BASE_DIR) / "baked"))
+
+
+# ---------------------------------------------------------------------
+# PATHS
+# ---------------------------------------------------------------------
+
+
+def file_for(hostname: str, path: str) -> Path | None:
+    """
+    Map a request path to its baked file. Returns None for unsafe/unbakeable paths.
+    """
+    if not path.startswith("/") or not path.endswith("/"):
+        return None
+
+    normalized = posixpath.normpath(path)
+    if ".." in normalized.split("/"):
+        return None
+
+    relative = normalized.strip("/")
+    return bake_root() / hostname / relative / INDEX_FILE
+
+
+def iter_page_paths(page: Page) -> Iterator[tuple[Site, str]]:
+    """
+    Yield (site, path) for a live page and every detail route it exposes.
+    """
+    specific = page.specific
+    url_parts = specific.get_url_parts()
+    if not url_parts:
+        return
+
+    site_id, _root_url, page_path = url_parts
+    if not page_path:
+        return
+
+    site = Site.objects.filter(pk=site_id).first()
+    if site is None:
+        return
+
+    yield site, page_path
+
+    get_subpaths = getattr(specific, "get_bake_subpaths", None)
+    if callable(get_subpaths):
+        for subpath in get_subpaths():
+            yield site, page_path + subpath.lstrip("/")
+
+
+def iter_snippet_paths(
+    instance: Any,
+    *,
+    slug: str | None = None,
+    listings: bool = True,
+) -> Iterator[tuple[Site, str]]:
+    """
+    Yield (site, path) for every live index page listing ``instance`` and its detail route.
+    Pass ``slug`` to target a previous slug, ``listings=False`` for detail routes only.
+    """
+    slug = slug if slug is not None else getattr(instance, "slug", "")
+    for page_model in get_page_models():
+        if getattr(page_model, "snippet_model", None) is not type(instance):
+            continue
+        for page in page_model.objects.live():
+            url_parts = page.get_url_parts()
+            if not url_parts or not url_parts[2]:
+                continue
+            site = Site.objects.filter(pk=url_parts[0]).first()
+            if site is None:
+                continue
+            if listings:
+                yield site, url_parts[2]
+            if slug:
+                yield site, url_parts[2] + page.get_snippet_subpath(slug).lstrip("/")
+
+
+def iter_tree_paths(url_path: str) -> Iterator[tuple[Site, str]]:
+    """
+    Yield (site, path) for a page ``url_path`` (e.g. a page's path before a rename/move)
+    under every site whose root page contains it. Site roots themselves are skipped.
+    """
+    for site in Site.objects.select_related("root_page"):
+        root_path = site.root_page.url_path
+        if url_path != root_path and url_path.startswith(root_path):
+            yield site, "/" + url_path[len(root_path) :]
+
+
+def pages_referencing(obj: Any) -> list[Page]:
+    """
+    Live pages whose content references ``obj`` (e.g. a snippet chosen in a StreamField).
+    """
+    page_type = ContentType.objects.get_for_model(Page)
+    page_ids = (
+        ReferenceIndex.get_references_to(obj)
+        .filter(base_content_type=page_type)
+        .values_list("object_id", flat=True)
+        .distinct()
+    )
+    return list(Page.objects.live().filter(pk__in=[int(pk) for pk in page_ids]))
+
+
+# ---------------------------------------------------------------------
+# RENDER + WRITE
+# ---------------------------------------------------------------------
+
+
+@lru_cache(maxsize=1)
+def _handler() -> WSGIHandler:
+    # The production handler (middleware loaded once); exceptions become 500 responses.
+    return WSGIHandler()
+
+
+def render_path(site: Site, path: str) -> bytes | None:
+    """
+    Render a path through the full middleware stack as an anonymous visitor.
+    """
+    request = RequestFactory().get(
+        path,
+        HTTP_HOST=site.hostname,
+        SERVER_PORT=str(site.port),
+        secure=site.port == 443,
+        headers={BYPASS_HEADER: "1"},
+    )
+    response = _handler().get_response(request)
+    if response.status_code != 200 or response.streaming:
+        logger.warning("Bake skipped %s%s (status %s)", site.hostname, path, response.status_code)
+        return None
+    return bytes(response.content)
+
+
+def _atomic_write(target: Path, content: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".bake-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(content)
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_if_changed(target: Path, content: bytes) -> bool:
+    """
+    Write ``content`` (and compressed variants) unless the file already holds it.
+    """
+    if target.exists():
+        current = hashlib.sha256(target.read_bytes()).digest()
+        if current == hashlib.sha256(content).digest():
+            return False
+
+    _atomic_write(target, content)
+    _atomic_write(target.with_name(target.name + ".gz"), gzip.compress(content, mtime=0))
+    if brotli is not None:
+        _atomic_write(target.with_name(target.name + ".br"), brotli.compress(content))
+    return True
+
+
+def remove_file(target: Path) -> bool:
+    removed = False
+    for candidate in (target, target.with_name(target.name + ".gz"), target.with_name(target.name + ".br")):
+        if candidate.exists():
+            candidate.unlink()
+            removed = True
+    return removed
+
+
+def bake_paths(targets: Iterable[tuple[Site, str]]) -> BakeReport:
+    report = BakeReport()
+    for site, path in targets:
+        label = f"{site.hostname}{path}"
+        target = file_for(site.hostname, path)
+        if target is None:
+            report.failed.append(label)
+            continue
+
+        content = render_path(site, path)
+        if content is None:
+            if remove_file(target):
+                report.removed.append(label)
+            report.failed.append(label)
+            continue
+
+        if write_if_changed(target, content):
+            report.written.append(label)
+        else:
+            report.unchanged.append(label)
+    return report
+
+
+# ---------------------------------------------------------------------
+# ENTRY POINTS (management command + publish hooks)
+# ---------------------------------------------------------------------
+
+
+def bake_pages(pages: Iterable[Page]) -> BakeReport:
+    report = BakeReport()
+    for page in pages:
+        report.merge(bake_paths(iter_page_paths(page)))
+    return report
+
+
+def bake_site() -> BakeReport:
+    """
+    Bake every live page, then drop files for paths that no longer exist.
+    """
+    pages = Page.objects.live().filter(depth__gt=1).specific()
+    targets = [target for page in pages for target in iter_page_paths(page)]
+    report = bake_paths(targets)
+
+    expected = {file_for(site.hostname, path) for site, path in targets}
+    root = bake_root()
+    if root.exists():
+        for index_file in root.rglob(INDEX_FILE):
+            if index_file not in expected and remove_file(index_file):
+                report.removed.append(str(index_file.relative_to(root)))
+    return report
+
+
+def unbake_page(page: Page) -> None:
+    for site, path in iter_page_paths(page):
+        target = file_for(site.hostname, path)
+        if target is not None:
+            remove_file(target)
+
+
+def unbake_path(site: Site, path: str) -> None:
+    target = file_for(site.hostname, path)
+    if target is not None:
+        remove_file(target)
+
+
+def unbake_tree(site: Site, path: str) -> None:
+    """
+    Drop the baked files of ``path`` and everything below it.
+    """
+    target = file_for(site.hostname, path)
+    if target is not None and path != "/":
+        shutil.rmtree(target.parent, ignore_errors=True)
+
+
+def clear() -> None:
+    """
+    Drop every baked file; Django serves everything live until the next ``bake_site``.
+    """
+    shutil.rmtree(bake_root(), ignore_errors=True)
@@ -3,6 +3,8 @@ from wagtail.documents.blocks import DocumentChooserBlock
 from wagtail.images.blocks import ImageChooserBlock
 from wagtail.snippets.blocks import SnippetChooserBlock
 
+from . import caching
+
 # ---------------------------------------------------------------------
 # HERO BLOCKS
 # ---------------------------------------------------------------------
@@ -78,6 +80,11 @@ class HeroBlock(blocks.StructBlock):
     poster_public_id = blocks.CharBlock(required=False, label="Cloudinary Poster ID")
 
     video_upload = DocumentChooserBlock(required=False, label="Upload Video (Fallback)")
+    video_upload_mobile = DocumentChooserBlock(
+        required=False,
+        label="Upload Video, mobile rendition (Fallback)",
+        help_text="Optional pre-transcoded MP4 at 720px wide or less; served to phones instead of the full video.",
+    )
     poster_upload = ImageChooserBlock(required=False, label="Upload Poster (Fallback)")
 
     extra_images = blocks.ListBlock(
@@ -109,6 +116,9 @@ class CountdownBlock(blocks.StructBlock):
     High-urgency countdown timer for ticket sales.
     """
 
+    # Template reads FlashSaleSettings, not just the block value.
+    cache_dependencies = (caching.SETTINGS,)
+
     enabled = blocks.BooleanBlock(
         required=False,
         default=True,
@@ -238,6 +248,8 @@ class SpeakerGridBlock(blocks.StructBlock):
     Displays a grid of selected speakers.
     """
 
+    cache_dependencies = (caching.SPEAKERS,)
+
     title = blocks.CharBlock(default="Meet the Legends")
     description = blocks.TextBlock(required=False)
 
@@ -262,6 +274,8 @@ class SponsorGridBlock(blocks.StructBlock):
     Static grid for Sponsors (commercial, tiered, ordered by value).
     """
 
+    cache_dependencies = (caching.SPONSORS,)
+
     title = blocks.CharBlock(default="Our Sponsors")
 
     sponsors = blocks.ListBlock(
@@ -286,6 +300,8 @@ class PartnerCarouselBlock(blocks.StructBlock):
     GSAP-powered 3D carousel for Partners.
     """
 
+    cache_dependencies = (caching.PARTNERS,)
+
     title = blocks.CharBlock(default="Community Partners")
 
     partners = blocks.ListBlock(
@@ -0,0 +1,440 @@
+"""
+Version counters + full-page response cache for public Wagtail pages.
+
+Nothing is ever deleted on invalidation: every cache key embeds the version
+counters it depends on, so bumping a counter orphans the old entries and they
+simply expire.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max, QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+# Version namespaces (bumped by apps.cms_integration.signals)
+SETTINGS = "settings"
+PAGES = "pages"
+SPEAKERS = "speakers"
+SPONSORS = "sponsors"
+PARTNERS = "partners"
+
+SNIPPETS: tuple[str, ...] = (SPEAKERS, SPONSORS, PARTNERS)
+
+# Snippet model behind each snippet namespace (labels: snippets.py imports this module).
+SNIPPET_MODELS: dict[str, str] = {
+    SPEAKERS: "cms_integration.Speaker",
+    SPONSORS: "cms_integration.Sponsor",
+    PARTNERS: "cms_integration.Partner",
+}
+
+_VERSION_PREFIX = "odin:version:"
+_CHANGED_PREFIX = "odin:changed:"
+_PAGE_PREFIX = "odin:page:"
+_PARTIAL_PREFIX = "odin:partial:"
+_STAMP_PREFIX = "odin:stamp:"
+
+# Stamps are keyed on the version token, so this only bounds how long orphans linger.
+_STAMP_TIMEOUT = 24 * 60 * 60
+
+
+def _version_key(namespace: str) -> str:
+    return f"{_VERSION_PREFIX}{namespace}"
+
+
+def get_versions(namespaces: Iterable[str]) -> dict[str, int]:
+    """
+    Fetch several version counters with one cache round trip.
+    Missing counters are seeded at 1 (never expire).
+    """
+    names = list(namespaces)
+    keys = {_version_key(n): n for n in names}
+    found = cache.get_many(list(keys))
+
+    versions: dict[str, int] = {}
+    for key, name in keys.items():
+        value = found.get(key)
+        if value is None:
+            cache.add(key, 1, timeout=None)
+            value = cache.get(key, 1)
+        versions[name] = int(value)
+    return versions
+
+
+def get_version(namespace: str) -> int:
+    return get_versions([namespace])[namespace]
+
+
+def bump_version(namespace: str) -> int:
+    # When it changed, for Last-Modified (counters alone can't answer If-Modified-Since).
+    cache.set(f"{_CHANGED_PREFIX}{namespace}", time.time(), timeout=None)
+    key = _version_key(namespace)
+    try:
+        return int(cache.incr(key))
+    except ValueError:
+        # Counter missing/evicted: any value different from the old one works.
+        cache.add(key, 2, timeout=None)
+        return int(cache.get(key, 2))
+
+
+def version_token(namespaces: Iterable[str]) -> str:
+    """
+    Compact "settings.3-pages.12" style token for embedding in cache keys.
+    """
+    versions = get_versions(namespaces)
+    return "-".join(f"{name}.{versions[name]}" for name in sorted(versions))
+
+
+# ---------------------------------------------------------------------
+# FULL-PAGE CACHE
+# ---------------------------------------------------------------------
+
+
+def page_cache_timeout() -> int:
+    return int(getattr(settings, "PAGE_CACHE_TIMEOUT", 0))
+
+
+def is_public_request(request: HttpRequest) -> bool:
+    """
+    Anonymous, side-effect free request for the public rendering of a page.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if getattr(request, "is_preview", False):
+        return False
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return False
+    return True
+
+
+def _scan_deploy_files() -> tuple[str, datetime]:
+    base_dir = Path(settings.BASE_DIR)
+    files = [base_dir / "templates", *sorted(base_dir.glob("apps/*/templates"))]
+    paths = [path for root in files for path in sorted(root.rglob("*.html"))]
+    paths.append(Path(settings.STATIC_ROOT) / "staticfiles.json")
+
+    digest = hashlib.sha1(str(getattr(settings, "BLOCK_CACHE_VERSION", "")).encode())
+    newest = 0.0
+    for path in paths:
+        if path.is_file():
+            digest.update(path.read_bytes())
+            newest = max(newest, path.stat().st_mtime)
+    return digest.hexdigest(), datetime.fromtimestamp(newest, tz=timezone.utc)
+
+
+_release_deploy_token = lru_cache(maxsize=1)(_scan_deploy_files)
+
+
+def deploy_token() -> tuple[str, datetime]:
+    """
+    (hash, newest mtime) of the project templates and the staticfiles manifest.
+
+    Part of every page validator and cache key, so a deploy that changes markup or
+    asset URLs doesn't answer 304 with the previous release's HTML. Computed once
+    per process, except with DEBUG on, where templates are edited under runserver.
+    """
+    if settings.DEBUG:
+        return _scan_deploy_files()
+    return _release_deploy_token()
+
+
+def is_cacheable_request(request: HttpRequest) -> bool:
+    """
+    Only anonymous, side-effect free requests are served from / stored in the page cache.
+    """
+    return page_cache_timeout() > 0 and is_public_request(request)
+
+
+def page_cache_key(request: HttpRequest, page: Any, namespaces: Iterable[str]) -> str:
+    """
+    Key = page + live revision + request path + every dependency version + deploy token.
+
+    The deploy token keeps a new release (templates, asset URLs) from being served
+    the previous release's cached HTML under its own ETag.
+    """
+    raw = "|".join(
+        [
+            str(page.pk),
+            str(page.live_revision_id or ""),
+            request.get_host(),
+            request.get_full_path(),
+            version_token(namespaces),
+            deploy_token()[0],
+        ]
+    )
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return f"{_PAGE_PREFIX}{digest}"
+
+
+def get_cached_response(key: str) -> HttpResponse | None:
+    payload = cache.get(key)
+    if payload is None:
+        return None
+
+    content, content_type = payload
+    response = HttpResponse(content, content_type=content_type)
+    response["X-Page-Cache"] = "HIT"
+    return response
+
+
+def store_response(key: str, response: HttpResponse) -> None:
+    """
+    Cache a rendered 200 response. Responses that set cookies are never cached.
+    """
+    if response.status_code != 200 or response.cookies or response.streaming:
+        return
+
+    render = getattr(response, "render", None)
+    if callable(render):
+        render()
+
+    cache.set(key, (response.content, response["Content-Type"]), timeout=page_cache_timeout())
+    response["X-Page-Cache"] = "MISS"
+
+
+# ---------------------------------------------------------------------
+# CONDITIONAL GET
+# ---------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Validators:
+    etag: str
+    last_modified: datetime | None
+
+    def not_modified(self, request: HttpRequest) -> HttpResponse | None:
+        """
+        304 (or 412) when the request's If-None-Match / If-Modified-Since still match.
+        """
+        timestamp = int(self.last_modified.timestamp()) if self.last_modified else None
+        response = get_conditional_response(request, etag=self.etag, last_modified=timestamp)
+        if response is not None and response.status_code == 304:
+            self._set_headers(response)
+        return response
+
+    def _set_headers(self, response: HttpResponse) -> None:
+        response["ETag"] = self.etag
+        if self.last_modified:
+            response["Last-Modified"] = http_date(self.last_modified.timestamp())
+        # Revalidate every time: without it, Last-Modified would allow heuristic caching.
+        if "Cache-Control" not in response:
+            patch_cache_control(response, no_cache=True)
+
+    def apply(self, response: HttpResponse) -> HttpResponse:
+        if response.status_code == 200 and not response.cookies:
+            self._set_headers(response)
+        return response
+
+
+def snippet_model(namespace: str) -> Any:
+    return apps.get_model(SNIPPET_MODELS[namespace])
+
+
+def snippet_stamp(queryset: QuerySet[Any]) -> tuple[datetime | None, int]:
+    """
+    (latest ``updated_at``, row count) in one query; the count catches deletions.
+    """
+    row = queryset.aggregate(latest=Max("updated_at"), count=Count("pk"))
+    return row["latest"], row["count"]
+
+
+def snippet_stamps(querysets: Iterable[QuerySet[Any]], token: str) -> list[tuple[datetime | None, int]]:
+    """
+    ``snippet_stamp`` of each queryset, cached under the dependency version ``token``.
+
+    Every snippet save/delete (and every import) bumps a counter in the token, so the
+    aggregates only run on the first request after a change, not on every hit or 304.
+    """
+    keyed = [
+        (f"{_STAMP_PREFIX}{hashlib.sha1(f'{token}|{queryset.query}'.encode('utf-8')).hexdigest()}", queryset)
+        for queryset in querysets
+    ]
+    found = cache.get_many([key for key, _queryset in keyed])
+    fresh = {key: snippet_stamp(queryset) for key, queryset in keyed if key not in found}
+    if fresh:
+        cache.set_many(fresh, timeout=_STAMP_TIMEOUT)
+    return [found.get(key) or fresh[key] for key, _queryset in keyed]
+
+
+def _changed_at(namespaces: Iterable[str]) -> list[datetime]:
+    found = cache.get_many([f"{_CHANGED_PREFIX}{name}" for name in namespaces])
+    return [datetime.fromtimestamp(value, tz=timezone.utc) for value in found.values()]
+
+
+def page_validators(
+    request: HttpRequest, page: Any, namespaces: Iterable[str], snippets: Iterable[QuerySet[Any]]
+) -> Validators:
+    """
+    ETag/Last-Modified for a page response, computed without rendering it.
+
+    Combines the live revision and publish date, the dependency version counters
+    (settings, pages, snippets), the latest ``updated_at`` + count of ``snippets``
+    (cached per version, see ``snippet_stamps``) and the deploy token.
+    """
+    names = list(namespaces)
+    token = version_token(names)
+    stamps = snippet_stamps(snippets, token)
+    release, deployed_at = deploy_token()
+    raw = "|".join(
+        [
+            str(page.pk),
+            str(page.live_revision_id or ""),
+            page.last_published_at.isoformat() if page.last_published_at else "",
+            request.get_host(),
+            request.get_full_path(),
+            token,
+            *(f"{latest.isoformat() if latest else ''}:{count}" for latest, count in stamps),
+            release,
+        ]
+    )
+    candidates = [page.last_published_at, deployed_at, *(latest for latest, _count in stamps), *_changed_at(names)]
+    return Validators(
+        etag=f'"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"',
+        last_modified=max((value for value in candidates if value is not None), default=None),
+    )
+
+
+# ---------------------------------------------------------------------
+# HTMX PARTIALS
+# ---------------------------------------------------------------------
+
+
+def partial_cache_timeout() -> int:
+    return int(getattr(settings, "PARTIAL_CACHE_TIMEOUT", 0))
+
+
+def partial_validators(
+    request: HttpRequest, name: str, namespaces: Iterable[str], params: Mapping[str, str]
+) -> tuple[str, Validators]:
+    """
+    (cache key, validators) for an HTMX partial: endpoint + the parameters it reads + dependency versions.
+
+    ``params`` holds only what the view actually uses (normalized), so cache-busting
+    or tracking query strings (``?utm_source=``, ``?_=``) share one entry.
+    """
+    names = list(namespaces)
+    release, deployed_at = deploy_token()
+    raw = "|".join(
+        [
+            name,
+            request.get_host(),
+            "htmx" if request.headers.get("HX-Request") == "true" else "",
+            "&".join(f"{key}={value}" for key, value in sorted(params.items())),
+            version_token(names),
+            release,
+        ]
+    )
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    changed = _changed_at(names)
+    return f"{_PARTIAL_PREFIX}{digest}", Validators(
+        etag=f'"{digest}"',
+        last_modified=max([deployed_at, *changed]),
+    )
+
+
+def cached_partial(
+    request: HttpRequest,
+    name: str,
+    namespaces: Iterable[str],
+    render: Callable[[], HttpResponse],
+    params: Mapping[str, str] | None = None,
+) -> HttpResponse:
+    """
+    Serve the partial ``render()`` produces from the cache, keyed on ``params`` and its dependency versions.
+
+    A matching If-None-Match/If-Modified-Since gets a 304 before the cache lookup.
+    Responses are public (identical for every visitor): browsers revalidate, shared
+    caches may hold them for ``PARTIAL_CDN_MAX_AGE`` seconds and then serve them stale
+    while revalidating. They vary on HX-Request, which is part of the key.
+    """
+    key, validators = partial_validators(request, name, namespaces, params or {})
+    response = validators.not_modified(request)
+    if response is None:
+        payload = cache.get(key) if request.method in ("GET", "HEAD") else None
+        if payload is not None:
+            response = HttpResponse(payload[0], content_type=payload[1])
+            response["X-Partial-Cache"] = "HIT"
+        else:
+            response = render()
+            if callable(getattr(response, "render", None)):
+                response.render()  # type: ignore[attr-defined]
+            if response.status_code == 200 and not response.cookies and partial_cache_timeout() > 0:
+                cache.set(key, (response.content, response["Content-Type"]), timeout=partial_cache_timeout())
+                response["X-Partial-Cache"] = "MISS"
+
+    cdn_max_age = int(getattr(settings, "PARTIAL_CDN_MAX_AGE", 0))
+    patch_cache_control(
+        response, public=True, max_age=0, s_maxage=cdn_max_age, stale_while_revalidate=cdn_max_age * 10
+    )
+    patch_vary_headers(response, ("HX-Request",))
+    return validators.apply(response) if response.status_code == 200 else response
+
+
+# ---------------------------------------------------------------------
+# STREAMFIELD FRAGMENT CACHE
+# ---------------------------------------------------------------------
+
+_BLOCK_PREFIX = "odin:block:"
+
+# Blocks without an explicit ``cache_dependencies`` attribute may still link to pages
+# (CTA buttons, rich text links), so page moves/publishes invalidate them.
+DEFAULT_BLOCK_DEPENDENCIES: tuple[str, ...] = (PAGES,)
+
+
+def block_cache_timeout() -> int:
+    return int(getattr(settings, "BLOCK_CACHE_TIMEOUT", 0))
+
+
+@lru_cache(maxsize=64)
+def template_fingerprint(template_name: str) -> str:
+    """
+    Hash of a block template's source, so template edits invalidate fragments on deploy.
+    """
+    try:
+        source = get_template(template_name).template.source  # type: ignore[attr-defined]
+    except (TemplateDoesNotExist, AttributeError):
+        source = template_name
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+
+
+def block_cache_key(raw_item: Mapping[str, Any], block: Any, versions: Mapping[str, int]) -> str:
+    """
+    Key = block id + hash of its raw JSON value + template version + dependency versions + deploy token.
+
+    ``template_fingerprint`` only covers the block's own template; the deploy token
+    also covers what it includes (card partials) and the asset URLs it renders.
+    """
+    dependencies = getattr(block, "cache_dependencies", DEFAULT_BLOCK_DEPENDENCIES)
+    template_name = getattr(block.meta, "template", None) or ""
+
+    raw_value = json.dumps(raw_item.get("value"), sort_keys=True, cls=DjangoJSONEncoder)
+    raw = "|".join(
+        [
+            str(raw_item.get("type", "")),
+            str(raw_item.get("id", "")),
+            hashlib.sha1(raw_value.encode("utf-8")).hexdigest(),
+            str(getattr(settings, "BLOCK_CACHE_VERSION", "")),
+            template_fingerprint(template_name) if template_name else "",
+            deploy_token()[0],
+            "-".join(f"{name}.{versions[name]}" for name in sorted(dependencies)),
+        ]
+    )
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return f"{_BLOCK_PREFIX}{digest}"
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.http import HttpRequest
+from django.utils.functional import SimpleLazyObject
+
+from .settings_bundle import get_settings_bundle
+
+
+def site_settings(request: HttpRequest) -> dict[str, Any]:
+    """
+    Expose the cached settings bundle as ``site_settings`` (default site, like
+    ``{% get_settings use_default_site=True %}``). Lazy: admin views never load it.
+    """
+    return {"site_settings": SimpleLazyObject(get_settings_bundle)}
@@ -0,0 +1,468 @@
+"""
+Bulk import of speakers, sponsors and partners from CSV / JSON Lines / JSON.
+
+The file is parsed as a stream and handled in batches. Per batch:
+
+* rows are cleaned with the model fields' own validators and slugged with the
+  snippet's ``build_slug()`` (the same rule ``clean()`` applies in the admin);
+* existing rows are matched on the case-insensitive unique constraint
+  (``uniq_speaker_name_company_ci`` / ``uniq_sponsor_name_ci`` / ...) and on
+  slug with **one** query;
+* new rows go in with ``bulk_create``, changed rows with ``bulk_update``; both are
+  then added to Wagtail's search index in bulk (admin snippet chooser);
+* headshots/logos given as URLs are uploaded to Cloudinary by a bounded
+  thread pool under a deterministic public id (``<folder>/<slug>``).
+
+Re-running the same file is a no-op: rows match their earlier import, unchanged
+rows are not written and media is only uploaded while the public id is empty.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+from wagtail.search.backends import get_search_backends
+
+from apps.core import placeholders, presets
+
+from . import baking, caching, uploads
+from .snippets import Partner, Speaker, Sponsor
+from .utils.cloudinary_upload import UploadedAsset, upload_file_to_cloudinary
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_WORKERS = 4
+
+FORMATS = ("csv", "jsonl", "json")
+
+_JSON_CHUNK = 64 * 1024
+_TRUE = {"1", "true", "yes", "y", "on"}
+_FALSE = {"", "0", "false", "no", "n", "off"}
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    model: type[models.Model]
+    namespace: str
+    key_fields: tuple[str, ...]
+    fields: tuple[str, ...]
+    media_column: str
+
+
+SPECS: dict[str, ImportSpec] = {
+    "speakers": ImportSpec(
+        model=Speaker,
+        namespace=caching.SPEAKERS,
+        key_fields=("name", "company"),
+        fields=("name", "role", "company", "photo_public_id", "linkedin_url", "is_keynote"),
+        media_column="photo_url",
+    ),
+    "sponsors": ImportSpec(
+        model=Sponsor,
+        namespace=caching.SPONSORS,
+        key_fields=("name",),
+        fields=("name", "tier", "logo_public_id", "website"),
+        media_column="logo_url",
+    ),
+    "partners": ImportSpec(
+        model=Partner,
+        namespace=caching.PARTNERS,
+        key_fields=("name",),
+        fields=("name", "type", "logo_public_id", "website"),
+        media_column="logo_url",
+    ),
+}
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    uploaded: int = 0
+    failed: list[tuple[int, str]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def fail(self, line: int, message: str) -> None:
+        self.failed.append((line, message))
+
+
+# ---------------------------------------------------------------------
+# STREAMING READERS (yield (line number, row dict))
+# ---------------------------------------------------------------------
+
+
+def detect_format(name: str) -> str:
+    suffix = Path(name).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix == ".json":
+        return "json"
+    return "csv"
+
+
+def _iter_csv(stream: IO[str]) -> Iterator[tuple[int, dict[str, Any]]]:
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {key.strip(): value for key, value in row.items() if key}
+
+
+def _iter_jsonl(stream: IO[str]) -> Iterator[tuple[int, dict[str, Any]]]:
+    for line_no, line in enumerate(stream, start=1):
+        if line.strip():
+            yield line_no, json.loads(line)
+
+
+def _iter_json_array(stream: IO[str]) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Items of a top-level JSON array, decoded one at a time from fixed-size chunks.
+    The "line number" is the item's position in the array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = stream.read(_JSON_CHUNK).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("Expected a JSON array of objects.")
+    buffer = buffer[1:]
+    eof = False
+    position = 0
+    while True:
+        buffer = buffer.lstrip().lstrip(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = stream.read(_JSON_CHUNK)
+            eof = not chunk
+            buffer += chunk
+            continue
+        position += 1
+        yield position, item
+        buffer = buffer[end:]
+        if len(buffer) < _JSON_CHUNK and not eof:
+            chunk = stream.read(_JSON_CHUNK)
+            eof = not chunk
+            buffer += chunk
+
+
+def iter_rows(stream: IO[str], fmt: str) -> Iterator[tuple[int, dict[str, Any]]]:
+    readers = {"csv": _iter_csv, "jsonl": _iter_jsonl, "json": _iter_json_array}
+    return readers[fmt](stream)
+
+
+def _batched(rows: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    batch: list[Any] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------------------------------------------------------------------
+# ROW CLEANING
+# ---------------------------------------------------------------------
+
+
+def _clean_value(model_field: models.Field, raw: Any) -> Any:
+    if isinstance(raw, str):
+        raw = raw.strip()
+    if isinstance(model_field, models.BooleanField) and isinstance(raw, str):
+        lowered = raw.lower()
+        if lowered not in _TRUE | _FALSE:
+            raise ValidationError(f"'{raw}' is not a yes/no value.")
+        raw = lowered in _TRUE
+    if isinstance(model_field, models.CharField) and model_field.choices and isinstance(raw, str):
+        raw = raw.lower()
+    if raw is None:
+        raw = model_field.get_default()
+    if raw == "" and not model_field.blank:
+        raw = model_field.get_default()
+    return model_field.clean(raw, None)
+
+
+def clean_row(spec: ImportSpec, row: dict[str, Any]) -> tuple[dict[str, Any], str]:
+    """
+    (field values, media source) for ``row``. Columns missing from the file keep their
+    current value on update, so only the columns present are returned.
+    """
+    values: dict[str, Any] = {}
+    errors: list[str] = []
+    for name in spec.fields:
+        if name not in row:
+            continue
+        try:
+            values[name] = _clean_value(spec.model._meta.get_field(name), row[name])
+        except ValidationError as exc:
+            errors.append(f"{name}: {'; '.join(exc.messages)}")
+    for name in spec.key_fields:
+        if name not in values and not any(error.startswith(f"{name}:") for error in errors):
+            errors.append(f"{name}: This field is required.")
+    if errors:
+        raise ValidationError(errors)
+    return values, str(row.get(spec.media_column) or "").strip()
+
+
+def natural_key(spec: ImportSpec, values: dict[str, Any]) -> tuple[str, ...]:
+    return tuple(str(values.get(name, "")).lower() for name in spec.key_fields)
+
+
+def _suffixed_slug(slug: str, key: tuple[str, ...]) -> str:
+    # Deterministic, so a re-run of the same file picks the same slug.
+    digest = hashlib.sha1("|".join(key).encode("utf-8")).hexdigest()[:6]
+    return f"{slug[:248]}-{digest}"
+
+
+# ---------------------------------------------------------------------
+# BATCH
+# ---------------------------------------------------------------------
+
+
+def _load_existing(
+    spec: ImportSpec, keys: set[tuple[str, ...]], slugs: set[str]
+) -> tuple[dict[tuple[str, ...], Any], set[str]]:
+    """
+    One query: rows matching any natural key (case-insensitive) or candidate slug.
+    """
+    annotations = {f"_key_{name}": Lower(name) for name in spec.key_fields}
+    by_key = Q(**{f"_key_{name}__in": {key[i] for key in keys} for i, name in enumerate(spec.key_fields)})
+    queryset = spec.model._default_manager.annotate(**annotations).filter(by_key | Q(slug__in=slugs))
+
+    existing: dict[tuple[str, ...], Any] = {}
+    taken_slugs: set[str] = set()
+    for obj in queryset:
+        taken_slugs.add(obj.slug)
+        key = tuple(getattr(obj, f"_key_{name}") for name in spec.key_fields)
+        if key in keys:
+            existing[key] = obj
+    return existing, taken_slugs
+
+
+def _upload_media(
+    spec: ImportSpec, pending: list[tuple[int, Any, str]], workers: int, report: ImportReport
+) -> list[Any]:
+    """
+    Upload ``(line, instance, source)`` media in parallel; returns the instances that got a public id.
+    """
+    model = spec.model
+    folder = model.cloudinary_folder  # type: ignore[attr-defined]
+    public_id_field = model.cloudinary_public_id_field  # type: ignore[attr-defined]
+    eager = presets.derivatives_for(model.cloudinary_presets)  # type: ignore[attr-defined]
+
+    def upload(item: tuple[int, Any, str]) -> tuple[UploadedAsset, placeholders.Placeholder | None]:
+        _line, instance, source = item
+        uploaded = upload_file_to_cloudinary(
+            source,
+            folder=folder,
+            public_id=instance.slug,
+            eager=eager,
+            eager_async=uploads.eager_async(),
+        )
+        try:
+            placeholder = placeholders.for_public_id(uploaded.public_id)
+        except Exception:  # left for the upload worker's backfill
+            placeholder = None
+        return uploaded, placeholder
+
+    done: list[Any] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [(item, executor.submit(upload, item)) for item in pending]
+        for (line, instance, source), future in futures:
+            try:
+                uploaded, placeholder = future.result()
+            except Exception as exc:  # one bad URL must not abort the batch
+                report.fail(line, f"media upload failed ({source}): {type(exc).__name__}: {exc}")
+                continue
+            uploads.record_derivatives(uploaded.public_id, uploaded.derivatives)
+            setattr(instance, public_id_field, uploaded.public_id)
+            instance.upload_status = uploads.UploadStatus.DONE
+            if placeholder is not None:
+                instance.set_placeholder(placeholder.lqip, placeholder.color)
+            done.append(instance)
+    return done
+
+
+def _update_search_index(model: type[models.Model], instances: list[Any]) -> None:
+    """
+    bulk_create/bulk_update skip the post_save hook that keeps Wagtail's search index
+    current; add the written rows with one bulk call per backend instead.
+    """
+    if not instances:
+        return
+    for backend in get_search_backends(with_auto_update=True):
+        try:
+            backend.add_bulk(model, instances)
+        except Exception:
+            # Same policy as wagtail.search.index.insert_or_update_object.
+            logger.exception("Could not index %d imported %s rows", len(instances), model._meta.verbose_name)
+            if not backend.catch_indexing_errors:
+                raise
+
+
+def import_batch(
+    spec: ImportSpec,
+    batch: list[tuple[int, dict[str, Any]]],
+    report: ImportReport,
+    *,
+    workers: int = DEFAULT_WORKERS,
+    dry_run: bool = False,
+) -> None:
+    model = spec.model
+    public_id_field = model.cloudinary_public_id_field  # type: ignore[attr-defined]
+
+    # Clean; a later row with the same natural key wins.
+    cleaned: dict[tuple[str, ...], tuple[int, dict[str, Any], str]] = {}
+    for line, row in batch:
+        report.rows += 1
+        if not isinstance(row, dict):
+            report.fail(line, "expected an object with column names as keys.")
+            continue
+        try:
+            values, media = clean_row(spec, row)
+        except ValidationError as exc:
+            report.fail(line, "; ".join(exc.messages))
+            continue
+        cleaned[natural_key(spec, values)] = (line, values, media)
+
+    candidates: dict[tuple[str, ...], Any] = {}
+    for key, (_line, values, _media) in cleaned.items():
+        candidates[key] = model(**values)
+    existing, taken_slugs = _load_existing(
+        spec, set(cleaned), {instance.build_slug() for instance in candidates.values()}  # type: ignore[attr-defined]
+    )
+
+    to_create: list[Any] = []
+    to_update: list[Any] = []
+    update_fields: set[str] = set()
+    media_jobs: list[tuple[int, Any, str]] = []
+
+    for key, (line, values, media) in cleaned.items():
+        instance = existing.get(key)
+        if instance is None:
+            instance = candidates[key]
+            slug = instance.build_slug()
+            if not slug:
+                report.fail(line, "name does not produce a usable slug.")
+                continue
+            if slug in taken_slugs:
+                slug = _suffixed_slug(slug, key)
+            taken_slugs.add(slug)
+            instance.slug = slug
+            to_create.append(instance)
+        else:
+            changed = [name for name, value in values.items() if getattr(instance, name) != value]
+            for name in changed:
+                setattr(instance, name, values[name])
+            if changed:
+                if public_id_field in changed:
+                    # The placeholder belonged to the old image; the upload worker recomputes it.
+                    changed += instance.set_placeholder()
+                update_fields.update(changed)
+                to_update.append(instance)
+            else:
+                report.unchanged += 1
+
+        if media and not getattr(instance, public_id_field):
+            media_jobs.append((line, instance, media))
+
+    if not dry_run:
+        # bulk_update skips auto_now; the page validators read updated_at.
+        now = timezone.now()
+        for instance in to_update:
+            instance.updated_at = now
+        update_fields.add("updated_at")
+        try:
+            with transaction.atomic():
+                model._default_manager.bulk_create(to_create, batch_size=DEFAULT_BATCH_SIZE)
+                if to_update:
+                    model._default_manager.bulk_update(to_update, sorted(update_fields), batch_size=DEFAULT_BATCH_SIZE)
+        except IntegrityError as exc:
+            # e.g. a case-folding difference between Python and the database; the batch is rolled back.
+            for line, _values, _media in cleaned.values():
+                report.fail(line, f"batch rolled back: {exc}")
+            return
+
+    report.created += len(to_create)
+    report.updated += len(to_update)
+    if dry_run:
+        return
+
+    _update_search_index(model, to_create + to_update)
+
+    # Network work happens outside the transaction; the write-back is one more bulk_update.
+    if media_jobs:
+        uploaded = _upload_media(spec, media_jobs, workers, report)
+        now = timezone.now()
+        for instance in uploaded:
+            instance.updated_at = now
+        model._default_manager.bulk_update(
+            uploaded,
+            [public_id_field, "upload_status", "placeholder_lqip", "placeholder_color", "updated_at"],
+        )
+        report.uploaded += len(uploaded)
+
+
+def import_rows(
+    spec: ImportSpec,
+    rows: Iterable[tuple[int, dict[str, Any]]],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    dry_run: bool = False,
+) -> ImportReport:
+    """
+    Import ``(line, row)`` pairs in batches. bulk_create/bulk_update send no signals,
+    so the snippet cache version is bumped (and the site re-baked) once at the end.
+    """
+    report = ImportReport()
+    started = time.perf_counter()
+    try:
+        for batch in _batched(rows, max(1, batch_size)):
+            import_batch(spec, batch, report, workers=workers, dry_run=dry_run)
+    except (ValueError, csv.Error) as exc:
+        # Malformed file (bad JSON, broken CSV quoting): keep what was imported so far.
+        report.fail(report.rows + 1, f"unreadable input: {exc}")
+    finally:
+        report.elapsed = time.perf_counter() - started
+        if not dry_run and (report.created or report.updated or report.uploaded):
+            caching.bump_version(spec.namespace)
+            if baking.is_enabled():
+                transaction.on_commit(baking.bake_site)
+    return report
+
+
+def import_file(
+    spec: ImportSpec,
+    stream: IO[bytes],
+    fmt: str,
+    **options: Any,
+) -> ImportReport:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        return import_rows(spec, iter_rows(text, fmt), **options)
+    finally:
+        text.detach()
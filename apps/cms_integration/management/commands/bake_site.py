@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from wagtail.models import Page
+
+from apps.cms_integration import baking
+
+
+class Command(BaseCommand):
+    help = "Pre-render live pages and snippet detail routes to BAKE_ROOT (only changed files are rewritten)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--page",
+            type=int,
+            action="append",
+            dest="page_ids",
+            help="Only bake this page id (and its detail routes). Repeatable.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete the whole bake directory before baking.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["clear"]:
+            baking.clear()
+
+        started = time.perf_counter()
+        if options["page_ids"]:
+            pages = Page.objects.live().filter(pk__in=options["page_ids"]).specific()
+            report = baking.bake_pages(pages)
+        else:
+            report = baking.bake_site()
+        elapsed = time.perf_counter() - started
+
+        for label in report.failed:
+            self.stderr.write(self.style.WARNING(f"failed: {label}"))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Baked into {baking.bake_root()} in {elapsed:.1f}s: "
+                f"{len(report.written)} written, {len(report.unchanged)} unchanged, "
+                f"{len(report.removed)} removed, {len(report.failed)} failed."
+            )
+        )
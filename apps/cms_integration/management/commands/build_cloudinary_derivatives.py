@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.cms_integration import uploads
+from apps.cms_integration.pages import HomePage
+from apps.cms_integration.snippets import Partner, Speaker, Sponsor
+from apps.core import presets
+
+
+def _targets() -> Iterator[tuple[str, tuple[str, ...]]]:
+    """
+    (public id, preset names) for every Cloudinary asset the templates render.
+    """
+    for model in (Speaker, Sponsor, Partner):
+        public_ids = (
+            model._default_manager.exclude(**{model.cloudinary_public_id_field: ""})
+            .values_list(model.cloudinary_public_id_field, flat=True)
+            .distinct()
+        )
+        for public_id in public_ids:
+            yield public_id, model.cloudinary_presets
+
+    # Hero posters are entered as public ids, so they never go through the upload worker.
+    for body in HomePage.objects.values_list("body", flat=True):
+        for item in body.raw_data if hasattr(body, "raw_data") else body or []:
+            if item.get("type") == "hero" and (item.get("value") or {}).get("poster_public_id"):
+                yield item["value"]["poster_public_id"], ("hero_poster",)
+
+
+class Command(BaseCommand):
+    help = "Eagerly build the preset derivatives of existing Cloudinary assets that don't have them yet."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many derivatives are missing.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        assets = built = failed = 0
+        for public_id, preset_names in _targets():
+            assets += 1
+            if options["dry_run"]:
+                missing = uploads.missing_derivatives(public_id, presets.derivatives_for(preset_names))
+                built += len(missing)
+                if missing:
+                    self.stdout.write(f"{public_id}: {len(missing)} missing")
+                continue
+            try:
+                built += len(uploads.ensure_derivatives(public_id, preset_names))
+            except Exception as exc:  # keep going; the next run retries
+                failed += 1
+                self.stderr.write(f"{public_id}: {type(exc).__name__}: {exc}")
+
+        verb = "missing" if options["dry_run"] else "built"
+        self.stdout.write(self.style.SUCCESS(f"{assets} assets checked, {built} derivatives {verb}, {failed} failed."))
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from apps.cms_integration import importing
+
+
+class Command(BaseCommand):
+    help = "Bulk import speakers, sponsors or partners from CSV, JSON Lines or a JSON array (safe to re-run)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("model", choices=sorted(importing.SPECS), help="What the file contains.")
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument(
+            "--format",
+            choices=importing.FORMATS,
+            help="Input format (default: from the file extension, CSV otherwise).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=importing.DEFAULT_BATCH_SIZE,
+            help=f"Rows per database batch (default: {importing.DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=importing.DEFAULT_WORKERS,
+            help=f"Parallel Cloudinary uploads (default: {importing.DEFAULT_WORKERS}).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate and report without writing or uploading anything.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path = Path(options["path"])
+        if not path.is_file():
+            raise CommandError(f"No such file: {path}")
+
+        spec = importing.SPECS[options["model"]]
+        fmt = options["format"] or importing.detect_format(path.name)
+        with path.open("rb") as stream:
+            report = importing.import_file(
+                spec,
+                stream,
+                fmt,
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                dry_run=options["dry_run"],
+            )
+
+        for line, message in report.failed:
+            self.stderr.write(f"  row {line}: {message}")
+
+        prefix = "Dry run: " if options["dry_run"] else ""
+        summary = (
+            f"{prefix}{report.rows} rows in {report.elapsed:.2f}s ({report.rows_per_second:.0f} rows/s): "
+            f"{report.created} created, {report.updated} updated, {report.unchanged} unchanged, "
+            f"{report.uploaded} images uploaded, {len(report.failed)} failed."
+        )
+        self.stdout.write(self.style.WARNING(summary) if report.failed else self.style.SUCCESS(summary))
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.cms_integration import uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued Cloudinary uploads for snippets (retries failed uploads with exponential backoff), "
+        "then fill in missing image placeholders."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the jobs that are currently due, then exit.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Jobs claimed per round (default: 10).",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5.0,
+            help="Seconds to wait when the queue is empty (default: 5).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        total_ok = total_failed = 0
+        try:
+            while True:
+                succeeded, failed = uploads.process(options["batch_size"])
+                total_ok += succeeded
+                total_failed += failed
+
+                if succeeded or failed:
+                    self.stdout.write(f"{succeeded} uploaded, {failed} failed (will retry if attempts remain).")
+                    continue
+
+                # Idle: catch up on placeholders for images that didn't go through a job.
+                filled = uploads.fill_placeholders(options["batch_size"])
+                if filled:
+                    self.stdout.write(f"{filled} placeholders computed.")
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {total_ok} uploaded, {total_failed} failed."))
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_header_parameters
+
+from . import baking
+
+
+class BakedPageMiddleware:
+    """
+    Serve pre-rendered pages from ``BAKE_ROOT`` before any view/template work.
+
+    Only anonymous GET/HEAD requests without a query string are eligible; anything
+    else (or a missing file) falls through to Django. Place it right after WhiteNoise.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.serve_baked(request) if baking.is_enabled() else None
+        if response is None:
+            return self.get_response(request)
+        return response
+
+    def serve_baked(self, request: HttpRequest) -> HttpResponse | None:
+        if request.method not in ("GET", "HEAD") or request.META.get("QUERY_STRING"):
+            return None
+        if request.headers.get(baking.BYPASS_HEADER) or settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return None
+
+        hostname = request.get_host().split(":", 1)[0]
+        target = baking.file_for(hostname, request.path)
+        if target is None or not target.is_file():
+            return None
+
+        accepted = {
+            parse_header_parameters(part)[0].lower()
+            for part in request.headers.get("Accept-Encoding", "").split(",")
+            if part.strip()
+        }
+        encoding = ""
+        for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+            variant = target.with_name(target.name + suffix)
+            if candidate in accepted and variant.is_file():
+                target, encoding = variant, candidate
+                break
+
+        response = HttpResponse(target.read_bytes(), content_type="text/html; charset=utf-8")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        patch_vary_headers(response, ("Accept-Encoding",))
+        response["X-Baked"] = "1"
+        return response
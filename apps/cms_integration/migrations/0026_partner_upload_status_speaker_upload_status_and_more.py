@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:49
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms_integration', '0025_footersettings_enquiries_email_and_more'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('wagtailimages', '0027_image_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partner',
+            name='upload_status',
+            field=models.CharField(blank=True, choices=[('', 'No upload'), ('pending', 'Pending'), ('running', 'Uploading'), ('done', 'Uploaded'), ('failed', 'Failed')], default='', editable=False, help_text='State of the background Cloudinary upload.', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='speaker',
+            name='upload_status',
+            field=models.CharField(blank=True, choices=[('', 'No upload'), ('pending', 'Pending'), ('running', 'Uploading'), ('done', 'Uploaded'), ('failed', 'Failed')], default='', editable=False, help_text='State of the background Cloudinary upload.', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='sponsor',
+            name='upload_status',
+            field=models.CharField(blank=True, choices=[('', 'No upload'), ('pending', 'Pending'), ('running', 'Uploading'), ('done', 'Uploaded'), ('failed', 'Failed')], default='', editable=False, help_text='State of the background Cloudinary upload.', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='UploadJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('folder', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('', 'No upload'), ('pending', 'Pending'), ('running', 'Uploading'), ('done', 'Uploaded'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('public_id', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='wagtailimages.image')),
+            ],
+            options={
+                'verbose_name': 'Cloudinary upload job',
+                'verbose_name_plural': 'Cloudinary upload jobs',
+                'ordering': ['run_after', 'pk'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='uploadjob_due_idx'), models.Index(fields=['content_type', 'object_id'], name='uploadjob_target_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms_integration', '0027_cloudinaryasset'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CloudinaryDerivative',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('public_id', models.CharField(max_length=255)),
+                ('transformation', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Cloudinary derivative',
+                'verbose_name_plural': 'Cloudinary derivatives',
+                'constraints': [models.UniqueConstraint(fields=('public_id', 'transformation'), name='uniq_cloudinary_derivative')],
+            },
+        ),
+    ]
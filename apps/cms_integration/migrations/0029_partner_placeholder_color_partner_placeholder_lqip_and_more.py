@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms_integration', '0028_cloudinaryderivative'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partner',
+            name='placeholder_color',
+            field=models.CharField(blank=True, editable=False, help_text='Dominant colour of the image.', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='partner',
+            name='placeholder_lqip',
+            field=models.CharField(blank=True, editable=False, help_text='Tiny blurred preview (data URI) painted while the image loads.', max_length=400),
+        ),
+        migrations.AddField(
+            model_name='speaker',
+            name='placeholder_color',
+            field=models.CharField(blank=True, editable=False, help_text='Dominant colour of the image.', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='speaker',
+            name='placeholder_lqip',
+            field=models.CharField(blank=True, editable=False, help_text='Tiny blurred preview (data URI) painted while the image loads.', max_length=400),
+        ),
+        migrations.AddField(
+            model_name='sponsor',
+            name='placeholder_color',
+            field=models.CharField(blank=True, editable=False, help_text='Dominant colour of the image.', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='sponsor',
+            name='placeholder_lqip',
+            field=models.CharField(blank=True, editable=False, help_text='Tiny blurred preview (data URI) painted while the image loads.', max_length=400),
+        ),
+    ]
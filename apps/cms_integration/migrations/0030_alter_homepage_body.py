@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:09
+
+import wagtail.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms_integration', '0029_partner_placeholder_color_partner_placeholder_lqip_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='homepage',
+            name='body',
+            field=wagtail.fields.StreamField([('hero', 19), ('countdown', 26), ('content_section', 28), ('testimonial_grid', 34), ('nexus_grid', 45), ('speaker_grid', 50), ('sponsor_section', 54), ('partner_carousel', 58), ('faq_section', 64)], block_lookup={0: ('wagtail.blocks.CharBlock', (), {'default': 'The Future of AI', 'label': 'Main Headline (H1)', 'required': True}), 1: ('wagtail.blocks.CharBlock', (), {'help_text': "Fallback lead text shown above the H1 if 'Lead paragraph' is empty.", 'label': 'Lead (Legacy / Optional)', 'required': False}), 2: ('wagtail.blocks.TextBlock', (), {'help_text': 'The first paragraph under the headline (gradient style).', 'label': 'Main paragraph (Below H1)', 'required': False}), 3: ('wagtail.blocks.CharBlock', (), {'help_text': 'Short kicker shown above the headline (preferred).', 'label': 'Lead paragraph (Above H1)', 'required': False}), 4: ('wagtail.blocks.CharBlock', (), {'max_length': 220, 'required': True}), 5: ('wagtail.blocks.ListBlock', (4,), {'label': 'Extra paragraphs (Below main paragraph)', 'required': False}), 6: ('wagtail.blocks.CharBlock', (), {'label': 'Cloudinary Video ID', 'required': False}), 7: ('wagtail.blocks.CharBlock', (), {'label': 'Cloudinary Poster ID', 'required': False}), 8: ('wagtail.documents.blocks.DocumentChooserBlock', (), {'label': 'Upload Video (Fallback)', 'required': False}), 9: ('wagtail.documents.blocks.DocumentChooserBlock', (), {'help_text': 'Optional pre-transcoded MP4 at 720px wide or less; served to phones instead of the full video.', 'label': 'Upload Video, mobile rendition (Fallback)', 'required': False}), 10: ('wagtail.images.blocks.ImageChooserBlock', (), {'label': 'Upload Poster (Fallback)', 'required': False}), 11: ('wagtail.images.blocks.ImageChooserBlock', (), {}), 12: ('wagtail.blocks.ListBlock', (11,), {'help_text': 'If set, this replaces the lead text at the very top.', 'label': 'Brain / Logo Image', 'required': False}), 13: ('wagtail.blocks.CharBlock', (), {'help_text': "Text to appear on the button (e.g., 'Get Tickets').", 'max_length': 50, 'required': True}), 14: ('wagtail.blocks.PageChooserBlock', (), {'help_text': 'Link to an internal page.', 'required': False}), 15: ('wagtail.blocks.URLBlock', (), {'help_text': 'Link to an external site (e.g., https://google.com).', 'label': 'External URL', 'required': False}), 16: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('primary', 'Primary (Green Glow)'), ('secondary', 'Secondary (Glass/Border)'), ('ghost', 'Ghost (Text Link)')], 'required': False}), 17: ('wagtail.blocks.StructBlock', [[('label', 13), ('page', 14), ('url', 15), ('style', 16)]], {}), 18: ('wagtail.blocks.ListBlock', (17,), {'label': 'Call to Action Buttons', 'required': False}), 19: ('wagtail.blocks.StructBlock', [[('title', 0), ('subtitle', 1), ('description', 2), ('lead', 3), ('paragraphs', 5), ('video_public_id', 6), ('poster_public_id', 7), ('video_upload', 8), ('video_upload_mobile', 9), ('poster_upload', 10), ('extra_images', 12), ('cta_buttons', 18)]], {}), 20: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Turn this ON/OFF without removing the block.', 'required': False}), 21: ('wagtail.blocks.CharBlock', (), {'default': 'Ticket Flash Sale Ends In'}), 22: ('wagtail.blocks.DateTimeBlock', (), {}), 23: ('wagtail.blocks.CharBlock', (), {'default': 'Sale Ended'}), 24: ('wagtail.blocks.CharBlock', (), {'required': False}), 25: ('wagtail.blocks.URLBlock', (), {'required': False}), 26: ('wagtail.blocks.StructBlock', [[('enabled', 20), ('title', 21), ('target_date', 22), ('end_message', 23), ('cta_label', 24), ('cta_url', 25)]], {}), 27: ('wagtail.blocks.RichTextBlock', (), {'features': ['bold', 'italic', 'link', 'ul', 'ol']}), 28: ('wagtail.blocks.StructBlock', [[('heading', 24), ('text', 27)]], {}), 29: ('wagtail.blocks.CharBlock', (), {'default': 'What People Are Saying', 'required': False}), 30: ('wagtail.blocks.TextBlock', (), {'required': True}), 31: ('wagtail.images.blocks.ImageChooserBlock', (), {'required': False}), 32: ('wagtail.blocks.StructBlock', [[('quote', 30), ('author', 24), ('role', 24), ('organization', 24), ('logo', 31)]], {}), 33: ('wagtail.blocks.ListBlock', (32,), {'label': 'Testimonials'}), 34: ('wagtail.blocks.StructBlock', [[('title', 29), ('quotes', 33)]], {}), 35: ('wagtail.blocks.CharBlock', (), {'help_text': 'Optional Section Heading', 'required': False}), 36: ('wagtail.blocks.CharBlock', (), {'help_text': "Small eyebrow text (e.g., 'Track 6')", 'required': False}), 37: ('wagtail.blocks.CharBlock', (), {'help_text': "Main title (e.g., 'AI MEDIA')", 'required': True}), 38: ('wagtail.blocks.RichTextBlock', (), {'features': ['bold', 'italic', 'link', 'ul', 'ol'], 'help_text': 'The descriptive content.'}), 39: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Wagtail Image (fallback)', 'required': False}), 40: ('wagtail.blocks.CharBlock', (), {'help_text': "Cloudinary Public ID (e.g., 'v1234/my-image')", 'required': False}), 41: ('wagtail.blocks.CharBlock', (), {'label': 'Button Label', 'required': False}), 42: ('wagtail.blocks.URLBlock', (), {'label': 'Button URL', 'required': False}), 43: ('wagtail.blocks.StructBlock', [[('tagline', 36), ('headline', 37), ('description', 38), ('image_upload', 39), ('image_public_id', 40), ('cta_label', 41), ('cta_url', 42)]], {}), 44: ('wagtail.blocks.ListBlock', (43,), {'label': 'Feature Rows'}), 45: ('wagtail.blocks.StructBlock', [[('title', 35), ('features', 44)]], {}), 46: ('wagtail.blocks.CharBlock', (), {'default': 'Meet the Legends'}), 47: ('wagtail.blocks.TextBlock', (), {'required': False}), 48: ('wagtail.snippets.blocks.SnippetChooserBlock', ('cms_integration.Speaker',), {}), 49: ('wagtail.blocks.ListBlock', (48,), {'label': 'Select Speakers'}), 50: ('wagtail.blocks.StructBlock', [[('title', 46), ('description', 47), ('featured_speakers', 49)]], {}), 51: ('wagtail.blocks.CharBlock', (), {'default': 'Our Sponsors'}), 52: ('wagtail.snippets.blocks.SnippetChooserBlock', ('cms_integration.Sponsor',), {}), 53: ('wagtail.blocks.ListBlock', (52,), {'help_text': 'Commercial sponsors. Displayed by tier.', 'label': 'Select Sponsors'}), 54: ('wagtail.blocks.StructBlock', [[('title', 51), ('sponsors', 53)]], {}), 55: ('wagtail.blocks.CharBlock', (), {'default': 'Community Partners'}), 56: ('wagtail.snippets.blocks.SnippetChooserBlock', ('cms_integration.Partner',), {}), 57: ('wagtail.blocks.ListBlock', (56,), {'help_text': 'Community, media, technology, or institutional partners.', 'label': 'Select Partners'}), 58: ('wagtail.blocks.StructBlock', [[('title', 55), ('partners', 57)]], {}), 59: ('wagtail.blocks.CharBlock', (), {'default': 'Frequently Asked Questions'}), 60: ('wagtail.blocks.CharBlock', (), {'required': True}), 61: ('wagtail.blocks.RichTextBlock', (), {'features': ['bold', 'italic', 'link']}), 62: ('wagtail.blocks.StructBlock', [[('question', 60), ('answer', 61)]], {}), 63: ('wagtail.blocks.ListBlock', (62,), {'label': 'Questions'}), 64: ('wagtail.blocks.StructBlock', [[('title', 59), ('faqs', 63)]], {})}),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms_integration', '0031_partner_updated_at_speaker_updated_at_and_more'),
+        ('wagtailimages', '0027_image_description'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='partner',
+            index=models.Index(fields=['type', 'name', 'id'], name='partner_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='speaker',
+            index=models.Index(fields=['-is_keynote', 'name', 'id'], name='speaker_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sponsor',
+            index=models.Index(fields=['tier', 'name', 'id'], name='sponsor_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+"""
+pg_trgm GIN indexes on lower(name)/lower(company) for the typeahead (search.py).
+
+They serve ``lower(field) LIKE '%q%'`` (prefix and infix) next to the existing
+``Lower("name")`` uniqueness indexes. PostgreSQL only: on other databases the
+same query runs unindexed and this migration does nothing. Creating the
+extension needs a role allowed to (or an already installed pg_trgm).
+"""
+
+from django.db import migrations
+
+TRIGRAM_INDEXES = (
+    ("cms_integration_speaker", "name"),
+    ("cms_integration_speaker", "company"),
+    ("cms_integration_sponsor", "name"),
+    ("cms_integration_partner", "name"),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} USING gin (lower({column}) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms_integration', '0032_partner_partner_keyset_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from django.db import models
+from typing import Any, cast
+
+from django.db import models, transaction
+from django.http import HttpRequest, HttpResponse
 from wagtail.admin.panels import FieldPanel, MultiFieldPanel
 from wagtail.images import get_image_model_string
 
+from . import caching, uploads
+
 
 class SEOAttributes(models.Model):
     og_image = models.ForeignKey(
@@ -36,3 +41,216 @@ class SEOAttributes(models.Model):
 
     class Meta:
         abstract = True
+
+
+class UpdatedAtMixin(models.Model):
+    """
+    ``updated_at`` refreshed on every save, partial ``update_fields`` saves included.
+
+    Pages use the latest value per snippet table as an HTTP validator (see
+    ``caching.page_validators``), so it must move whenever rendered data does.
+    """
+
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+        super().save(*args, **kwargs)
+
+    class Meta:
+        abstract = True
+
+
+class CloudinaryUploadMixin(models.Model):
+    """
+    Snippets whose Wagtail image is mirrored to Cloudinary in the background.
+
+    ``save()`` queues an UploadJob instead of uploading inline; the worker
+    (``manage.py process_uploads``) writes the public id back when it's done.
+    Templates fall back to the Wagtail image while the upload is in flight.
+    Content already on Cloudinary (same file hash) is reused without a job.
+    The derivatives of ``cloudinary_presets`` are generated eagerly at upload.
+    The worker also stores an inline placeholder (blurred preview + dominant
+    colour, see apps/core/placeholders.py); it is cleared whenever the image changes.
+    """
+
+    cloudinary_image_field: str
+    cloudinary_public_id_field: str
+    cloudinary_folder: str
+    cloudinary_presets: tuple[str, ...] = ()
+
+    upload_status = models.CharField(
+        max_length=20,
+        choices=uploads.UploadStatus.choices,
+        default=uploads.UploadStatus.NONE,
+        blank=True,
+        editable=False,
+        help_text="State of the background Cloudinary upload.",
+    )
+    placeholder_lqip = models.CharField(
+        max_length=400,
+        blank=True,
+        editable=False,
+        help_text="Tiny blurred preview (data URI) painted while the image loads.",
+    )
+    placeholder_color = models.CharField(
+        max_length=16,
+        blank=True,
+        editable=False,
+        help_text="Dominant colour of the image.",
+    )
+
+    @classmethod
+    def from_db(cls, db: str | None, field_names: Any, values: Any) -> Any:
+        instance = super().from_db(db, field_names, values)
+        instance._remember_cloudinary_state()
+        return instance
+
+    def _remember_cloudinary_state(self) -> None:
+        # Read from __dict__ so deferred fields don't trigger a query.
+        self._loaded_cloudinary_state = (
+            self.__dict__.get(f"{self.cloudinary_image_field}_id"),
+            self.__dict__.get(self.cloudinary_public_id_field),
+        )
+
+    def public_id_is_stale(self) -> bool:
+        """
+        The image was swapped but the public id is still the one uploaded for the old image.
+        """
+        loaded = getattr(self, "_loaded_cloudinary_state", None)
+        if loaded is None:
+            return False
+        loaded_image_id, loaded_public_id = loaded
+        return (
+            loaded_image_id != getattr(self, f"{self.cloudinary_image_field}_id")
+            and getattr(self, self.cloudinary_public_id_field) == loaded_public_id
+        )
+
+    def image_changed(self) -> bool:
+        loaded = getattr(self, "_loaded_cloudinary_state", None)
+        current = (getattr(self, f"{self.cloudinary_image_field}_id"), getattr(self, self.cloudinary_public_id_field))
+        return loaded is not None and loaded != current
+
+    def set_placeholder(self, lqip: str = "", color: str = "") -> list[str]:
+        self.placeholder_lqip = lqip
+        self.placeholder_color = color
+        return ["placeholder_lqip", "placeholder_color"]
+
+    def needs_cloudinary_upload(self) -> bool:
+        image_id = getattr(self, f"{self.cloudinary_image_field}_id")
+        return bool(image_id) and not getattr(self, self.cloudinary_public_id_field)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        # Partial saves that don't touch the image (e.g. the worker's write-back) never queue.
+        update_fields = kwargs.get("update_fields")
+        touched = {"upload_status"}
+        if update_fields is None or self.cloudinary_image_field in update_fields:
+            if self.public_id_is_stale():
+                setattr(self, self.cloudinary_public_id_field, "")
+                self.upload_status = uploads.UploadStatus.NONE
+                touched.add(self.cloudinary_public_id_field)
+
+            if self.image_changed():
+                touched.update(self.set_placeholder())
+
+            queue_upload = self.needs_cloudinary_upload()
+            if queue_upload:
+                image = getattr(self, self.cloudinary_image_field)
+                existing = uploads.find_existing_public_id(image)
+                if existing:
+                    setattr(self, self.cloudinary_public_id_field, existing)
+                    self.upload_status = uploads.UploadStatus.DONE
+                    queue_upload = False
+                else:
+                    self.upload_status = uploads.UploadStatus.PENDING
+                touched.add(self.cloudinary_public_id_field)
+        else:
+            queue_upload = False
+
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, *touched}
+
+        # The job commits (or rolls back) with the row: no pending status without a job, no orphan job.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if queue_upload:
+                uploads.enqueue(self, getattr(self, self.cloudinary_image_field), folder=self.cloudinary_folder)
+        self._remember_cloudinary_state()
+
+    class Meta:
+        abstract = True
+
+
+class PageCacheMixin:
+    """
+    Full-page cache and conditional GET for anonymous GETs.
+
+    The cache key depends on the live revision, the request path and the
+    version counters listed in ``page_cache_dependencies`` (see caching.py),
+    so publishing, snippet saves and settings saves invalidate it implicitly.
+    The same inputs, plus the snippets' ``updated_at``, make the ETag and
+    Last-Modified validators: a matching revalidation gets a 304 before any
+    cache lookup or template work.
+    """
+
+    page_cache_dependencies: tuple[str, ...] = (caching.SETTINGS, caching.PAGES)
+
+    def validator_querysets(self, *args: Any) -> list[models.QuerySet[Any]]:
+        """
+        Snippets whose edits change this response: every table among the dependencies,
+        or only the routed snippet on a ``SnippetRoutesMixin`` detail route.
+
+        ``args`` are the routable page's ``(view, view_args, view_kwargs)``, if any.
+        """
+        view = args[0] if args else None
+        if isinstance(self, SnippetRoutesMixin) and getattr(view, "__name__", "") == self.snippet_detail_route:
+            view_kwargs = args[2] if len(args) > 2 and args[2] else {}
+            return [self.snippet_model._default_manager.filter(slug=view_kwargs.get("slug", ""))]
+        return [
+            caching.snippet_model(namespace)._default_manager.all()
+            for namespace in self.page_cache_dependencies
+            if namespace in caching.SNIPPETS
+        ]
+
+    def serve(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if not caching.is_public_request(request):
+            return cast(HttpResponse, super().serve(request, *args, **kwargs))  # type: ignore[misc]
+
+        validators = caching.page_validators(
+            request, self, self.page_cache_dependencies, self.validator_querysets(*args)
+        )
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        return validators.apply(self.serve_cached(request, *args, **kwargs))
+
+    def serve_cached(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if not caching.is_cacheable_request(request):
+            return cast(HttpResponse, super().serve(request, *args, **kwargs))  # type: ignore[misc]
+
+        key = caching.page_cache_key(request, self, self.page_cache_dependencies)
+        cached = caching.get_cached_response(key)
+        if cached is not None:
+            return cached
+
+        response = cast(HttpResponse, super().serve(request, *args, **kwargs))  # type: ignore[misc]
+        caching.store_response(key, response)
+        return response
+
+
+class SnippetRoutesMixin:
+    """
+    Routable index page exposing one ``<slug>/`` detail route per snippet.
+    """
+
+    snippet_model: type[models.Model]
+    snippet_detail_route: str
+
+    def get_snippet_subpath(self, slug: str) -> str:
+        return cast(str, self.reverse_subpage(self.snippet_detail_route, kwargs={"slug": slug}))  # type: ignore[attr-defined]
+
+    def get_bake_subpaths(self) -> list[str]:
+        slugs = self.snippet_model._default_manager.exclude(slug="").values_list("slug", flat=True)
+        return [self.get_snippet_subpath(slug) for slug in slugs]
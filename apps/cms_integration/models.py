@@ -4,6 +4,7 @@ from .mixins import SEOAttributes
 from .pages import HomePage, SpeakersIndexPage, SponsorsIndexPage
 from .settings import FooterSettings, HeaderSettings
 from .snippets import Partner, Speaker
+from .uploads import UploadJob
 
 """Re-export key CMS models for stable imports."""
 
@@ -16,4 +17,5 @@ __all__ = [
     "SponsorsIndexPage",
     "HeaderSettings",
     "FooterSettings",
+    "UploadJob",
 ]
@@ -0,0 +1,110 @@
+"""
+Batched URL resolution for the header/footer link blocks (NavItemBlock, LinkBlock, CtaLinkBlock).
+
+Menus are built from the StreamFields' raw JSON, so no PageChooserBlock ever
+loads its page on its own: every referenced page id is collected first,
+resolved with one query and memoized in the shared cache per pages version
+(bumped on publish, unpublish, move and slug change).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Mapping
+
+from django.core.cache import cache
+from wagtail.models import Page, Site
+
+from . import caching
+
+_URL_PREFIX = "odin:page-url:"
+_URL_TIMEOUT = 60 * 60 * 24
+
+
+def _values(raw_items: Iterable[Any]) -> Iterator[Mapping[str, Any]]:
+    """
+    Struct values from raw stream/list data; ListBlock items may be in the old (bare dict) format.
+    """
+    for item in raw_items or []:
+        if not isinstance(item, Mapping):
+            continue
+        value = item["value"] if "type" in item and "value" in item else item
+        if isinstance(value, Mapping):
+            yield value
+
+
+def _page_id(value: Mapping[str, Any]) -> int | None:
+    try:
+        return int(value["page"]) if value.get("page") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def collect_page_ids(*streams: Iterable[Any]) -> set[int]:
+    """
+    Every page id referenced by link blocks (and their dropdown children) in ``streams``.
+    """
+    page_ids: set[int] = set()
+    for stream in streams:
+        for value in _values(stream):
+            for link in (value, *_values(value.get("children") or [])):
+                page_id = _page_id(link)
+                if page_id is not None:
+                    page_ids.add(page_id)
+    return page_ids
+
+
+def resolve_page_urls(page_ids: Iterable[int]) -> dict[int, str]:
+    """
+    page id -> URL for ``page_ids``: one cache multi-get, then one query for the misses.
+    Pages that no longer exist (or have no route) resolve to "".
+    """
+    ids = sorted(set(page_ids))
+    if not ids:
+        return {}
+
+    pages_version = caching.get_version(caching.PAGES)
+    keys = {f"{_URL_PREFIX}{pages_version}:{page_id}": page_id for page_id in ids}
+    found = cache.get_many(list(keys))
+    urls = {keys[key]: url for key, url in found.items()}
+
+    missing = [page_id for page_id in ids if page_id not in urls]
+    if missing:
+        # Site root paths are computed once and shared by every page in the batch.
+        root_paths = Site.get_site_root_paths()
+        resolved: dict[int, str] = dict.fromkeys(missing, "")
+        for page in Page.objects.filter(pk__in=missing):
+            page._wagtail_cached_site_root_paths = root_paths
+            resolved[page.pk] = str(page.get_url() or "")
+
+        cache.set_many(
+            {f"{_URL_PREFIX}{pages_version}:{page_id}": url for page_id, url in resolved.items()},
+            timeout=_URL_TIMEOUT,
+        )
+        urls.update(resolved)
+    return urls
+
+
+# ---------------------------------------------------------------------
+# MENU BUILDERS (raw stream data -> plain dicts for the templates)
+# ---------------------------------------------------------------------
+
+
+def _link(value: Mapping[str, Any], urls: Mapping[int, str]) -> dict[str, Any]:
+    page_id = _page_id(value)
+    href = urls.get(page_id, "") if page_id is not None else ""
+    return {"label": value.get("label", ""), "href": href or value.get("url") or ""}
+
+
+def build_links(stream: Iterable[Any], urls: Mapping[int, str]) -> list[dict[str, Any]]:
+    return [_link(value, urls) for value in _values(stream)]
+
+
+def build_navigation(stream: Iterable[Any], urls: Mapping[int, str]) -> list[dict[str, Any]]:
+    return [
+        {**_link(value, urls), "children": build_links(value.get("children") or [], urls)}
+        for value in _values(stream)
+    ]
+
+
+def build_ctas(stream: Iterable[Any], urls: Mapping[int, str]) -> list[dict[str, Any]]:
+    return [{**_link(value, urls), "style": value.get("style") or "primary"} for value in _values(stream)]
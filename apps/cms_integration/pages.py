@@ -11,6 +11,9 @@ from wagtail.fields import StreamField
 from wagtail.models import Page
 from wagtail.query import PageQuerySet
 
+from apps.core import renditions
+
+from . import caching, pagination, prefetch
 from .blocks import (
     ContentBlock,
     CountdownBlock,
@@ -22,7 +25,7 @@ from .blocks import (
     SponsorGridBlock,
     TestimonialGridBlock,
 )
-from .mixins import SEOAttributes
+from .mixins import PageCacheMixin, SEOAttributes, SnippetRoutesMixin
 from .snippets import Partner, Speaker, Sponsor
 
 # ---------------------------------------------------------------------
@@ -30,17 +33,24 @@ from .snippets import Partner, Speaker, Sponsor
 # ---------------------------------------------------------------------
 
 
-class SpeakersIndexPage(RoutablePageMixin, Page):
+class SpeakersIndexPage(PageCacheMixin, SnippetRoutesMixin, RoutablePageMixin, Page):
     """
     /speakers/ and /speakers/{slug}/
     """
 
     template = "cms_integration/speakers_index.html"
     subpage_types: list[str] = []
+    page_cache_dependencies = (caching.SETTINGS, caching.PAGES, caching.SPEAKERS)
+    snippet_model = Speaker
+    snippet_detail_route = "speaker_detail"
 
     def get_context(self, request: HttpRequest, *args: Any, **kwargs: Any) -> dict[str, Any]:
         ctx = super().get_context(request, *args, **kwargs)
-        ctx["speakers"] = Speaker.objects.order_by("-is_keynote", "name")
+        # First page only; the rest is appended by /hx/speakers/?cursor= fragments.
+        page = pagination.paginate(prefetch.queryset_for(Speaker), pagination.SPEAKERS)
+        renditions.warm(prefetch.images_of(page.items))
+        ctx["speakers"] = page.items
+        ctx["next_url"] = pagination.next_url("cms_integration:hx-speakers", page)
         return ctx
 
     @route(r"^(?P<slug>[-\w]+)/$")
@@ -58,17 +68,24 @@ class SpeakersIndexPage(RoutablePageMixin, Page):
 # ---------------------------------------------------------------------
 
 
-class SponsorsIndexPage(RoutablePageMixin, Page):
+class SponsorsIndexPage(PageCacheMixin, SnippetRoutesMixin, RoutablePageMixin, Page):
     """
     /sponsors/ and /sponsors/{slug}/
     """
 
     template = "cms_integration/sponsors_index.html"
     subpage_types: list[str] = []
+    page_cache_dependencies = (caching.SETTINGS, caching.PAGES, caching.SPONSORS)
+    snippet_model = Sponsor
+    snippet_detail_route = "sponsor_detail"
 
     def get_context(self, request: HttpRequest, *args: Any, **kwargs: Any) -> dict[str, Any]:
         ctx = super().get_context(request, *args, **kwargs)
-        ctx["sponsors"] = Sponsor.objects.order_by("tier", "name")
+        # First page only; the rest is appended by /hx/sponsors/?cursor= fragments.
+        page = pagination.paginate(prefetch.queryset_for(Sponsor), pagination.SPONSORS)
+        renditions.warm(prefetch.images_of(page.items))
+        ctx["sponsors"] = page.items
+        ctx["next_url"] = pagination.next_url("cms_integration:hx-sponsors", page)
         return ctx
 
     @route(r"^(?P<slug>[-\w]+)/$")
@@ -86,17 +103,24 @@ class SponsorsIndexPage(RoutablePageMixin, Page):
 # ---------------------------------------------------------------------
 
 
-class PartnersIndexPage(RoutablePageMixin, Page):
+class PartnersIndexPage(PageCacheMixin, SnippetRoutesMixin, RoutablePageMixin, Page):
     """
     /partners/ and /partners/{slug}/
     """
 
     template = "cms_integration/partners_index.html"
     subpage_types: list[str] = []
+    page_cache_dependencies = (caching.SETTINGS, caching.PAGES, caching.PARTNERS)
+    snippet_model = Partner
+    snippet_detail_route = "partner_detail"
 
     def get_context(self, request: HttpRequest, *args: Any, **kwargs: Any) -> dict[str, Any]:
         ctx = super().get_context(request, *args, **kwargs)
-        ctx["partners"] = Partner.objects.order_by("type", "name")
+        # First page only; the rest is appended by /hx/partners/?cursor= fragments.
+        page = pagination.paginate(prefetch.queryset_for(Partner), pagination.PARTNERS)
+        renditions.warm(prefetch.images_of(page.items))
+        ctx["partners"] = page.items
+        ctx["next_url"] = pagination.next_url("cms_integration:hx-partners", page)
         return ctx
 
     @route(r"^(?P<slug>[-\w]+)/$")
@@ -114,8 +138,9 @@ class PartnersIndexPage(RoutablePageMixin, Page):
 # ---------------------------------------------------------------------
 
 
-class HomePage(SEOAttributes, Page):
+class HomePage(PageCacheMixin, SEOAttributes, Page):
     template = "cms_integration/home_page.html"
+    page_cache_dependencies = (caching.SETTINGS, caching.PAGES, *caching.SNIPPETS)
 
     if TYPE_CHECKING:
         objects: PageQuerySet["HomePage"]
@@ -169,6 +194,13 @@ class HomePage(SEOAttributes, Page):
 
     promote_panels = Page.promote_panels + SEOAttributes.seo_panels
 
+    def lcp_hero(self) -> Any | None:
+        """
+        The hero block when it opens the page (its poster is the LCP image, preloaded in <head>).
+        """
+        first = self.body[0] if self.body else None
+        return first.value if first is not None and first.block_type == "hero" else None
+
     edit_handler = TabbedInterface(
         [
             ObjectList(content_panels, heading="Content"),
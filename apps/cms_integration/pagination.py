@@ -0,0 +1,121 @@
+"""
+Keyset (seek) pagination for the snippet listings.
+
+Offset pagination re-reads every skipped row, so page 120 of the speakers costs
+120 pages' worth of work. Here each page continues *after* the last row of the
+previous one: ``WHERE (is_keynote, name, id) "after" (last row)`` with the same
+ORDER BY, served by a composite index on those columns (see ``Meta.indexes`` in
+snippets.py), so the cost stays flat however deep the visitor scrolls.
+
+The position and page size travel in an opaque signed cursor token; one extra
+row is fetched to know whether another page exists without a COUNT.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from django.conf import settings
+from django.core import signing
+from django.db import models
+from django.urls import reverse
+from django.utils.http import urlencode
+
+T = TypeVar("T", bound=models.Model)
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """
+    Ordering as (field, descending) pairs; the last one must be unique (the primary key).
+    """
+
+    fields: tuple[tuple[str, bool], ...]
+
+    def order_by(self) -> list[str]:
+        return [f"-{name}" if descending else name for name, descending in self.fields]
+
+    def values(self, obj: models.Model) -> list[Any]:
+        return [getattr(obj, name) for name, _descending in self.fields]
+
+    def after(self, values: list[Any]) -> models.Q:
+        """
+        Rows strictly after ``values`` in this ordering:
+        ``a > va OR (a = va AND b > vb) OR (a = va AND b = vb AND c > vc)``, with < for descending fields.
+        """
+        condition = models.Q()
+        equal: dict[str, Any] = {}
+        for (name, descending), value in zip(self.fields, values):
+            lookup = f"{name}__lt" if descending else f"{name}__gt"
+            condition |= models.Q(**equal, **{lookup: value})
+            equal[name] = value
+        return condition
+
+
+SPEAKERS = Keyset((("is_keynote", True), ("name", False), ("id", False)))
+SPONSORS = Keyset((("tier", False), ("name", False), ("id", False)))
+PARTNERS = Keyset((("type", False), ("name", False), ("id", False)))
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str
+
+
+def page_size() -> int:
+    return int(getattr(settings, "LISTING_PAGE_SIZE", DEFAULT_PAGE_SIZE))
+
+
+def _salt(queryset: models.QuerySet[Any]) -> str:
+    # Per model, so a speakers cursor can't be replayed against sponsors.
+    return f"cms_integration.pagination.{queryset.model._meta.label_lower}"
+
+
+def encode_cursor(queryset: models.QuerySet[Any], values: list[Any], size: int) -> str:
+    return signing.dumps({"k": values, "n": size}, salt=_salt(queryset), compress=True)
+
+
+def decode_cursor(queryset: models.QuerySet[Any], keyset: Keyset, token: str) -> tuple[list[Any], int]:
+    try:
+        payload = signing.loads(token, salt=_salt(queryset))
+        values, size = list(payload["k"]), int(payload["n"])
+    except (signing.BadSignature, KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursor(token) from exc
+    if len(values) != len(keyset.fields):
+        raise InvalidCursor(token)
+    return values, max(1, min(size, MAX_PAGE_SIZE))
+
+
+def paginate(queryset: models.QuerySet[T], keyset: Keyset, cursor: str = "", size: int | None = None) -> Page[T]:
+    """
+    The page of ``queryset`` after ``cursor`` (the first page when empty). Raises InvalidCursor.
+    """
+    size = max(1, min(size or page_size(), MAX_PAGE_SIZE))
+    queryset = queryset.order_by(*keyset.order_by())
+    if cursor:
+        values, size = decode_cursor(queryset, keyset, cursor)
+        queryset = queryset.filter(keyset.after(values))
+
+    # One sentinel row past the page tells whether there is a next page.
+    rows = list(queryset[: size + 1])
+    items = rows[:size]
+    next_cursor = encode_cursor(queryset, keyset.values(items[-1]), size) if len(rows) > size else ""
+    return Page(items=items, next_cursor=next_cursor)
+
+
+def next_url(view_name: str, page: Page[Any]) -> str:
+    """
+    URL of the HTMX fragment with the page after ``page`` ("" on the last page).
+    """
+    if not page.next_cursor:
+        return ""
+    return f"{reverse(view_name)}?{urlencode({'cursor': page.next_cursor})}"
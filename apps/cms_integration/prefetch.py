@@ -0,0 +1,177 @@
+"""
+Prefetch planner for StreamFields: batch-load every chosen object before blocks render.
+
+Left alone, each block type converts its own chooser values (and each card then
+loads its image and rendition), so the homepage query count grows with every
+speaker/sponsor an editor adds. ``prefetch_stream`` walks the raw JSON instead,
+collects ids per model across *all* blocks, loads each model once (snippets with
+their image + renditions, images with their renditions) and assigns the converted
+values back into the StreamValue.
+
+Only public Wagtail API is used (``StreamValue.__setitem__``, ``Meta.value_class``,
+``ListValue``), so the values stay correct across Wagtail upgrades.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Iterable
+
+from django.db import models
+from wagtail import blocks
+from wagtail.blocks.field_block import ChooserBlock
+from wagtail.blocks.list_block import ListValue
+from wagtail.blocks.stream_block import StreamValue
+from wagtail.images import get_image_model
+
+from apps.core import renditions
+
+
+def _image_fields(model: type[models.Model]) -> list[str]:
+    image_model = get_image_model()
+    return [
+        field.name
+        for field in model._meta.get_fields()
+        if isinstance(field, models.ForeignKey) and field.related_model is image_model
+    ]
+
+
+def images_of(objects: Iterable[Any]) -> list[Any]:
+    """
+    Images among ``objects`` plus the images their image foreign keys point to.
+    """
+    image_model = get_image_model()
+    images = []
+    for obj in objects:
+        if isinstance(obj, image_model):
+            images.append(obj)
+        else:
+            images.extend(getattr(obj, name) for name in _image_fields(type(obj)))
+    return [image for image in images if image is not None]
+
+
+def queryset_for(model: type[models.Model]) -> models.QuerySet[Any]:
+    """
+    Queryset used to load chosen objects: images come with their renditions,
+    snippets with their image foreign keys (and those images' renditions).
+    """
+    queryset = model._default_manager.all()
+    if model is get_image_model():
+        return queryset.prefetch_renditions()  # type: ignore[attr-defined,no-any-return]
+
+    image_fields = _image_fields(model)
+    if image_fields:
+        queryset = queryset.select_related(*image_fields).prefetch_related(
+            *(f"{name}__renditions" for name in image_fields)
+        )
+    return queryset
+
+
+# ---------------------------------------------------------------------
+# COLLECT (raw JSON -> ids per model)
+# ---------------------------------------------------------------------
+
+
+def _list_items(raw: Any) -> list[tuple[Any, str | None]]:
+    """
+    (value, id) for each ListBlock item, supporting the old bare-value format.
+    """
+    items = []
+    for item in raw or []:
+        if isinstance(item, dict) and item.get("type") == "item" and "value" in item and "id" in item:
+            items.append((item["value"], item["id"]))
+        else:
+            items.append((item, None))
+    return items
+
+
+def _collect(block: blocks.Block, raw: Any, ids: dict[type[models.Model], set[Any]]) -> None:
+    if isinstance(block, ChooserBlock):
+        if raw not in (None, ""):
+            ids[block.model_class].add(raw)
+    elif isinstance(block, blocks.StructBlock):
+        if isinstance(raw, dict):
+            for name, child in block.child_blocks.items():
+                if name in raw:
+                    _collect(child, raw[name], ids)
+    elif isinstance(block, blocks.ListBlock):
+        for value, _item_id in _list_items(raw):
+            _collect(block.child_block, value, ids)
+
+
+# ---------------------------------------------------------------------
+# CONVERT (raw JSON + preloaded objects -> native values)
+# ---------------------------------------------------------------------
+
+
+def _convert(block: blocks.Block, raw: Any, objects: dict[type[models.Model], dict[Any, Any]]) -> Any:
+    if isinstance(block, ChooserBlock):
+        if raw in (None, ""):
+            return None
+        return objects.get(block.model_class, {}).get(raw)
+
+    if isinstance(block, blocks.StructBlock):
+        raw = raw or {}
+        return block.meta.value_class(
+            block,
+            [
+                (name, _convert(child, raw[name], objects) if name in raw else child.get_default())
+                for name, child in block.child_blocks.items()
+            ],
+        )
+
+    if isinstance(block, blocks.ListBlock):
+        return ListValue(
+            block,
+            bound_blocks=[
+                ListValue.ListChild(block.child_block, _convert(block.child_block, value, objects), id=item_id)
+                for value, item_id in _list_items(raw)
+            ],
+        )
+
+    return block.to_python(raw)
+
+
+def _has_nested_stream(block: blocks.Block) -> bool:
+    if isinstance(block, blocks.StreamBlock):
+        return True
+    if isinstance(block, blocks.StructBlock):
+        return any(_has_nested_stream(child) for child in block.child_blocks.values())
+    if isinstance(block, blocks.ListBlock):
+        return _has_nested_stream(block.child_block)
+    return False
+
+
+def prefetch_stream(stream_value: StreamValue, indexes: Iterable[int] | None = None) -> None:
+    """
+    Convert the items at ``indexes`` (default: all) with one query per referenced model.
+    Items containing a nested StreamBlock are left to Wagtail. Call it before the items
+    are accessed: whatever Wagtail converted already is converted again.
+    """
+    stream_block = stream_value.stream_block
+    raw_items = stream_value.raw_data
+
+    pending: list[tuple[int, blocks.Block, dict[str, Any]]] = []
+    for index in range(len(raw_items)) if indexes is None else indexes:
+        raw_item = raw_items[index]
+        block = stream_block.child_blocks.get(raw_item["type"])
+        if block is None or _has_nested_stream(block):
+            continue
+        pending.append((index, block, raw_item))
+
+    ids: dict[type[models.Model], set[Any]] = defaultdict(set)
+    for _index, block, raw_item in pending:
+        _collect(block, raw_item["value"], ids)
+
+    objects: dict[type[models.Model], dict[Any, Any]] = {}
+    for model, pks in ids.items():
+        loaded = queryset_for(model).in_bulk(list(pks))
+        # Raw ids may be stored as strings; index by both forms.
+        objects[model] = {**loaded, **{str(pk): obj for pk, obj in loaded.items()}}
+
+    # One multi-get for the rendition metadata of every image the blocks will render.
+    renditions.warm(images_of(obj for loaded in objects.values() for obj in loaded.values()))
+
+    for index, block, raw_item in pending:
+        value = _convert(block, raw_item["value"], objects)
+        stream_value[index] = (raw_item["type"], value, raw_item.get("id"))
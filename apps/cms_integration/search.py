@@ -0,0 +1,109 @@
+"""
+Typeahead search over speakers, sponsors and partners (``/hx/search/?q=``).
+
+One behaviour on every database: ``lower(field) LIKE '%q%'`` (infix), with prefix
+matches on the name ranked first. On PostgreSQL the query is served by the pg_trgm
+GIN indexes of migration 0033; elsewhere (SQLite in development) it scans the
+snippet tables, which stay small enough for that.
+
+Rendered results are cached per query by ``caching.cached_partial`` (hot prefixes
+are served from the cache until a snippet or page is saved).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from django.db import models
+from django.db.models.functions import Lower
+from django.http import HttpRequest
+from wagtail.models import Page
+
+from .pages import PartnersIndexPage, SpeakersIndexPage, SponsorsIndexPage
+from .snippets import Partner, Speaker, Sponsor
+
+MIN_QUERY_LENGTH = 2
+MAX_QUERY_LENGTH = 64
+RESULTS_PER_KIND = 5
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class Kind:
+    label: str
+    model: type[models.Model]
+    index_page: type[Page]
+    fields: tuple[str, ...]  # matched fields; the first one is ranked and displayed
+    subtitle: str  # attribute or method shown under the title
+
+    def subtitle_of(self, obj: Any) -> str:
+        value = getattr(obj, self.subtitle, "")
+        return str(value() if callable(value) else value)
+
+
+KINDS: tuple[Kind, ...] = (
+    Kind("Speaker", Speaker, SpeakersIndexPage, ("name", "company"), "company"),
+    Kind("Sponsor", Sponsor, SponsorsIndexPage, ("name",), "get_tier_display"),
+    Kind("Partner", Partner, PartnersIndexPage, ("name",), "get_type_display"),
+)
+
+
+@dataclass(frozen=True)
+class Result:
+    kind: str
+    title: str
+    subtitle: str
+    url: str
+
+
+def normalize(query: str) -> str:
+    return _SPACES_RE.sub(" ", query).strip().lower()[:MAX_QUERY_LENGTH]
+
+
+def matches(kind: Kind, query: str) -> list[Any]:
+    lowered = {f"{field}_lower": Lower(field) for field in kind.fields}
+    condition = models.Q()
+    for field in kind.fields:
+        condition |= models.Q(**{f"{field}_lower__contains": query})
+    first = f"{kind.fields[0]}_lower"
+    rank = models.Case(
+        models.When(**{f"{first}__startswith": query}, then=models.Value(0)),
+        default=models.Value(1),
+        output_field=models.IntegerField(),
+    )
+    queryset = kind.model._default_manager.annotate(**lowered, rank=rank).filter(condition)
+    return list(queryset.order_by("rank", kind.fields[0])[:RESULTS_PER_KIND])
+
+
+def _detail_url(obj: Any, index_page: Any, request: HttpRequest | None) -> str:
+    if index_page is not None and obj.slug:
+        return f"{index_page.get_url(request)}{index_page.get_snippet_subpath(obj.slug)}"
+    return getattr(obj, "website", "") or ""
+
+
+def search(query: str, request: HttpRequest | None = None) -> list[Result]:
+    """
+    Up to ``RESULTS_PER_KIND`` results per kind for a normalized ``query`` (none below ``MIN_QUERY_LENGTH``).
+    """
+    if len(query) < MIN_QUERY_LENGTH:
+        return []
+
+    results = []
+    for kind in KINDS:
+        found = matches(kind, query)
+        if not found:
+            continue
+        index_page = kind.index_page.objects.live().first()
+        for obj in found:
+            results.append(
+                Result(
+                    kind=kind.label,
+                    title=obj.name,
+                    subtitle=kind.subtitle_of(obj),
+                    url=_detail_url(obj, index_page, request),
+                )
+            )
+    return results
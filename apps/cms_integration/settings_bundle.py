@@ -0,0 +1,121 @@
+"""
+All public-facing site settings for a site, loaded in one query and cached as a snapshot.
+
+The partials (header, footer, cookie banner, social sidebar, countdown) read from
+``site_settings`` (see context_processors.py) instead of ``{% get_settings %}``,
+which costs one query per settings model per request.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from wagtail.models import Site
+
+from . import caching, navigation
+from .settings import (
+    CookieSettings,
+    FlashSaleSettings,
+    FooterSettings,
+    HeaderSettings,
+    SocialLinksSettings,
+    SocialSidebarSettings,
+)
+
+_BUNDLE_PREFIX = "odin:settings-bundle:"
+_BUNDLE_DEPENDENCIES = (caching.SETTINGS, caching.PAGES)
+_BUNDLE_TIMEOUT = 60 * 60 * 24
+
+# attribute on the bundle -> (settings model, reverse one-to-one name on Site)
+_SETTINGS_MODELS: dict[str, tuple[Any, str]] = {
+    "header": (HeaderSettings, "headersettings"),
+    "footer": (FooterSettings, "footersettings"),
+    "socials": (SocialLinksSettings, "sociallinkssettings"),
+    "sidebar": (SocialSidebarSettings, "socialsidebarsettings"),
+    "flash_sale": (FlashSaleSettings, "flashsalesettings"),
+    "cookie": (CookieSettings, "cookiesettings"),
+}
+
+# Foreign keys rendered by the partials, joined into the same query.
+_RELATED = ("headersettings__logo_image",)
+
+
+@dataclass
+class SiteSettingsBundle:
+    header: HeaderSettings
+    footer: FooterSettings
+    socials: SocialLinksSettings
+    sidebar: SocialSidebarSettings
+    flash_sale: FlashSaleSettings
+    cookie: CookieSettings
+
+    # StreamFields, pre-converted to plain dicts ({"label", "href", ...})
+    primary_navigation: list[dict[str, Any]] = field(default_factory=list)
+    cta_buttons: list[dict[str, Any]] = field(default_factory=list)
+    footer_col_1_links: list[dict[str, Any]] = field(default_factory=list)
+    footer_col_2_links: list[dict[str, Any]] = field(default_factory=list)
+
+    cookie_privacy_url: str = ""
+
+
+def _load_from_db(site: Site | None) -> SiteSettingsBundle | None:
+    """
+    One query: the site row LEFT JOINed with every settings row (reverse one-to-ones).
+    Rows that don't exist yet are created via ``for_site`` (first request only).
+    Linked pages are resolved in one more batch (see navigation.py).
+    """
+    queryset = Site.objects.select_related(*(name for _model, name in _SETTINGS_MODELS.values()), *_RELATED)
+    if site is None:
+        site = queryset.filter(is_default_site=True).first()
+    else:
+        site = queryset.filter(pk=site.pk).first()
+    if site is None:
+        return None
+
+    instances: dict[str, Any] = {}
+    for attr, (model, related_name) in _SETTINGS_MODELS.items():
+        try:
+            instances[attr] = getattr(site, related_name)
+        except ObjectDoesNotExist:
+            instances[attr] = model.for_site(site)
+
+    bundle = SiteSettingsBundle(**instances)
+
+    # Work on the raw JSON so no PageChooserBlock loads its page individually.
+    streams = {
+        "primary_navigation": bundle.header.primary_navigation.raw_data,
+        "cta_buttons": bundle.header.cta_buttons.raw_data,
+        "footer_col_1_links": bundle.footer.footer_col_1_links.raw_data,
+        "footer_col_2_links": bundle.footer.footer_col_2_links.raw_data,
+    }
+    page_ids = navigation.collect_page_ids(*streams.values())
+    if bundle.cookie.privacy_page_id:
+        page_ids.add(bundle.cookie.privacy_page_id)
+    urls = navigation.resolve_page_urls(page_ids)
+
+    bundle.primary_navigation = navigation.build_navigation(streams["primary_navigation"], urls)
+    bundle.cta_buttons = navigation.build_ctas(streams["cta_buttons"], urls)
+    bundle.footer_col_1_links = navigation.build_links(streams["footer_col_1_links"], urls)
+    bundle.footer_col_2_links = navigation.build_links(streams["footer_col_2_links"], urls)
+    if bundle.cookie.privacy_page_id:
+        bundle.cookie_privacy_url = urls.get(bundle.cookie.privacy_page_id, "")
+    return bundle
+
+
+def get_settings_bundle(site: Site | None = None) -> SiteSettingsBundle | None:
+    """
+    Cached bundle for ``site`` (default site when None), shared across workers.
+    The key embeds the settings/pages versions, so saves and publishes invalidate it.
+    """
+    site_key = str(site.pk) if site is not None else "default"
+    key = f"{_BUNDLE_PREFIX}{site_key}:{caching.version_token(_BUNDLE_DEPENDENCIES)}"
+
+    bundle = cache.get(key)
+    if bundle is None:
+        bundle = _load_from_db(site)
+        if bundle is not None:
+            cache.set(key, bundle, timeout=_BUNDLE_TIMEOUT)
+    return bundle
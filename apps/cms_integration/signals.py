@@ -0,0 +1,173 @@
+"""
+Content change hooks: bump the cache version counters and keep the static bake in sync.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from wagtail.models import Page
+from wagtail.signals import page_published, page_slug_changed, page_unpublished, post_page_move
+
+from . import baking, caching
+from .settings import (
+    CookieSettings,
+    FlashSaleSettings,
+    FooterSettings,
+    HeaderSettings,
+    SocialLinksSettings,
+    SocialSidebarSettings,
+)
+from .snippets import Partner, Speaker, Sponsor
+
+SITE_SETTINGS_MODELS = (
+    HeaderSettings,
+    FooterSettings,
+    SocialLinksSettings,
+    SocialSidebarSettings,
+    FlashSaleSettings,
+    CookieSettings,
+)
+
+SNIPPET_NAMESPACES: dict[type, str] = {
+    Speaker: caching.SPEAKERS,
+    Sponsor: caching.SPONSORS,
+    Partner: caching.PARTNERS,
+}
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(page_slug_changed)
+@receiver(post_page_move)
+def bump_pages_version(sender: Any, **kwargs: Any) -> None:
+    caching.bump_version(caching.PAGES)
+
+
+@receiver(post_delete)
+def bump_pages_version_on_delete(sender: Any, instance: Any, **kwargs: Any) -> None:
+    if isinstance(instance, Page):
+        caching.bump_version(caching.PAGES)
+
+
+def bump_settings_version(sender: Any, **kwargs: Any) -> None:
+    caching.bump_version(caching.SETTINGS)
+
+
+def bump_snippet_version(sender: Any, **kwargs: Any) -> None:
+    caching.bump_version(SNIPPET_NAMESPACES[sender])
+
+
+for _model in SITE_SETTINGS_MODELS:
+    post_save.connect(bump_settings_version, sender=_model, dispatch_uid=f"odin-settings-{_model.__name__}")
+    post_delete.connect(bump_settings_version, sender=_model, dispatch_uid=f"odin-settings-del-{_model.__name__}")
+
+for _model in SNIPPET_NAMESPACES:
+    post_save.connect(bump_snippet_version, sender=_model, dispatch_uid=f"odin-snippet-{_model.__name__}")
+    post_delete.connect(bump_snippet_version, sender=_model, dispatch_uid=f"odin-snippet-del-{_model.__name__}")
+
+
+# ---------------------------------------------------------------------
+# STATIC BAKE (BAKE_ENABLED)
+# ---------------------------------------------------------------------
+
+
+@receiver(page_published)
+def bake_published_page(sender: Any, instance: Page, **kwargs: Any) -> None:
+    if baking.is_enabled():
+        transaction.on_commit(lambda: baking.bake_pages([instance]))
+
+
+@receiver(page_unpublished)
+def unbake_unpublished_page(sender: Any, instance: Page, **kwargs: Any) -> None:
+    if baking.is_enabled():
+        transaction.on_commit(lambda: baking.unbake_page(instance))
+
+
+def rebake_tree(url_path_before: str) -> None:
+    """
+    Every URL below a renamed/moved page changed: drop the old subtree, then re-bake.
+
+    The whole live tree is re-baked, not only the new subtree, because menus and
+    links on other pages point at the old URL; unchanged files aren't rewritten.
+    """
+    stale = list(baking.iter_tree_paths(url_path_before))
+
+    def run() -> None:
+        for site, path in stale:
+            baking.unbake_tree(site, path)
+        baking.bake_site()
+
+    transaction.on_commit(run)
+
+
+@receiver(page_slug_changed)
+def rebake_renamed_tree(sender: Any, instance: Page, instance_before: Page, **kwargs: Any) -> None:
+    if baking.is_enabled():
+        rebake_tree(instance_before.url_path)
+
+
+@receiver(post_page_move)
+def rebake_moved_tree(sender: Any, url_path_before: str, **kwargs: Any) -> None:
+    if baking.is_enabled():
+        rebake_tree(url_path_before)
+
+
+def rebake_site_settings(sender: Any, **kwargs: Any) -> None:
+    # Header/footer appear on every file; only the files whose bytes change are rewritten.
+    if baking.is_enabled():
+        transaction.on_commit(baking.bake_site)
+
+
+def remember_baked_slug(sender: Any, instance: Any, **kwargs: Any) -> None:
+    if baking.is_enabled() and instance.pk:
+        instance._baked_slug = sender.objects.filter(pk=instance.pk).values_list("slug", flat=True).first()
+
+
+def rebake_snippet(sender: Any, instance: Any, **kwargs: Any) -> None:
+    if not baking.is_enabled():
+        return
+
+    old_slug = getattr(instance, "_baked_slug", None)
+    stale: list[tuple[Any, str]] = []
+    if old_slug and old_slug != instance.slug:
+        stale = list(baking.iter_snippet_paths(instance, slug=old_slug, listings=False))
+    targets = list(baking.iter_snippet_paths(instance))
+    pages = baking.pages_referencing(instance)
+
+    def run() -> None:
+        for site, path in stale:
+            baking.unbake_path(site, path)
+        baking.bake_paths(targets)
+        baking.bake_pages(pages)
+
+    transaction.on_commit(run)
+
+
+def unbake_snippet(sender: Any, instance: Any, **kwargs: Any) -> None:
+    if not baking.is_enabled():
+        return
+
+    details = list(baking.iter_snippet_paths(instance, listings=False))
+    listings = list(baking.iter_snippet_paths(instance, slug=""))
+    pages = baking.pages_referencing(instance)
+
+    def run() -> None:
+        for site, path in details:
+            baking.unbake_path(site, path)
+        baking.bake_paths(listings)
+        baking.bake_pages(pages)
+
+    transaction.on_commit(run)
+
+
+for _model in SITE_SETTINGS_MODELS:
+    post_save.connect(rebake_site_settings, sender=_model, dispatch_uid=f"odin-bake-{_model.__name__}")
+
+for _model in SNIPPET_NAMESPACES:
+    pre_save.connect(remember_baked_slug, sender=_model, dispatch_uid=f"odin-bake-pre-{_model.__name__}")
+    post_save.connect(rebake_snippet, sender=_model, dispatch_uid=f"odin-bake-{_model.__name__}")
+    post_delete.connect(unbake_snippet, sender=_model, dispatch_uid=f"odin-bake-del-{_model.__name__}")
@@ -1,15 +1,14 @@
 from __future__ import annotations
 
-from typing import Any
-
 from django.db import models
 from django.db.models.functions import Lower
 from django.utils.text import slugify
 from wagtail.admin.panels import FieldPanel
 from wagtail.images import get_image_model_string
+from wagtail.search import index
 from wagtail.snippets.models import register_snippet
 
-from .utils.cloudinary_upload import upload_wagtail_image_to_cloudinary
+from .mixins import CloudinaryUploadMixin, UpdatedAtMixin
 
 # ---------------------------------------------------------------------
 # SPEAKERS
@@ -17,7 +16,12 @@ from .utils.cloudinary_upload import upload_wagtail_image_to_cloudinary
 
 
 @register_snippet
-class Speaker(models.Model):
+class Speaker(index.Indexed, UpdatedAtMixin, CloudinaryUploadMixin, models.Model):
+    cloudinary_image_field = "photo_upload"
+    cloudinary_public_id_field = "photo_public_id"
+    cloudinary_folder = "speakers"
+    cloudinary_presets = ("speaker_card",)
+
     name = models.CharField(max_length=255)
     slug = models.SlugField(
         max_length=255,
@@ -46,6 +50,15 @@ class Speaker(models.Model):
     linkedin_url = models.URLField(blank=True)
     is_keynote = models.BooleanField(default=False)
 
+    # Admin snippet chooser search (the /hx/search/ typeahead queries the table, see search.py).
+    search_fields = [
+        index.SearchField("name"),
+        index.SearchField("company"),
+        index.AutocompleteField("name"),
+        index.AutocompleteField("company"),
+        index.FilterField("is_keynote"),
+    ]
+
     panels = [
         FieldPanel("name"),
         FieldPanel("slug"),
@@ -53,29 +66,29 @@ class Speaker(models.Model):
         FieldPanel("company"),
         FieldPanel("photo_upload"),
         FieldPanel("photo_public_id"),
+        FieldPanel("upload_status", read_only=True),
         FieldPanel("linkedin_url"),
         FieldPanel("is_keynote"),
     ]
 
-    def save(self, *args: Any, **kwargs: Any) -> None:
-        if self.photo_upload and not self.photo_public_id:
-            self.photo_public_id = upload_wagtail_image_to_cloudinary(
-                self.photo_upload,
-                folder="speakers",
-            )
-        super().save(*args, **kwargs)
+    def build_slug(self) -> str:
+        return slugify(f"{self.name}-{self.company}")[:255]
 
     def clean(self) -> None:
         self.name = self.name.strip()
         self.company = self.company.strip()
         if not self.slug:
-            self.slug = slugify(f"{self.name}-{self.company}")[:255]
+            self.slug = self.build_slug()
         super().clean()
 
     class Meta:
         verbose_name = "Speaker"
         verbose_name_plural = "Speakers"
         ordering = ["name"]
+        indexes = [
+            # Keyset pagination order (pagination.SPEAKERS)
+            models.Index(fields=["-is_keynote", "name", "id"], name="speaker_keyset_idx"),
+        ]
         constraints = [
             models.UniqueConstraint(
                 Lower("name"),
@@ -94,7 +107,12 @@ class Speaker(models.Model):
 
 
 @register_snippet
-class Sponsor(models.Model):
+class Sponsor(index.Indexed, UpdatedAtMixin, CloudinaryUploadMixin, models.Model):
+    cloudinary_image_field = "logo_upload"
+    cloudinary_public_id_field = "logo_public_id"
+    cloudinary_folder = "sponsors"
+    cloudinary_presets = ("sponsor_logo",)
+
     name = models.CharField(max_length=255)
     slug = models.SlugField(
         max_length=255,
@@ -129,33 +147,39 @@ class Sponsor(models.Model):
     ]
     tier = models.CharField(max_length=50, choices=TIER_CHOICES, default="bronze")
 
+    search_fields = [
+        index.SearchField("name"),
+        index.AutocompleteField("name"),
+        index.FilterField("tier"),
+    ]
+
     panels = [
         FieldPanel("name"),
         FieldPanel("slug"),
         FieldPanel("tier"),
         FieldPanel("logo_upload"),
         FieldPanel("logo_public_id"),
+        FieldPanel("upload_status", read_only=True),
         FieldPanel("website"),
     ]
 
-    def save(self, *args: Any, **kwargs: Any) -> None:
-        if self.logo_upload and not self.logo_public_id:
-            self.logo_public_id = upload_wagtail_image_to_cloudinary(
-                self.logo_upload,
-                folder="sponsors",
-            )
-        super().save(*args, **kwargs)
+    def build_slug(self) -> str:
+        return slugify(self.name)[:255]
 
     def clean(self) -> None:
         self.name = self.name.strip()
         if not self.slug:
-            self.slug = slugify(self.name)[:255]
+            self.slug = self.build_slug()
         super().clean()
 
     class Meta:
         verbose_name = "Sponsor"
         verbose_name_plural = "Sponsors"
         ordering = ["tier", "name"]
+        indexes = [
+            # Keyset pagination order (pagination.SPONSORS)
+            models.Index(fields=["tier", "name", "id"], name="sponsor_keyset_idx"),
+        ]
         constraints = [
             models.UniqueConstraint(
                 Lower("name"),
@@ -173,7 +197,12 @@ class Sponsor(models.Model):
 
 
 @register_snippet
-class Partner(models.Model):
+class Partner(index.Indexed, UpdatedAtMixin, CloudinaryUploadMixin, models.Model):
+    cloudinary_image_field = "logo_upload"
+    cloudinary_public_id_field = "logo_public_id"
+    cloudinary_folder = "partners"
+    cloudinary_presets = ("partner_logo",)
+
     name = models.CharField(max_length=255)
     slug = models.SlugField(
         max_length=255,
@@ -208,33 +237,39 @@ class Partner(models.Model):
     ]
     type = models.CharField(max_length=50, choices=TYPE_CHOICES, default="community")
 
+    search_fields = [
+        index.SearchField("name"),
+        index.AutocompleteField("name"),
+        index.FilterField("type"),
+    ]
+
     panels = [
         FieldPanel("name"),
         FieldPanel("slug"),
         FieldPanel("type"),
         FieldPanel("logo_upload"),
         FieldPanel("logo_public_id"),
+        FieldPanel("upload_status", read_only=True),
         FieldPanel("website"),
     ]
 
-    def save(self, *args: Any, **kwargs: Any) -> None:
-        if self.logo_upload and not self.logo_public_id:
-            self.logo_public_id = upload_wagtail_image_to_cloudinary(
-                self.logo_upload,
-                folder="partners",
-            )
-        super().save(*args, **kwargs)
+    def build_slug(self) -> str:
+        return slugify(self.name)[:255]
 
     def clean(self) -> None:
         self.name = self.name.strip()
         if not self.slug:
-            self.slug = slugify(self.name)[:255]
+            self.slug = self.build_slug()
         super().clean()
 
     class Meta:
         verbose_name = "Partner"
         verbose_name_plural = "Partners"
         ordering = ["type", "name"]
+        indexes = [
+            # Keyset pagination order (pagination.PARTNERS)
+            models.Index(fields=["type", "name", "id"], name="partner_keyset_idx"),
+        ]
         constraints = [
             models.UniqueConstraint(
                 Lower("name"),
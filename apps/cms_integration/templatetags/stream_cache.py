@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django import template
+from django.core.cache import cache
+from django.utils.html import conditional_escape
+from django.utils.safestring import SafeString, mark_safe
+
+from apps.cms_integration import caching, prefetch
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def include_stream_cached(context: template.Context, stream_value: Any) -> SafeString:
+    """
+    Render every block of a StreamField like ``{% for b in stream %}{% include_block b %}``,
+    but through the fragment cache.
+
+    Keys are computed from the raw JSON, so cached blocks are never converted to Python
+    (no snippet/image queries) and all keys are fetched in a single ``get_many``.
+    """
+    if not stream_value:
+        return mark_safe("")
+
+    timeout = caching.block_cache_timeout()
+    stream_block = stream_value.stream_block
+    raw_items = list(stream_value.raw_data)
+
+    dependencies: set[str] = set()
+    for raw_item in raw_items:
+        block = stream_block.child_blocks.get(raw_item["type"])
+        dependencies.update(getattr(block, "cache_dependencies", caching.DEFAULT_BLOCK_DEPENDENCIES))
+    versions = caching.get_versions(dependencies)
+
+    keys: list[str | None] = []
+    for raw_item in raw_items:
+        block = stream_block.child_blocks.get(raw_item["type"])
+        if block is None or timeout <= 0:
+            keys.append(None)
+        else:
+            keys.append(caching.block_cache_key(raw_item, block, versions))
+
+    cached = cache.get_many([k for k in keys if k])
+
+    # Load every snippet/image/page the missed blocks reference in one query per model.
+    missed = [index for index, key in enumerate(keys) if not (key and key in cached)]
+    if missed:
+        prefetch.prefetch_stream(stream_value, missed)
+
+    fresh: dict[str, str] = {}
+    output: list[str] = []
+
+    for index, key in enumerate(keys):
+        if key and key in cached:
+            output.append(cached[key])
+            continue
+
+        child = stream_value[index]
+        html = conditional_escape(child.render_as_block(context=context.flatten()))
+        output.append(html)
+        if key:
+            fresh[key] = html
+
+    if fresh:
+        cache.set_many(fresh, timeout=timeout)
+
+    return mark_safe("".join(output))
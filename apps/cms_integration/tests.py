@@ -1,2 +1,1233 @@
+from __future__ import annotations
 
-# Create your tests here.
+import io
+import re
+import shutil
+import subprocess
+import tempfile
+from datetime import timedelta
+from html import unescape
+from pathlib import Path
+from typing import Any
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from django.template import Context, Template
+from django.templatetags.static import static
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image as PILImage
+from wagtail.images import get_image_model
+from wagtail.models import Page, Site
+from wagtail.search.backends import get_search_backend
+
+from apps.core import media_backends, presets
+
+from . import baking, caching, importing, navigation, pagination, prefetch, search, settings_bundle, uploads
+from .blocks import FAQSectionBlock, SpeakerGridBlock
+from .pages import HomePage, PartnersIndexPage, SpeakersIndexPage, SponsorsIndexPage
+from .signals import SITE_SETTINGS_MODELS
+from .snippets import Speaker, Sponsor
+from .utils.cloudinary_upload import UploadedAsset
+
+# Media in memory, static files without a manifest: no network, no collectstatic.
+TEST_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+@override_settings(STORAGES=TEST_STORAGES, PAGE_CACHE_TIMEOUT=300)
+class CmsTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def make_home(self, **fields: Any) -> HomePage:
+        """
+        A published HomePage as the default site's root, served at ``/``.
+        """
+        root = Page.objects.get(depth=1)
+        home = HomePage(title="Home", slug="event", **fields)
+        root.add_child(instance=home)
+        home.save_revision().publish()
+        site = Site.objects.get(is_default_site=True)
+        site.root_page = home
+        site.save()
+        # Created on first render otherwise, bumping the settings version mid-request.
+        for model in SITE_SETTINGS_MODELS:
+            model.for_site(site)
+        return home
+
+    def make_image(self, color: str = "#2255aa") -> Any:
+        buffer = io.BytesIO()
+        PILImage.new("RGB", (64, 64), color).save(buffer, "PNG")
+        image = get_image_model().objects.create(title="Test", file=ImageFile(buffer, name="test.png"))
+        image.get_file_hash()
+        return image
+
+    def make_speaker(self, name: str, **fields: Any) -> Speaker:
+        fields.setdefault("company", "Acme")
+        fields.setdefault("role", "Engineer")
+        speaker = Speaker(name=name, **fields)
+        speaker.full_clean()
+        speaker.save()
+        return speaker
+
+
+# ---------------------------------------------------------------------
+# FULL-PAGE CACHE
+# ---------------------------------------------------------------------
+
+
+class PageCacheTests(CmsTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.home = self.make_home()
+
+    def test_second_anonymous_request_is_a_hit(self) -> None:
+        first = self.client.get("/")
+        second = self.client.get("/")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first["X-Page-Cache"], "MISS")
+        self.assertEqual(second["X-Page-Cache"], "HIT")
+        self.assertEqual(first.content, second.content)
+
+    def test_hit_renders_nothing(self) -> None:
+        self.client.get("/")
+        with self.assertTemplateNotUsed("cms_integration/home_page.html"):
+            self.client.get("/")
+
+    def test_publishing_invalidates(self) -> None:
+        self.client.get("/")
+        self.home.title = "Renamed"
+        self.home.save_revision().publish()
+
+        response = self.client.get("/")
+
+        self.assertEqual(response["X-Page-Cache"], "MISS")
+
+    def test_settings_save_invalidates(self) -> None:
+        from .settings import FooterSettings
+
+        self.client.get("/")
+        FooterSettings.for_site(Site.objects.get(is_default_site=True)).save()
+
+        self.assertEqual(self.client.get("/")["X-Page-Cache"], "MISS")
+
+    def test_query_string_is_part_of_the_key(self) -> None:
+        self.client.get("/")
+
+        self.assertEqual(self.client.get("/?utm_source=x")["X-Page-Cache"], "MISS")
+
+    def test_logged_in_users_bypass_the_cache(self) -> None:
+        user = get_user_model().objects.create_user("editor", password="x")
+        self.client.get("/")
+        self.client.force_login(user)
+
+        response = self.client.get("/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Page-Cache", response)
+
+    @override_settings(PAGE_CACHE_TIMEOUT=0)
+    def test_zero_timeout_disables_the_cache(self) -> None:
+        self.client.get("/")
+
+        self.assertNotIn("X-Page-Cache", self.client.get("/"))
+
+    def test_key_changes_with_the_deploy_token(self) -> None:
+        request = self.client.get("/").wsgi_request
+        key = caching.page_cache_key(request, self.home, self.home.page_cache_dependencies)
+
+        with override_settings(BLOCK_CACHE_VERSION="next-release", DEBUG=True):
+            changed = caching.page_cache_key(request, self.home, self.home.page_cache_dependencies)
+
+        self.assertNotEqual(key, changed)
+
+
+# ---------------------------------------------------------------------
+# STREAMFIELD FRAGMENT CACHE
+# ---------------------------------------------------------------------
+
+
+@override_settings(BLOCK_CACHE_TIMEOUT=300)
+class StreamFragmentCacheTests(CmsTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.speaker = self.make_speaker("Ada Lovelace")
+        faq = {"title": "FAQ", "faqs": [{"question": "Where?", "answer": "<p>Amsterdam</p>"}]}
+        speakers = {"title": "Speakers", "description": "", "featured_speakers": [self.speaker]}
+        self.home = self.make_home(body=[("faq_section", faq), ("speaker_grid", speakers)])
+
+    def load_body(self) -> Any:
+        # A fresh StreamValue holding raw JSON, as on a new request.
+        return HomePage.objects.get(pk=self.home.pk).body
+
+    def render(self, body: Any) -> str:
+        return Template("{% load stream_cache %}{% include_stream_cached body %}").render(Context({"body": body}))
+
+    def spy(self, block_class: type) -> Any:
+        return mock.patch.object(block_class, "render", autospec=True, side_effect=block_class.render)
+
+    def test_second_render_comes_from_the_cache(self) -> None:
+        first = self.render(self.load_body())
+        body = self.load_body()
+
+        with self.spy(FAQSectionBlock) as faq, self.spy(SpeakerGridBlock) as grid, self.assertNumQueries(0):
+            second = self.render(body)
+
+        self.assertEqual(first, second)
+        self.assertIn("Amsterdam", second)
+        faq.assert_not_called()
+        grid.assert_not_called()
+
+    def test_snippet_save_only_invalidates_dependent_blocks(self) -> None:
+        self.render(self.load_body())
+        self.speaker.role = "Mathematician"
+        self.speaker.save()
+
+        with self.spy(FAQSectionBlock) as faq, self.spy(SpeakerGridBlock) as grid:
+            html = self.render(self.load_body())
+
+        faq.assert_not_called()
+        grid.assert_called_once()
+        self.assertIn("Ada Lovelace", html)
+
+    def test_key_depends_on_value_and_deploy_token(self) -> None:
+        body = self.load_body()
+        raw_item = dict(body.raw_data[0])
+        block = body.stream_block.child_blocks["faq_section"]
+        versions = caching.get_versions([caching.PAGES])
+        key = caching.block_cache_key(raw_item, block, versions)
+
+        edited = {**raw_item, "value": {**raw_item["value"], "title": "Questions"}}
+        self.assertNotEqual(key, caching.block_cache_key(edited, block, versions))
+        with override_settings(BLOCK_CACHE_VERSION="next-release", DEBUG=True):
+            self.assertNotEqual(key, caching.block_cache_key(raw_item, block, versions))
+
+
+# ---------------------------------------------------------------------
+# STATIC BAKE
+# ---------------------------------------------------------------------
+
+
+class BakeTests(CmsTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        bake_settings = override_settings(BAKE_ENABLED=True, BAKE_ROOT=root)
+        bake_settings.enable()
+        self.addCleanup(bake_settings.disable)
+        self.root = root
+
+        self.home = self.make_home()
+        self.about = HomePage(title="About", slug="about")
+        self.home.add_child(instance=self.about)
+        self.about.save_revision().publish()
+
+    def baked(self, path: str) -> Path:
+        return self.root / "localhost" / path.strip("/") / baking.INDEX_FILE
+
+    def test_bake_site_writes_compressed_files_once(self) -> None:
+        first = baking.bake_site()
+        second = baking.bake_site()
+
+        self.assertCountEqual(first.written, ["localhost/", "localhost/about/"])
+        self.assertCountEqual(second.unchanged, first.written)
+        self.assertIn(b"<html", self.baked("/").read_bytes())
+        self.assertTrue(self.baked("/about/").with_name("index.html.gz").is_file())
+
+    def test_middleware_serves_baked_file_unless_bypassed(self) -> None:
+        baking.bake_site()
+        self.baked("/about/").write_bytes(b"<html>baked</html>")
+
+        served = self.client.get("/about/", headers={"Host": "localhost"})
+        live = self.client.get("/about/", headers={"Host": "localhost", baking.BYPASS_HEADER: "1"})
+
+        self.assertEqual(served["X-Baked"], "1")
+        self.assertEqual(served.content, b"<html>baked</html>")
+        self.assertNotIn("X-Baked", live)
+
+    def test_slug_change_moves_the_baked_subtree(self) -> None:
+        baking.bake_site()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.about.slug = "about-us"
+            self.about.save_revision().publish()
+
+        self.assertFalse(self.baked("/about/").exists())
+        self.assertTrue(self.baked("/about-us/").is_file())
+        self.assertTrue(self.baked("/").is_file())
+
+    def test_settings_save_rebakes_instead_of_clearing(self) -> None:
+        from .settings import FooterSettings
+
+        baking.bake_site()
+        self.baked("/").unlink()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FooterSettings.for_site(Site.objects.get(is_default_site=True)).save()
+
+        self.assertTrue(self.baked("/").is_file())
+        self.assertTrue(self.baked("/about/").is_file())
+
+    def test_unpublish_removes_the_file(self) -> None:
+        baking.bake_site()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.about.unpublish()
+
+        self.assertFalse(self.baked("/about/").exists())
+
+    def test_file_for_stays_inside_the_bake_root(self) -> None:
+        self.assertEqual(baking.file_for("localhost", "/../etc/"), self.baked("/etc/"))
+        self.assertIsNone(baking.file_for("localhost", "/no-trailing-slash"))
+
+
+# ---------------------------------------------------------------------
+# SITE SETTINGS BUNDLE
+# ---------------------------------------------------------------------
+
+
+class SettingsBundleTests(CmsTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.make_home()
+        self.site = Site.objects.get(is_default_site=True)
+
+    def test_loads_every_settings_model_in_one_query(self) -> None:
+        with self.assertNumQueries(1):
+            bundle = settings_bundle.get_settings_bundle()
+
+        assert bundle is not None
+        self.assertEqual(bundle.footer.site_id, self.site.pk)
+        self.assertEqual(bundle.cookie.site_id, self.site.pk)
+
+    def test_second_load_is_served_from_the_cache(self) -> None:
+        settings_bundle.get_settings_bundle()
+
+        with self.assertNumQueries(0):
+            settings_bundle.get_settings_bundle()
+
+    def test_settings_save_invalidates(self) -> None:
+        from .settings import FooterSettings
+
+        settings_bundle.get_settings_bundle()
+        footer = FooterSettings.for_site(self.site)
+        footer.company_name = "Odin Events BV"
+        footer.save()
+
+        bundle = settings_bundle.get_settings_bundle()
+
+        assert bundle is not None
+        self.assertEqual(bundle.footer.company_name, "Odin Events BV")
+
+    def test_context_processor_is_lazy(self) -> None:
+        from .context_processors import site_settings
+
+        request = self.client.get("/").wsgi_request
+        cache.clear()
+
+        with self.assertNumQueries(0):
+            context = site_settings(request)
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(context["site_settings"].footer)
+
+
+# ---------------------------------------------------------------------
+# NAVIGATION URLS
+# ---------------------------------------------------------------------
+
+
+class NavigationTests(CmsTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.home = self.make_home()
+        self.about = HomePage(title="About", slug="about")
+        self.home.add_child(instance=self.about)
+        self.about.save_revision().publish()
+        self.menu = [
+            {
+                "type": "item",
+                "value": {
+                    "label": "About",
+                    "page": self.about.pk,
+                    "url": "",
+                    "children": [
+                        {"type": "item", "value": {"label": "Home", "page": self.home.pk, "url": ""}, "id": "a"},
+                        {"label": "Blog", "page": None, "url": "https://blog.example.com/"},
+                    ],
+                },
+                "id": "b",
+            }
+        ]
+
+    def test_collects_page_ids_from_items_and_dropdowns(self) -> None:
+        self.assertEqual(navigation.collect_page_ids(self.menu), {self.about.pk, self.home.pk})
+
+    def test_resolves_in_one_query_then_from_the_cache(self) -> None:
+        ids = {self.about.pk, self.home.pk}
+        # The pages, plus Wagtail's site root paths (normally already in the cache).
+        with self.assertNumQueries(2):
+            urls = navigation.resolve_page_urls(ids)
+        with self.assertNumQueries(0):
+            self.assertEqual(navigation.resolve_page_urls(ids), urls)
+
+        self.assertEqual(urls, {self.home.pk: "/", self.about.pk: "/about/"})
+
+    def test_slug_change_invalidates(self) -> None:
+        navigation.resolve_page_urls([self.about.pk])
+        self.about.slug = "about-us"
+        self.about.save_revision().publish()
+
+        self.assertEqual(navigation.resolve_page_urls([self.about.pk]), {self.about.pk: "/about-us/"})
+
+    def test_build_navigation_falls_back_to_external_urls(self) -> None:
+        urls = navigation.resolve_page_urls(navigation.collect_page_ids(self.menu))
+
+        menu = navigation.build_navigation(self.menu, urls)
+
+        self.assertEqual(
+            menu,
+            [
+                {
+                    "label": "About",
+                    "href": "/about/",
+                    "children": [
+                        {"label": "Home", "href": "/"},
+                        {"label": "Blog", "href": "https://blog.example.com/"},
+                    ],
+                }
+            ],
+        )
+
+    def test_missing_pages_resolve_to_empty(self) -> None:
+        self.assertEqual(navigation.resolve_page_urls([987654]), {987654: ""})
+
+
+# ---------------------------------------------------------------------
+# STREAMFIELD PREFETCH
+# ---------------------------------------------------------------------
+
+
+class PrefetchTests(CmsTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.speakers = [self.make_speaker(f"Speaker {index}") for index in range(3)]
+        grid = {"title": "Speakers", "description": "", "featured_speakers": self.speakers}
+        faq = {"title": "FAQ", "faqs": [{"question": "Where?", "answer": "<p>Amsterdam</p>"}]}
+        self.home = self.make_home(body=[("speaker_grid", grid), ("faq_section", faq), ("speaker_grid", grid)])
+        self.body = HomePage.objects.get(pk=self.home.pk).body
+        self.raw = [dict(item) for item in self.body.raw_data]
+
+    def test_one_query_per_model_across_blocks(self) -> None:
+        with self.assertNumQueries(1):
+            prefetch.prefetch_stream(self.body)
+
+        with self.assertNumQueries(0):
+            names = [speaker.name for speaker in self.body[2].value["featured_speakers"]]
+        self.assertEqual(names, ["Speaker 0", "Speaker 1", "Speaker 2"])
+
+    def test_values_match_what_wagtail_builds(self) -> None:
+        # Guards the planner against Wagtail changing how StreamValue/StructValue are assembled.
+        prefetch.prefetch_stream(self.body, [0])
+        reference = HomePage.objects.get(pk=self.home.pk).body
+
+        child, wagtail_child = self.body[0], reference[0]
+        self.assertEqual(child.id, wagtail_child.id)
+        self.assertEqual(child.block_type, "speaker_grid")
+        self.assertIsInstance(child.value, type(wagtail_child.value))
+        self.assertEqual(list(child.value.keys()), list(wagtail_child.value.keys()))
+        self.assertEqual(list(child.value["featured_speakers"]), list(wagtail_child.value["featured_speakers"]))
+        self.assertEqual([dict(item) for item in self.body.raw_data], self.raw)
+        self.assertEqual(child.render(), wagtail_child.render())
+
+    def test_only_requested_indexes_are_converted(self) -> None:
+        with self.assertNumQueries(1):
+            prefetch.prefetch_stream(self.body, [0])
+        # Item 2 was left to Wagtail, which loads its own snippets.
+        with self.assertNumQueries(1):
+            list(self.body[2].value["featured_speakers"])
+
+
+# ---------------------------------------------------------------------
+# BACKGROUND UPLOADS
+# ---------------------------------------------------------------------
+
+
+class UploadQueueTests(CmsTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        with mock.patch.object(uploads, "upload_deduplicated") as upload:
+            self.speaker = self.make_speaker("Ada Lovelace", photo_upload=self.make_image())
+        upload.assert_not_called()
+
+    def job(self) -> uploads.UploadJob:
+        return uploads.UploadJob.objects.get()
+
+    def test_save_queues_a_job_instead_of_uploading(self) -> None:
+        job = self.job()
+
+        self.assertEqual(job.status, uploads.UploadStatus.PENDING)
+        self.assertEqual(job.get_target(), self.speaker)
+        self.assertEqual(self.speaker.upload_status, uploads.UploadStatus.PENDING)
+
+    def test_a_failed_enqueue_rolls_the_save_back(self) -> None:
+        with mock.patch.object(uploads, "enqueue", side_effect=DatabaseError("queue unavailable")):
+            with self.assertRaises(DatabaseError):
+                self.make_speaker("Grace Hopper", photo_upload=self.make_image("blue"))
+
+        self.assertFalse(Speaker.objects.filter(name="Grace Hopper").exists())
+
+    def test_claimed_jobs_are_not_claimed_twice(self) -> None:
+        self.assertEqual(len(uploads.claim(10)), 1)
+        self.assertEqual(uploads.claim(10), [])
+        self.assertEqual(self.job().status, uploads.UploadStatus.RUNNING)
+
+    def test_stale_running_jobs_are_reclaimed(self) -> None:
+        uploads.claim(10)
+        uploads.UploadJob.objects.update(locked_at=timezone.now() - uploads.STALE_LOCK - timedelta(seconds=1))
+
+        self.assertEqual(len(uploads.claim(10)), 1)
+
+    def test_success_writes_the_public_id_back(self) -> None:
+        with mock.patch.object(uploads, "upload_deduplicated", return_value="speakers/ada") as upload:
+            self.assertEqual(uploads.process(), (1, 0))
+
+        upload.assert_called_once()
+        self.speaker.refresh_from_db()
+        self.assertEqual(self.speaker.photo_public_id, "speakers/ada")
+        self.assertEqual(self.speaker.upload_status, uploads.UploadStatus.DONE)
+        self.assertNotEqual(self.speaker.placeholder_color, "")
+        self.assertEqual(self.job().status, uploads.UploadStatus.DONE)
+        self.assertFalse(uploads.UploadJob.objects.exclude(pk=self.job().pk).exists())
+
+    def test_failures_back_off_then_give_up(self) -> None:
+        failing = mock.patch.object(uploads, "upload_deduplicated", side_effect=ConnectionError("offline"))
+        with failing:
+            self.assertEqual(uploads.process(), (0, 1))
+            job = self.job()
+            self.assertEqual((job.status, job.attempts), (uploads.UploadStatus.PENDING, 1))
+            self.assertGreater(job.run_after, timezone.now() + uploads.backoff(1) - timedelta(seconds=5))
+            self.assertEqual(uploads.claim(10), [], "not due before its backoff")
+
+            for _attempt in range(uploads.MAX_ATTEMPTS - 1):
+                uploads.UploadJob.objects.update(run_after=timezone.now())
+                uploads.process()
+
+        job = self.job()
+        self.assertEqual((job.status, job.attempts), (uploads.UploadStatus.FAILED, uploads.MAX_ATTEMPTS))
+        self.assertIn("offline", job.last_error)
+        self.speaker.refresh_from_db()
+        self.assertEqual(self.speaker.upload_status, uploads.UploadStatus.FAILED)
+
+    def test_backoff_is_exponential_and_capped(self) -> None:
+        self.assertEqual(uploads.backoff(1), timedelta(seconds=uploads.BACKOFF_BASE_SECONDS))
+        self.assertEqual(uploads.backoff(3), timedelta(seconds=uploads.BACKOFF_BASE_SECONDS * 4))
+        self.assertEqual(uploads.backoff(50), timedelta(seconds=uploads.BACKOFF_MAX_SECONDS))
+
+    def test_job_for_a_replaced_image_is_obsolete(self) -> None:
+        (job,) = uploads.claim(10)
+        Speaker.objects.filter(pk=self.speaker.pk).update(photo_upload=self.make_image(color="#aa5522"))
+
+        with mock.patch.object(uploads, "upload_deduplicated") as upload:
+            self.assertTrue(uploads.run(job))
+
+        upload.assert_not_called()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.last_error), (uploads.UploadStatus.DONE, "obsolete"))
+
+
+# ---------------------------------------------------------------------
+# CONTENT-HASH DEDUPLICATION
+# ---------------------------------------------------------------------
+
+
+class UploadDeduplicationTests(CmsTestCase):
+    def fake_upload(self) -> Any:
+        uploaded = UploadedAsset("speakers/first", ())
+        return mock.patch.object(uploads, "upload_wagtail_image_to_cloudinary", return_value=uploaded)
+
+    def test_same_content_is_uploaded_once(self) -> None:
+        first, copy = self.make_image(), self.make_image()
+
+        with self.fake_upload() as upload:
+            self.assertEqual(uploads.upload_deduplicated(first, folder="speakers"), "speakers/first")
+            self.assertEqual(uploads.upload_deduplicated(copy, folder="speakers"), "speakers/first")
+
+        upload.assert_called_once()
+        asset = uploads.CloudinaryAsset.objects.get()
+        self.assertEqual((asset.file_hash, asset.image), (first.file_hash, first))
+
+    def test_different_content_is_uploaded_again(self) -> None:
+        with self.fake_upload() as upload:
+            uploads.upload_deduplicated(self.make_image(), folder="speakers")
+            uploads.upload_deduplicated(self.make_image(color="#aa5522"), folder="speakers")
+
+        self.assertEqual(upload.call_count, 2)
+
+    def test_known_content_is_reused_on_save_without_a_job(self) -> None:
+        image = self.make_image()
+        uploads.CloudinaryAsset.objects.create(file_hash=image.file_hash, public_id="speakers/first", image=image)
+
+        speaker = self.make_speaker("Ada Lovelace", photo_upload=self.make_image())
+
+        self.assertEqual(speaker.photo_public_id, "speakers/first")
+        self.assertEqual(speaker.upload_status, uploads.UploadStatus.DONE)
+        self.assertFalse(uploads.UploadJob.objects.exists())
+
+    def test_images_without_a_hash_are_left_to_the_worker(self) -> None:
+        image = self.make_image()
+        uploads.CloudinaryAsset.objects.create(file_hash=image.file_hash, public_id="speakers/first", image=image)
+        get_image_model().objects.filter(pk=image.pk).update(file_hash="")
+        image.refresh_from_db()
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(uploads.find_existing_public_id(image))
+
+
+# ---------------------------------------------------------------------
+# BULK IMPORT
+# ---------------------------------------------------------------------
+
+
+class ImportTests(CmsTestCase):
+    spec = importing.SPECS["speakers"]
+
+    ROWS = [
+        {"name": "Ada Lovelace", "company": "Analytical", "role": "Engineer", "is_keynote": "yes"},
+        {"name": "Grace Hopper", "company": "Navy", "role": "Admiral", "is_keynote": "no"},
+    ]
+
+    def run_import(self, rows: list[dict[str, Any]], **options: Any) -> importing.ImportReport:
+        return importing.import_rows(self.spec, enumerate(rows, start=2), workers=1, **options)
+
+    def test_rows_are_created_with_slugs(self) -> None:
+        report = self.run_import(self.ROWS)
+
+        self.assertEqual((report.rows, report.created, report.failed), (2, 2, []))
+        ada = Speaker.objects.get(name="Ada Lovelace")
+        self.assertEqual((ada.slug, ada.is_keynote), (ada.build_slug(), True))
+
+    def test_import_rebakes_the_site_on_commit(self) -> None:
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        self.enterContext(override_settings(BAKE_ENABLED=True, BAKE_ROOT=root))
+        self.make_home()
+        baking.bake_site()
+        baked = root / "localhost" / baking.INDEX_FILE
+        baked.write_bytes(b"<html>stale</html>")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.run_import(self.ROWS)
+
+        self.assertIn(b"<html", baked.read_bytes())
+        self.assertNotEqual(baked.read_bytes(), b"<html>stale</html>")
+
+    def test_second_run_is_a_no_op(self) -> None:
+        self.run_import(self.ROWS)
+        stamps = dict(Speaker.objects.values_list("pk", "updated_at"))
+        version = caching.get_version(caching.SPEAKERS)
+
+        report = self.run_import(self.ROWS)
+
+        self.assertEqual((report.created, report.updated, report.unchanged), (0, 0, 2))
+        self.assertEqual(dict(Speaker.objects.values_list("pk", "updated_at")), stamps)
+        self.assertEqual(caching.get_version(caching.SPEAKERS), version)
+
+    def test_changed_rows_are_updated_case_insensitively(self) -> None:
+        self.run_import(self.ROWS)
+        before = Speaker.objects.get(name="Ada Lovelace")
+        version = caching.get_version(caching.SPEAKERS)
+
+        report = self.run_import([{"name": "ADA LOVELACE", "company": "analytical", "role": "Mathematician"}])
+
+        self.assertEqual((report.created, report.updated), (0, 1))
+        after = Speaker.objects.get(pk=before.pk)
+        self.assertEqual((after.name, after.role, after.is_keynote), ("ADA LOVELACE", "Mathematician", True))
+        self.assertGreater(after.updated_at, before.updated_at)
+        self.assertNotEqual(caching.get_version(caching.SPEAKERS), version)
+
+    def test_bad_rows_are_reported_and_skipped(self) -> None:
+        report = self.run_import(
+            [
+                {"name": "Ada Lovelace", "company": "Analytical", "is_keynote": "maybe"},
+                {"company": "Nameless"},
+                self.ROWS[1],
+            ]
+        )
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual([line for line, _message in report.failed], [2, 3])
+        self.assertIn("is_keynote", report.failed[0][1])
+        self.assertIn("name", report.failed[1][1])
+
+    def test_dry_run_writes_nothing(self) -> None:
+        report = self.run_import(self.ROWS, dry_run=True)
+
+        self.assertEqual(report.created, 2)
+        self.assertFalse(Speaker.objects.exists())
+
+    def test_media_is_uploaded_only_while_the_public_id_is_empty(self) -> None:
+        rows = [{**self.ROWS[0], "photo_url": "https://example.com/ada.jpg"}]
+        uploaded = UploadedAsset("speakers/ada-lovelace", ())
+        with (
+            mock.patch.object(importing, "upload_file_to_cloudinary", return_value=uploaded) as upload,
+            mock.patch.object(importing.placeholders, "for_public_id", side_effect=OSError),
+        ):
+            self.run_import(rows)
+            self.run_import(rows)
+
+        upload.assert_called_once()
+        self.assertEqual(upload.call_args.kwargs["public_id"], Speaker.objects.get().slug)
+        speaker = Speaker.objects.get()
+        self.assertEqual(speaker.photo_public_id, "speakers/ada-lovelace")
+        self.assertEqual(speaker.upload_status, uploads.UploadStatus.DONE)
+
+    def test_imported_rows_are_searchable_in_the_admin(self) -> None:
+        self.run_import(self.ROWS)
+
+        results = get_search_backend().search("Hopper", Speaker)
+
+        self.assertEqual([speaker.name for speaker in results], ["Grace Hopper"])
+
+    def test_csv_and_json_files(self) -> None:
+        csv_file = io.BytesIO(b"\xef\xbb\xbfname,company,role\nAda Lovelace,Analytical,Engineer\n")
+        json_file = io.BytesIO(b'[{"name": "Grace Hopper", "company": "Navy"}, {"name": "Ada Lovelace",')
+
+        self.assertEqual(importing.import_file(self.spec, csv_file, "csv").created, 1)
+        report = importing.import_file(self.spec, json_file, "json", batch_size=1)
+
+        # Batches read before the truncation are kept.
+        self.assertEqual(report.created, 1)
+        self.assertEqual(len(report.failed), 1)
+        self.assertIn("unreadable input", report.failed[0][1])
+
+
+# ---------------------------------------------------------------------
+# EAGER DERIVATIVES
+# ---------------------------------------------------------------------
+
+
+class EagerDerivativeTests(CmsTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.backend = mock.Mock()
+        self.backend.upload.side_effect = lambda source, **options: {
+            "public_id": f"{options['folder']}/asset",
+            "eager": [{"transformation": t} for t in options.get("eager", [])],
+        }
+        self.backend.explicit.side_effect = lambda public_id, **options: {
+            "public_id": public_id,
+            "eager": [{"transformation": t} for t in options.get("eager", [])],
+        }
+        patch = mock.patch.object(media_backends, "get_backend", return_value=self.backend)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def built(self, public_id: str) -> set[str]:
+        derivatives = uploads.CloudinaryDerivative.objects.filter(public_id=public_id)
+        return set(derivatives.values_list("transformation", flat=True))
+
+    def test_upload_builds_the_preset_derivatives(self) -> None:
+        public_id = uploads.upload_deduplicated(self.make_image(), folder="speakers", preset_names=("speaker_card",))
+
+        expected = presets.derivatives_for(["speaker_card"])
+        self.assertEqual(self.backend.upload.call_args.kwargs["eager"], expected)
+        self.assertFalse(self.backend.upload.call_args.kwargs["eager_async"])
+        self.assertEqual(self.built(public_id), set(expected))
+
+    @override_settings(CLOUDINARY_EAGER_ASYNC=True)
+    def test_async_derivatives_are_recorded_as_requested(self) -> None:
+        self.backend.upload.side_effect = lambda source, **options: {"public_id": "speakers/asset"}
+
+        uploads.upload_deduplicated(self.make_image(), folder="speakers", preset_names=("speaker_card",))
+
+        self.assertTrue(self.backend.upload.call_args.kwargs["eager_async"])
+        self.assertEqual(self.built("speakers/asset"), set(presets.derivatives_for(["speaker_card"])))
+
+    def test_reused_assets_only_build_what_is_missing(self) -> None:
+        public_id = uploads.upload_deduplicated(self.make_image(), folder="speakers", preset_names=("speaker_card",))
+        uploads.upload_deduplicated(self.make_image(), folder="speakers", preset_names=("speaker_card",))
+        self.backend.explicit.assert_not_called()
+
+        uploads.upload_deduplicated(self.make_image(), folder="sponsors", preset_names=("speaker_card", "og_image"))
+
+        self.backend.upload.assert_called_once()
+        card, og_image = presets.derivatives_for(["speaker_card"]), presets.derivatives_for(["og_image"])
+        self.assertEqual(set(self.backend.explicit.call_args.kwargs["eager"]), set(og_image) - set(card))
+        self.assertEqual(uploads.missing_derivatives(public_id, presets.derivatives_for(["og_image"])), [])
+
+    def test_command_backfills_existing_assets_once(self) -> None:
+        self.make_speaker("Ada Lovelace", photo_public_id="speakers/ada")
+        out = io.StringIO()
+
+        call_command("build_cloudinary_derivatives", stdout=out)
+        call_command("build_cloudinary_derivatives", stdout=out)
+
+        self.backend.explicit.assert_called_once()
+        self.assertEqual(self.built("speakers/ada"), set(presets.derivatives_for(Speaker.cloudinary_presets)))
+        self.assertIn("1 assets checked, 0 derivatives built", out.getvalue())
+
+
+# ---------------------------------------------------------------------
+# PLACEHOLDERS
+# ---------------------------------------------------------------------
+
+
+class SnippetPlaceholderTests(CmsTestCase):
+    def test_replacing_the_image_clears_the_placeholder(self) -> None:
+        speaker = self.make_speaker("Ada Lovelace", photo_upload=self.make_image())
+        speaker.set_placeholder("data:image/webp;base64,AAAA", "#2255aa")
+        speaker.save()
+
+        speaker.photo_upload = self.make_image(color="#aa5522")
+        speaker.save()
+
+        speaker.refresh_from_db()
+        self.assertEqual((speaker.placeholder_lqip, speaker.placeholder_color), ("", ""))
+
+    def test_fill_placeholders_catches_up_on_snippets_without_one(self) -> None:
+        speaker = self.make_speaker("Ada Lovelace", photo_upload=self.make_image(color="#2255aa"))
+        self.make_speaker("Grace Hopper")  # no image: nothing to compute
+
+        self.assertEqual(uploads.fill_placeholders(), 1)
+        self.assertEqual(uploads.fill_placeholders(), 0)
+        speaker.refresh_from_db()
+        self.assertEqual(speaker.placeholder_color, "#2255aa")
+        self.assertTrue(speaker.placeholder_lqip.startswith("data:image/webp;base64,"))
+
+    def test_unreadable_sources_are_not_retried(self) -> None:
+        speaker = self.make_speaker("Ada Lovelace", photo_public_id="speakers/missing")
+
+        with mock.patch.object(uploads.placeholders, "for_public_id", side_effect=OSError("404")) as fetch:
+            self.assertEqual(uploads.fill_placeholders(), 1)
+            self.assertEqual(uploads.fill_placeholders(), 0)
+
+        fetch.assert_called_once_with("speakers/missing")
+        speaker.refresh_from_db()
+        self.assertEqual(speaker.placeholder_color, "transparent")
+
+
+# ---------------------------------------------------------------------
+# HERO VIDEO
+# ---------------------------------------------------------------------
+
+
+class HeroVideoTests(CmsTestCase):
+    HERO = {"title": "Odin", "video_public_id": "hero/loop", "poster_public_id": "hero/poster"}
+
+    def test_video_is_deferred_and_the_poster_preloaded(self) -> None:
+        self.make_home(body=[("hero", self.HERO)])
+
+        html = self.client.get("/").content.decode()
+
+        head, body = html.split("</head>", 1)
+        self.assertIn('<link rel="preload" as="image" type="image/avif"', head)
+        self.assertIn('preload="none"', body)
+        self.assertIn("data-hero-video", body)
+        self.assertIn(f'data-hls="{media_backends.delivery_url("sp_auto", "hero/loop.m3u8", "video")}"', body)
+        self.assertIn('data-sources="640 ', body)
+        self.assertNotIn("<source src=", body)
+        self.assertNotIn("autoplay", body)
+        self.assertIn('fetchpriority="high"', body)
+
+    def test_poster_is_only_preloaded_when_the_hero_opens_the_page(self) -> None:
+        faq = {"title": "FAQ", "faqs": []}
+        self.make_home(body=[("faq_section", faq), ("hero", self.HERO)])
+
+        head = self.client.get("/").content.decode().split("</head>", 1)[0]
+
+        self.assertNotIn('rel="preload" as="image"', head)
+
+
+# ---------------------------------------------------------------------
+# FRONT-END BUNDLE
+# ---------------------------------------------------------------------
+
+
+class FrontEndBundleTests(CmsTestCase):
+    def test_bundle_is_a_module_and_gsap_is_not_parser_blocking(self) -> None:
+        self.make_home()
+
+        head = self.client.get("/").content.decode().split("</head>", 1)[0]
+
+        bundle = head[head.index('<script\n      type="module"') :]
+        self.assertIn(f'src="{static("dist/alpine.js")}"', bundle.split("></script>", 1)[0])
+        self.assertIn(f'data-gsap-src="{static("vendor/gsap.min.js")}"', bundle)
+        self.assertNotIn(f' src="{static("vendor/gsap.min.js")}"', head)
+
+
+@skipUnless(shutil.which("bun"), "bun is needed to build the front-end bundle")
+class BuiltBundleTests(TestCase):
+    """
+    Builds static/js/alpine.ts the way ``bun run build:js`` does and inspects the output.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        outdir = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, outdir, ignore_errors=True)
+        subprocess.run(
+            [
+                "bun", "build", "./static/js/alpine.ts", "--outdir", str(outdir), "--splitting",
+                "--format", "esm", "--chunk-naming", "chunks/[name]-[hash].[ext]", "--minify",
+            ],
+            cwd=settings.BASE_DIR,
+            check=True,
+            capture_output=True,
+        )
+        cls.entry = (outdir / "alpine.js").read_text(encoding="utf-8")
+        cls.chunks = {path.name.split("-", 1)[0]: path for path in (outdir / "chunks").glob("*.js")}
+
+    def test_heavy_modules_are_separate_chunks(self) -> None:
+        for module in ("countdown", "carousel", "analytics"):
+            self.assertIn(module, self.chunks)
+            self.assertIn(f'import("./chunks/{self.chunks[module].name}")', self.entry)
+
+    def test_analytics_waits_for_consent(self) -> None:
+        self.assertIn('"odin_cookie_consent"', self.entry)
+        self.assertIn('"cookie-consent-granted"', self.entry)
+        self.assertIn("loadScripts", self.chunks["analytics"].read_text(encoding="utf-8"))
+
+
+# ---------------------------------------------------------------------
+# CONDITIONAL GET
+# ---------------------------------------------------------------------
+
+
+class ConditionalGetTests(CmsTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.speaker = self.make_speaker("Ada Lovelace")
+        self.home = self.make_home()
+
+    def test_pages_carry_validators_and_must_revalidate(self) -> None:
+        response = self.client.get("/")
+
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_matching_etag_gives_304_without_rendering(self) -> None:
+        etag = self.client.get("/")["ETag"]
+
+        with self.assertTemplateNotUsed("cms_integration/home_page.html"):
+            response = self.client.get("/", headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_matching_last_modified_gives_304(self) -> None:
+        last_modified = self.client.get("/")["Last-Modified"]
+
+        response = self.client.get("/", headers={"If-Modified-Since": last_modified})
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_revalidation_skips_the_snippet_aggregates(self) -> None:
+        etag = self.client.get("/")["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get("/", headers={"If-None-Match": etag}).status_code, 304)
+
+        self.assertFalse([query["sql"] for query in queries if "MAX(" in query["sql"].upper()])
+
+    def test_snippet_edits_change_the_etag(self) -> None:
+        etag = self.client.get("/")["ETag"]
+
+        self.speaker.role = "Mathematician"
+        self.speaker.save()
+        edited = self.client.get("/", headers={"If-None-Match": etag})
+        self.assertEqual(edited.status_code, 200)
+
+        self.speaker.delete()
+        deleted = self.client.get("/", headers={"If-None-Match": edited["ETag"]})
+        self.assertEqual(deleted.status_code, 200)
+        self.assertEqual(len({etag, edited["ETag"], deleted["ETag"]}), 3)
+
+    def test_etag_depends_on_the_path(self) -> None:
+        self.assertNotEqual(self.client.get("/")["ETag"], self.client.get("/?utm_source=mail")["ETag"])
+
+    def test_editors_get_no_validators(self) -> None:
+        user = get_user_model().objects.create_superuser("editor", "editor@example.com", "pw")
+        self.client.force_login(user)
+
+        response = self.client.get("/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+
+# ---------------------------------------------------------------------
+# HTMX PARTIALS
+# ---------------------------------------------------------------------
+
+
+@override_settings(PARTIAL_CACHE_TIMEOUT=300, PARTIAL_CDN_MAX_AGE=30)
+class PartialCacheTests(CmsTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.speaker = self.make_speaker("Ada Lovelace")
+
+    def get(self, url: str = "/hx/speakers/", **headers: str) -> Any:
+        return self.client.get(url, headers={"HX-Request": "true", **headers})
+
+    def test_second_request_is_a_hit_without_queries(self) -> None:
+        first = self.get()
+
+        with self.assertNumQueries(0):
+            second = self.get()
+
+        self.assertEqual((first["X-Partial-Cache"], second["X-Partial-Cache"]), ("MISS", "HIT"))
+        self.assertEqual(first.content, second.content)
+        self.assertIn("Ada Lovelace", second.content.decode())
+
+    def test_matching_etag_gives_304(self) -> None:
+        etag = self.get()["ETag"]
+
+        response = self.get(**{"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_snippet_save_invalidates_only_its_listing(self) -> None:
+        speakers, sponsors = self.get()["ETag"], self.get("/hx/sponsors/")["ETag"]
+
+        self.speaker.role = "Mathematician"
+        self.speaker.save()
+
+        refreshed = self.get(**{"If-None-Match": speakers})
+        self.assertEqual((refreshed.status_code, refreshed["X-Partial-Cache"]), (200, "MISS"))
+        self.assertIn("Mathematician", refreshed.content.decode())
+        self.assertEqual(self.get("/hx/sponsors/", **{"If-None-Match": sponsors}).status_code, 304)
+
+    def test_unread_query_parameters_share_the_entry(self) -> None:
+        self.get()
+
+        response = self.get("/hx/speakers/?utm_source=mail&_=1700000000")
+
+        self.assertEqual(response["X-Partial-Cache"], "HIT")
+
+    def test_htmx_and_plain_requests_are_cached_apart(self) -> None:
+        self.get()
+
+        plain = self.client.get("/hx/speakers/")
+
+        self.assertEqual(plain["X-Partial-Cache"], "MISS")
+        self.assertIn("HX-Request", plain["Vary"])
+
+    def test_responses_are_public_for_shared_caches(self) -> None:
+        cache_control = self.get()["Cache-Control"]
+
+        for directive in ("public", "max-age=0", "s-maxage=30", "stale-while-revalidate=300"):
+            self.assertIn(directive, cache_control)
+
+    @override_settings(PARTIAL_CACHE_TIMEOUT=0)
+    def test_zero_timeout_disables_the_cache(self) -> None:
+        self.get()
+
+        self.assertNotIn("X-Partial-Cache", self.get())
+
+
+# ---------------------------------------------------------------------
+# KEYSET PAGINATION
+# ---------------------------------------------------------------------
+
+
+class PaginationTests(CmsTestCase):
+    NAMES = ["Ada Lovelace", "Alan Turing", "Barbara Liskov", "Edsger Dijkstra", "Grace Hopper"]
+
+    def setUp(self) -> None:
+        super().setUp()
+        for name in self.NAMES:
+            self.make_speaker(name, is_keynote=name == "Grace Hopper")
+
+    def walk(self, size: int = 2) -> list[list[str]]:
+        pages, cursor = [], ""
+        while True:
+            page = pagination.paginate(Speaker.objects.all(), pagination.SPEAKERS, cursor, size=size)
+            pages.append([speaker.name for speaker in page.items])
+            if not page.next_cursor:
+                return pages
+            cursor = page.next_cursor
+
+    def test_cursors_walk_every_row_once_in_order(self) -> None:
+        self.assertEqual(
+            self.walk(),
+            [["Grace Hopper", "Ada Lovelace"], ["Alan Turing", "Barbara Liskov"], ["Edsger Dijkstra"]],
+        )
+
+    def test_each_page_is_one_query(self) -> None:
+        first = pagination.paginate(Speaker.objects.all(), pagination.SPEAKERS, size=2)
+
+        with self.assertNumQueries(1):
+            pagination.paginate(Speaker.objects.all(), pagination.SPEAKERS, first.next_cursor)
+
+    def test_rows_added_before_the_cursor_do_not_shift_later_pages(self) -> None:
+        first = pagination.paginate(Speaker.objects.all(), pagination.SPEAKERS, size=2)
+        self.make_speaker("Aaron Swartz")
+
+        second = pagination.paginate(Speaker.objects.all(), pagination.SPEAKERS, first.next_cursor)
+
+        self.assertEqual([speaker.name for speaker in second.items], ["Alan Turing", "Barbara Liskov"])
+
+    def test_cursor_carries_the_page_size(self) -> None:
+        first = pagination.paginate(Speaker.objects.all(), pagination.SPEAKERS, size=3)
+
+        second = pagination.paginate(Speaker.objects.all(), pagination.SPEAKERS, first.next_cursor, size=1)
+
+        self.assertEqual(len(second.items), 2)
+        self.assertEqual(second.next_cursor, "")
+
+    def test_tampered_and_foreign_cursors_are_rejected(self) -> None:
+        cursor = pagination.paginate(Speaker.objects.all(), pagination.SPEAKERS, size=2).next_cursor
+        forged = pagination.encode_cursor(Speaker.objects.all(), ["x"], 2)
+
+        for bad in (cursor[:-2] + "xx", "garbage", forged):
+            with self.subTest(cursor=bad), self.assertRaises(pagination.InvalidCursor):
+                pagination.paginate(Speaker.objects.all(), pagination.SPEAKERS, bad)
+        with self.assertRaises(pagination.InvalidCursor):
+            pagination.paginate(Sponsor.objects.all(), pagination.SPONSORS, cursor)
+
+    def test_descending_fields_compare_with_less_than(self) -> None:
+        condition = pagination.SPEAKERS.after([True, "Grace Hopper", 5])
+
+        self.assertEqual(
+            condition,
+            Q(is_keynote__lt=True)
+            | Q(is_keynote=True, name__gt="Grace Hopper")
+            | Q(is_keynote=True, name="Grace Hopper", id__gt=5),
+        )
+
+    @override_settings(LISTING_PAGE_SIZE=2, PARTIAL_CACHE_TIMEOUT=0)
+    def test_infinite_scroll_follows_next_urls(self) -> None:
+        html = self.client.get("/hx/speakers/").content.decode()
+        names = []
+        while True:
+            names += sorted((name for name in self.NAMES if name in html), key=html.index)
+            match = re.search(r'hx-get="([^"]+)"', html)
+            if match is None:
+                break
+            response = self.client.get(unescape(match.group(1)), headers={"HX-Request": "true"})
+            self.assertEqual(response.status_code, 200)
+            self.assertTemplateUsed(response, "cms_integration/partials/speakers_page.html")
+            html = response.content.decode()
+
+        self.assertEqual(names, ["Grace Hopper", "Ada Lovelace", "Alan Turing", "Barbara Liskov", "Edsger Dijkstra"])
+
+    @override_settings(LISTING_PAGE_SIZE=2)
+    def test_index_pages_render_the_first_page_and_the_sentinel(self) -> None:
+        home = self.make_home()
+        for model, slug in (
+            (SpeakersIndexPage, "speakers"),
+            (SponsorsIndexPage, "sponsors"),
+            (PartnersIndexPage, "partners"),
+        ):
+            home.add_child(instance=model(title=slug.title(), slug=slug))
+
+        speakers = self.client.get("/speakers/")
+        self.assertTemplateUsed(speakers, "cms_integration/partials/speakers_grid.html")
+        html = speakers.content.decode()
+        self.assertIn("Grace Hopper", html)
+        self.assertIn("Ada Lovelace", html)
+        self.assertNotIn("Alan Turing", html)
+        self.assertRegex(unescape(html), r'hx-get="/hx/speakers/\?cursor=[^"]+"')
+
+        for slug in ("sponsors", "partners"):
+            with self.subTest(slug=slug):
+                response = self.client.get(f"/{slug}/")
+                self.assertTemplateUsed(response, f"cms_integration/{slug}_index.html")
+                self.assertContains(response, f"No {slug} yet.")
+                self.assertNotContains(response, f"/hx/{slug}/")
+
+    def test_invalid_cursor_is_a_bad_request(self) -> None:
+        response = self.client.get("/hx/speakers/?cursor=garbage")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("X-Partial-Cache", response)
+
+
+# ---------------------------------------------------------------------
+# TYPEAHEAD SEARCH
+# ---------------------------------------------------------------------
+
+
+@override_settings(PARTIAL_CACHE_TIMEOUT=300)
+class SearchTests(CmsTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.make_speaker("Ada Lovelace", company="Analytical Engines")
+        self.make_speaker("Lovelace Ada", company="Acme")
+        self.make_speaker("Grace Hopper", company="Navy")
+        Sponsor.objects.create(name="Lovable Labs", slug="lovable-labs", tier="gold")
+
+    def titles(self, query: str) -> list[str]:
+        return [result.title for result in search.search(search.normalize(query))]
+
+    def test_infix_matches_on_sqlite(self) -> None:
+        self.assertEqual(connection.vendor, "sqlite")
+        self.assertEqual(self.titles("race"), ["Grace Hopper"])
+        self.assertEqual(self.titles("ENGINES"), ["Ada Lovelace"])
+
+    def test_name_prefixes_rank_first_then_kinds_in_order(self) -> None:
+        self.assertEqual(self.titles("lov"), ["Lovelace Ada", "Ada Lovelace", "Lovable Labs"])
+
+        results = search.search("lov")
+        self.assertEqual([result.kind for result in results], ["Speaker", "Speaker", "Sponsor"])
+        self.assertEqual(results[-1].subtitle, "Gold")
+
+    def test_short_queries_return_nothing(self) -> None:
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles(" a "), [])
+
+    def test_results_are_capped_per_kind(self) -> None:
+        for number in range(search.RESULTS_PER_KIND + 2):
+            self.make_speaker(f"Speaker {number}")
+
+        self.assertEqual(len(self.titles("speaker")), search.RESULTS_PER_KIND)
+
+    def test_normalize(self) -> None:
+        self.assertEqual(search.normalize("  Ada \t LOVELACE "), "ada lovelace")
+        self.assertEqual(len(search.normalize("x" * 500)), search.MAX_QUERY_LENGTH)
+
+    def test_endpoint_renders_and_caches_results(self) -> None:
+        first = self.client.get("/hx/search/?q=Hopper", headers={"HX-Request": "true"})
+        second = self.client.get("/hx/search/?q=%20hopper%20&utm_source=x", headers={"HX-Request": "true"})
+
+        self.assertIn("Grace Hopper", first.content.decode())
+        self.assertEqual((first["X-Partial-Cache"], second["X-Partial-Cache"]), ("MISS", "HIT"))
+        self.assertIn("No matches for", self.client.get("/hx/search/?q=zzz").content.decode())
+        self.assertEqual(self.client.get("/hx/search/?q=z").content.decode().strip(), "")
+
+    def test_snippet_save_invalidates_cached_results(self) -> None:
+        self.client.get("/hx/search/?q=hopper")
+        Speaker.objects.get(name="Grace Hopper").delete()
+
+        response = self.client.get("/hx/search/?q=hopper")
+
+        self.assertEqual(response["X-Partial-Cache"], "MISS")
+        self.assertNotIn("Grace Hopper", response.content.decode())
+
+    def test_header_has_a_desktop_and_a_mobile_search_box(self) -> None:
+        self.make_home()
+
+        html = self.client.get("/").content.decode()
+
+        for search_id in ("header-search", "mobile-search"):
+            self.assertIn(f'id="{search_id}"', html)
+            self.assertIn(f'hx-target="#{search_id}-results"', html)
+            self.assertIn(f'id="{search_id}-results"', html)
+        self.assertEqual(html.count('hx-get="/hx/search/"'), 2)
@@ -0,0 +1,373 @@
+"""
+Durable, DB-backed queue for Cloudinary uploads triggered by snippet saves.
+
+``save()`` only records an ``UploadJob`` (in the same transaction as the snippet),
+so editors never wait on the network. ``manage.py process_uploads`` claims due
+jobs, uploads, and writes the public id back; failures are retried with
+exponential backoff until ``MAX_ATTEMPTS``.
+
+Uploads are deduplicated by content: ``CloudinaryAsset`` maps Wagtail's image
+``file_hash`` to the public id it was uploaded as, so the same logo chosen for
+a sponsor and a partner (or re-uploaded as a new Wagtail image) is sent once.
+
+Each upload also asks Cloudinary to build the derivatives of the model's
+presets (``cloudinary_presets``, see apps/core/presets.py) eagerly, so the first
+visitor gets a cached asset instead of waiting for an on-the-fly transformation.
+Built derivatives are recorded per public id in ``CloudinaryDerivative``.
+
+The worker also computes the snippet's inline placeholder (blurred preview and
+dominant colour). ``fill_placeholders`` catches up on snippets that got a public
+id without a job (deduplicated uploads, imports, ids typed by an editor).
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Any, Iterable, Sequence
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+from wagtail.images import get_image_model, get_image_model_string
+
+from apps.core import placeholders, presets
+
+from .utils.cloudinary_upload import build_derivatives, upload_wagtail_image_to_cloudinary
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 60 * 60
+
+# A "running" job whose worker died is picked up again after this long.
+STALE_LOCK = timedelta(minutes=10)
+
+
+class UploadStatus(models.TextChoices):
+    NONE = "", "No upload"
+    PENDING = "pending", "Pending"
+    RUNNING = "running", "Uploading"
+    DONE = "done", "Uploaded"
+    FAILED = "failed", "Failed"
+
+
+class UploadJob(models.Model):
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name="+")
+    object_id = models.PositiveBigIntegerField()
+    image = models.ForeignKey(
+        get_image_model_string(),
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    folder = models.CharField(max_length=255)
+
+    status = models.CharField(max_length=20, choices=UploadStatus.choices, default=UploadStatus.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    public_id = models.CharField(max_length=255, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Cloudinary upload job"
+        verbose_name_plural = "Cloudinary upload jobs"
+        ordering = ["run_after", "pk"]
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="uploadjob_due_idx"),
+            models.Index(fields=["content_type", "object_id"], name="uploadjob_target_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.content_type.model}#{self.object_id} → {self.folder} ({self.status})"
+
+    def get_target(self) -> Any | None:
+        model = self.content_type.model_class()
+        if model is None:
+            return None
+        return model._default_manager.filter(pk=self.object_id).first()
+
+
+class CloudinaryAsset(models.Model):
+    file_hash = models.CharField(max_length=40, unique=True)
+    public_id = models.CharField(max_length=255)
+    image = models.ForeignKey(
+        get_image_model_string(),
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        help_text="Image the asset was first uploaded from.",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Cloudinary asset"
+        verbose_name_plural = "Cloudinary assets"
+
+    def __str__(self) -> str:
+        return self.public_id
+
+
+class CloudinaryDerivative(models.Model):
+    public_id = models.CharField(max_length=255)
+    transformation = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Cloudinary derivative"
+        verbose_name_plural = "Cloudinary derivatives"
+        constraints = [
+            models.UniqueConstraint(fields=["public_id", "transformation"], name="uniq_cloudinary_derivative"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.transformation}/{self.public_id}"
+
+
+def eager_async() -> bool:
+    return bool(getattr(settings, "CLOUDINARY_EAGER_ASYNC", False))
+
+
+def record_derivatives(public_id: str, transformations: Iterable[str]) -> None:
+    CloudinaryDerivative.objects.bulk_create(
+        [CloudinaryDerivative(public_id=public_id, transformation=t) for t in transformations],
+        ignore_conflicts=True,
+    )
+
+
+def missing_derivatives(public_id: str, transformations: Sequence[str]) -> list[str]:
+    built = set(
+        CloudinaryDerivative.objects.filter(public_id=public_id, transformation__in=transformations).values_list(
+            "transformation", flat=True
+        )
+    )
+    return [t for t in transformations if t not in built]
+
+
+def ensure_derivatives(public_id: str, preset_names: Iterable[str]) -> list[str]:
+    """
+    Build (via the explicit API) whichever preset derivatives ``public_id`` doesn't have yet.
+    """
+    missing = missing_derivatives(public_id, presets.derivatives_for(preset_names))
+    if missing:
+        record_derivatives(public_id, build_derivatives(public_id, missing, eager_async=eager_async()))
+    return missing
+
+
+def find_existing_public_id(image: Any) -> str | None:
+    """
+    Public id of an earlier upload with the same content. Never reads the file:
+    images without a stored hash are left to the worker.
+    """
+    if not image.file_hash:
+        return None
+    return CloudinaryAsset.objects.filter(file_hash=image.file_hash).values_list("public_id", flat=True).first()
+
+
+def upload_deduplicated(image: Any, *, folder: str, preset_names: Sequence[str] = ()) -> str:
+    """
+    Upload ``image`` unless its content is already on Cloudinary; returns the public id.
+    Derivatives for ``preset_names`` are built during the upload (or added to the existing asset).
+    """
+    file_hash = image.get_file_hash()
+    existing = find_existing_public_id(image)
+    if existing:
+        ensure_derivatives(existing, preset_names)
+        return existing
+
+    uploaded = upload_wagtail_image_to_cloudinary(
+        image,
+        folder=folder,
+        eager=presets.derivatives_for(preset_names),
+        eager_async=eager_async(),
+    )
+    record_derivatives(uploaded.public_id, uploaded.derivatives)
+    asset, _created = CloudinaryAsset.objects.get_or_create(
+        file_hash=file_hash,
+        defaults={"public_id": uploaded.public_id, "image": image},
+    )
+    return asset.public_id
+
+
+def backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS))
+
+
+# ---------------------------------------------------------------------
+# PRODUCER (snippet save)
+# ---------------------------------------------------------------------
+
+
+def enqueue(instance: Any, image: Any, *, folder: str) -> UploadJob:
+    """
+    Queue an upload of ``image`` for ``instance``; replaces any job still waiting for it.
+    """
+    content_type = ContentType.objects.get_for_model(instance, for_concrete_model=False)
+    UploadJob.objects.filter(
+        content_type=content_type,
+        object_id=instance.pk,
+        status=UploadStatus.PENDING,
+    ).delete()
+    return UploadJob.objects.create(
+        content_type=content_type,
+        object_id=instance.pk,
+        image=image,
+        folder=folder,
+    )
+
+
+# ---------------------------------------------------------------------
+# CONSUMER (manage.py process_uploads)
+# ---------------------------------------------------------------------
+
+
+def claim(limit: int) -> list[UploadJob]:
+    """
+    Atomically mark up to ``limit`` due jobs as running (SKIP LOCKED where supported).
+    """
+    now = timezone.now()
+    due = Q(status=UploadStatus.PENDING, run_after__lte=now) | Q(
+        status=UploadStatus.RUNNING,
+        locked_at__lt=now - STALE_LOCK,
+    )
+    with transaction.atomic():
+        queryset = UploadJob.objects.select_for_update(skip_locked=True).filter(due).order_by("run_after", "pk")
+        jobs = list(queryset[:limit])
+        UploadJob.objects.filter(pk__in=[job.pk for job in jobs]).update(status=UploadStatus.RUNNING, locked_at=now)
+    for job in jobs:
+        job.status = UploadStatus.RUNNING
+        job.locked_at = now
+    return jobs
+
+
+def _placeholder(image: Any) -> placeholders.Placeholder | None:
+    try:
+        return placeholders.for_image(image)
+    except Exception as exc:  # a missing placeholder never fails the upload
+        logger.warning("Placeholder failed for image %s: %s", image.pk, exc)
+        return None
+
+
+def _set_target_status(
+    target: Any,
+    status: str,
+    public_id: str | None = None,
+    placeholder: placeholders.Placeholder | None = None,
+) -> None:
+    target.upload_status = status
+    update_fields = ["upload_status"]
+    if public_id is not None:
+        setattr(target, target.cloudinary_public_id_field, public_id)
+        update_fields.append(target.cloudinary_public_id_field)
+    if placeholder is not None:
+        update_fields += target.set_placeholder(placeholder.lqip, placeholder.color)
+    # Regular save (not .update()) so the cache/bake signals see the new public id.
+    target.save(update_fields=update_fields)
+
+
+def run(job: UploadJob) -> bool:
+    """
+    Process one claimed job. Returns True on success (or when the job became obsolete).
+    """
+    target = job.get_target()
+    image_field = getattr(target, "cloudinary_image_field", None) if target is not None else None
+    if target is None or image_field is None or getattr(target, f"{image_field}_id") != job.image_id:
+        # Snippet deleted or its image replaced since the job was queued.
+        UploadJob.objects.filter(pk=job.pk).update(status=UploadStatus.DONE, locked_at=None, last_error="obsolete")
+        return True
+
+    try:
+        image = get_image_model().objects.get(pk=job.image_id)
+        public_id = upload_deduplicated(image, folder=job.folder, preset_names=target.cloudinary_presets)
+    except Exception as exc:  # any failure is retried
+        attempts = job.attempts + 1
+        failed = attempts >= MAX_ATTEMPTS
+        UploadJob.objects.filter(pk=job.pk).update(
+            status=UploadStatus.FAILED if failed else UploadStatus.PENDING,
+            attempts=attempts,
+            run_after=timezone.now() + backoff(attempts),
+            locked_at=None,
+            last_error=f"{type(exc).__name__}: {exc}",
+        )
+        logger.warning("Cloudinary upload failed for %s (attempt %s/%s): %s", job, attempts, MAX_ATTEMPTS, exc)
+        if failed:
+            _set_target_status(target, UploadStatus.FAILED)
+        return False
+
+    placeholder = _placeholder(image)
+
+    with transaction.atomic():
+        UploadJob.objects.filter(pk=job.pk).update(
+            status=UploadStatus.DONE,
+            attempts=job.attempts + 1,
+            locked_at=None,
+            last_error="",
+            public_id=public_id,
+        )
+        _set_target_status(target, UploadStatus.DONE, public_id, placeholder)
+    return True
+
+
+def process(limit: int = 10) -> tuple[int, int]:
+    """
+    Claim and run one batch. Returns (succeeded, failed).
+    """
+    succeeded = failed = 0
+    for job in claim(limit):
+        if run(job):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
+
+
+# ---------------------------------------------------------------------
+# PLACEHOLDERS (backfill)
+# ---------------------------------------------------------------------
+
+
+def placeholder_models() -> list[type[models.Model]]:
+    from .mixins import CloudinaryUploadMixin  # noqa: WPS433
+
+    return [model for model in apps.get_models() if issubclass(model, CloudinaryUploadMixin)]
+
+
+def fill_placeholders(limit: int = 50) -> int:
+    """
+    Compute missing placeholders (up to ``limit``); returns how many snippets were updated.
+    Sources that can't be read get ``UNKNOWN_COLOR`` so they aren't retried every round.
+    """
+    updated = 0
+    for model in placeholder_models():
+        image_field = model.cloudinary_image_field  # type: ignore[attr-defined]
+        public_id_field = model.cloudinary_public_id_field  # type: ignore[attr-defined]
+        pending = (
+            model._default_manager.filter(placeholder_color="")
+            .filter(Q(**{f"{image_field}__isnull": False}) | ~Q(**{public_id_field: ""}))
+            .select_related(image_field)
+            .order_by("pk")[: limit - updated]
+        )
+        for target in pending:
+            image = getattr(target, image_field)
+            try:
+                if image is not None:
+                    placeholder = placeholders.for_image(image)
+                else:
+                    placeholder = placeholders.for_public_id(getattr(target, public_id_field))
+            except Exception as exc:
+                logger.warning("Placeholder failed for %s: %s", target, exc)
+                placeholder = placeholders.Placeholder(lqip="", color=placeholders.UNKNOWN_COLOR)
+            # Regular save (cache/bake signals), touching only the placeholder.
+            target.save(update_fields=target.set_placeholder(placeholder.lqip, placeholder.color))
+            updated += 1
+        if updated >= limit:
+            break
+    return updated
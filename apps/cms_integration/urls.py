@@ -8,5 +8,6 @@ urlpatterns = [
     path("sponsors/", views.hx_sponsors, name="hx-sponsors"),
     path("speakers/", views.hx_speakers, name="hx-speakers"),
     path("partners/", views.hx_partners, name="hx-partners"),
+    path("search/", views.hx_search, name="hx-search"),
     path("ping/", views.hx_ping, name="htmx-ping"),
 ]
@@ -1,37 +1,92 @@
 from __future__ import annotations
 
-from typing import Any, Mapping, Optional, Protocol, cast
+from dataclasses import dataclass
+from typing import IO, Any, Mapping, Optional, Protocol, Sequence
 
-import cloudinary.uploader
+from apps.core import media_backends
 
 
 class HasFileField(Protocol):
     file: Any
 
 
+@dataclass(frozen=True)
+class UploadedAsset:
+    public_id: str
+    # Eager transformations Cloudinary has built (or queued, with eager_async) for the asset.
+    derivatives: tuple[str, ...] = ()
+
+
+def _eager_options(eager: Sequence[str], eager_async: bool) -> dict[str, Any]:
+    if not eager:
+        return {}
+    return {"eager": list(eager), "eager_async": eager_async}
+
+
+def _derivatives(result: Mapping[str, Any], eager: Sequence[str], eager_async: bool) -> tuple[str, ...]:
+    if eager_async:
+        return tuple(eager)
+    return tuple(str(item["transformation"]) for item in result.get("eager") or [] if item.get("transformation"))
+
+
+def upload_file_to_cloudinary(
+    source: str | IO[bytes],
+    *,
+    folder: str,
+    public_id: Optional[str] = None,
+    eager: Sequence[str] = (),
+    eager_async: bool = False,
+) -> UploadedAsset:
+    """
+    Upload a file object, local path or remote URL (Cloudinary fetches URLs itself).
+    ``eager`` transformations are generated during the upload instead of on first view.
+    """
+    options: dict[str, Any] = {
+        "folder": folder,
+        "resource_type": "image",
+        "overwrite": True,
+        "unique_filename": False,
+        **_eager_options(eager, eager_async),
+    }
+    if public_id:
+        options["public_id"] = public_id
+
+    result = media_backends.get_backend().upload(source, **options)
+    return UploadedAsset(str(result["public_id"]), _derivatives(result, eager, eager_async))
+
+
 def upload_wagtail_image_to_cloudinary(
     image: HasFileField,
     *,
     folder: str,
     public_id: Optional[str] = None,
-) -> str:
+    eager: Sequence[str] = (),
+    eager_async: bool = False,
+) -> UploadedAsset:
     f = image.file
     f.open("rb")
 
     try:
-        options: dict[str, Any] = {
-            "folder": folder,
-            "resource_type": "image",
-            "overwrite": True,
-            "unique_filename": False,
-        }
-        if public_id:
-            options["public_id"] = public_id
-
-        result = cast(Mapping[str, Any], cloudinary.uploader.upload(f, **options))
-        return str(result["public_id"])
+        return upload_file_to_cloudinary(
+            f,
+            folder=folder,
+            public_id=public_id,
+            eager=eager,
+            eager_async=eager_async,
+        )
     finally:
         try:
             f.close()
         except Exception:
             pass
+
+
+def build_derivatives(public_id: str, eager: Sequence[str], *, eager_async: bool = False) -> tuple[str, ...]:
+    """
+    Generate ``eager`` transformations for an asset that is already on Cloudinary.
+    """
+    if not eager:
+        return ()
+    options = {"type": "upload", "resource_type": "image", **_eager_options(eager, eager_async)}
+    result = media_backends.get_backend().explicit(public_id, **options)
+    return _derivatives(result, eager, eager_async)
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from django.http import HttpRequest, HttpResponse
+from typing import Any
+
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest
 from django.shortcuts import render
 
+from . import caching, pagination, search
 from .snippets import Partner, Speaker, Sponsor
 
+# Card fields (cards/*.html) plus the inline placeholder, so no card loads a deferred field.
+_PLACEHOLDER_FIELDS = ("placeholder_lqip", "placeholder_color")
+
 
 def home(request: HttpRequest) -> HttpResponse:
     return render(request, "base.html")
@@ -14,37 +21,82 @@ def hx_ping(request: HttpRequest) -> HttpResponse:
     return HttpResponse("<span class='text-emerald-400 font-medium'>HTMX + Tailwind are alive ⚡</span>")
 
 
+def _render_listing(
+    request: HttpRequest, queryset: QuerySet[Any], keyset: pagination.Keyset, name: str
+) -> HttpResponse:
+    """
+    First page in the ``<name>_grid.html`` wrapper, or the ``<name>_page.html`` fragment after ``?cursor=``.
+    """
+    cursor = request.GET.get("cursor", "")
+    try:
+        page = pagination.paginate(queryset, keyset, cursor)
+    except pagination.InvalidCursor:
+        return HttpResponseBadRequest("Invalid cursor.")
+
+    template = f"cms_integration/partials/{name}_{'page' if cursor else 'grid'}.html"
+    context = {name: page.items, "next_url": pagination.next_url(f"cms_integration:hx-{name}", page)}
+    return render(request, template, context)
+
+
+def _listing_params(request: HttpRequest) -> dict[str, str]:
+    # The only parameter _render_listing reads; anything else must not split the partial cache.
+    return {"cursor": request.GET.get("cursor", "")}
+
+
 def hx_sponsors(request: HttpRequest) -> HttpResponse:
-    sponsors = (
-        Sponsor.objects.select_related("logo_upload")
-        .only("name", "logo_public_id", "website", "tier", "logo_upload")
-        .order_by("tier", "name")
-    )
-    return render(request, "cms_integration/partials/sponsors_grid.html", {"sponsors": sponsors})
+    def render_grid() -> HttpResponse:
+        sponsors = (
+            Sponsor.objects.select_related("logo_upload")
+            .only("name", "logo_public_id", "website", "tier", "logo_upload", *_PLACEHOLDER_FIELDS)
+        )
+        return _render_listing(request, sponsors, pagination.SPONSORS, "sponsors")
+
+    return caching.cached_partial(request, "sponsors", (caching.SPONSORS,), render_grid, _listing_params(request))
 
 
 def hx_speakers(request: HttpRequest) -> HttpResponse:
-    speakers = (
-        Speaker.objects.select_related("photo_upload")
-        .only(
-            "name",
-            "slug",
-            "role",
-            "company",
-            "photo_public_id",
-            "linkedin_url",
-            "is_keynote",
-            "photo_upload",
+    def render_grid() -> HttpResponse:
+        speakers = (
+            Speaker.objects.select_related("photo_upload")
+            .only(
+                "name",
+                "slug",
+                "role",
+                "company",
+                "photo_public_id",
+                "linkedin_url",
+                "is_keynote",
+                "photo_upload",
+                *_PLACEHOLDER_FIELDS,
+            )
         )
-        .order_by("-is_keynote", "name")
-    )
-    return render(request, "cms_integration/partials/speakers_grid.html", {"speakers": speakers})
+        return _render_listing(request, speakers, pagination.SPEAKERS, "speakers")
+
+    return caching.cached_partial(request, "speakers", (caching.SPEAKERS,), render_grid, _listing_params(request))
 
 
 def hx_partners(request: HttpRequest) -> HttpResponse:
-    partners = (
-        Partner.objects.select_related("logo_upload")
-        .only("name", "slug", "type", "logo_public_id", "website", "logo_upload")
-        .order_by("type", "name")
+    def render_grid() -> HttpResponse:
+        partners = (
+            Partner.objects.select_related("logo_upload")
+            .only("name", "slug", "type", "logo_public_id", "website", "logo_upload", *_PLACEHOLDER_FIELDS)
+        )
+        return _render_listing(request, partners, pagination.PARTNERS, "partners")
+
+    return caching.cached_partial(request, "partners", (caching.PARTNERS,), render_grid, _listing_params(request))
+
+
+def hx_search(request: HttpRequest) -> HttpResponse:
+    """
+    Typeahead results for ``?q=`` (see search_box.html for the debounced input).
+    """
+    query = search.normalize(request.GET.get("q", ""))
+
+    def render_results() -> HttpResponse:
+        context = {"query": query, "min_length": search.MIN_QUERY_LENGTH, "results": search.search(query, request)}
+        return render(request, "cms_integration/partials/search_results.html", context)
+
+    # Result links point into the index pages, hence PAGES.
+    return caching.cached_partial(
+        request, "search", (*caching.SNIPPETS, caching.PAGES), render_results, {"q": query}
     )
-    return render(request, "cms_integration/partials/partners_grid.html", {"partners": partners})
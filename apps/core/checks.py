@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.contrib.staticfiles import finders
+from django.core.checks import CheckMessage, Error, Tags, register
+
+from . import static_assets
+
+# Pinned with SRI in templates/base.html: without the file the page ships integrity="" and no script.
+SRI_SCRIPTS = (static_assets.HTMX, static_assets.GSAP, static_assets.ALPINE_BUNDLE)
+
+
+@register(Tags.staticfiles, deploy=True)
+def check_front_end_assets(app_configs: Any = None, **kwargs: Any) -> list[CheckMessage]:
+    """
+    ``manage.py check --deploy`` fails when a script base.html pins with SRI hasn't been built.
+    """
+    return [
+        Error(
+            f"Static file {path} not found.",
+            hint="Run `bun run build` (build:vendor copies htmx and GSAP, build:js the Alpine bundle).",
+            id="core.E001",
+        )
+        for path in SRI_SCRIPTS
+        if not finders.find(path)
+    ]
@@ -0,0 +1,436 @@
+"""
+Critical CSS: the part of the compiled stylesheet needed to paint the header and
+the first section of the page (the hero), inlined in ``<head>`` so the first
+paint doesn't wait for ``static/css/tailwind.css``.
+
+Build (``manage.py build_critical_css``): one live page per top-level template is
+rendered the way the baker does (apps/cms_integration/baking.py). The classes,
+ids and tags used above the fold (everything in <body> before <main>, plus
+<main> up to the end of its first <section>) select the rules of the compiled
+stylesheet that can apply; ``@property``/``@keyframes`` are kept only when
+referenced. Results go to ``CRITICAL_CSS_DIR`` with a manifest recording the
+stylesheet hash and a fingerprint of its sources (input.css + templates).
+
+Runtime (``{% critical_stylesheet %}``): the entry for the current template is
+inlined and the full stylesheet is loaded without blocking render. Without a
+fresh entry (never built, or the stylesheet, input.css or a template changed
+since) the tag falls back to the regular blocking ``<link>``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Iterable, Iterator, Union
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+logger = logging.getLogger(__name__)
+
+STYLESHEET = "css/tailwind.css"
+MANIFEST = "manifest.json"
+
+# Attributes the tag writes so the build can tell which template rendered a page.
+KEY_ATTRIBUTE = "data-critical-key"
+
+
+def directory() -> Path:
+    return Path(getattr(settings, "CRITICAL_CSS_DIR", Path(settings.BASE_DIR) / "static" / "css" / "critical"))
+
+
+def file_name(key: str) -> str:
+    return key.removesuffix(".html").replace("/", "--") + ".css"
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def stylesheet_path(path: str = STYLESHEET) -> Path | None:
+    found = finders.find(path)
+    return Path(found) if isinstance(found, str) else None
+
+
+# ---------------------------------------------------------------------
+# SOURCES FINGERPRINT
+# ---------------------------------------------------------------------
+
+
+def _source_files() -> Iterator[Path]:
+    base_dir = Path(settings.BASE_DIR).resolve()
+    yield base_dir / "assets" / "css" / "input.css"
+    for engine in settings.TEMPLATES:
+        for template_dir in engine.get("DIRS", []):
+            yield from sorted(Path(template_dir).rglob("*.html"))
+    for app_templates in sorted(base_dir.glob("apps/*/templates")):
+        yield from sorted(app_templates.rglob("*.html"))
+
+
+def source_fingerprint() -> str:
+    """
+    Changes whenever input.css, the compiled stylesheet or any project template changes.
+    """
+    digest = hashlib.sha256()
+    base_dir = Path(settings.BASE_DIR).resolve()
+    stylesheet = stylesheet_path()
+    for path in [*_source_files(), *([stylesheet] if stylesheet else [])]:
+        if path.is_file():
+            # Relative names: the committed manifest must match on every checkout.
+            name = path.resolve()
+            digest.update(str(name.relative_to(base_dir) if name.is_relative_to(base_dir) else name).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------
+# ABOVE THE FOLD (HTML)
+# ---------------------------------------------------------------------
+
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr",
+}  # fmt: skip
+_QUOTED_RE = re.compile(r"'([^']*)'")
+
+
+@dataclass
+class Used:
+    classes: set[str] = field(default_factory=set)
+    ids: set[str] = field(default_factory=set)
+    tags: set[str] = field(default_factory=lambda: {"html", "body"})
+
+    def update(self, other: Used) -> None:
+        self.classes |= other.classes
+        self.ids |= other.ids
+        self.tags |= other.tags
+
+
+class _FoldParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.used = Used()
+        self.key = ""
+        self.stack: list[str] = []
+        self.in_body = False
+        self.main_depth: int | None = None
+        self.section_depth: int | None = None
+        self.done = False
+
+    def _collect(self, tag: str, attrs: dict[str, str | None]) -> None:
+        self.used.tags.add(tag)
+        self.used.classes.update((attrs.get("class") or "").split())
+        if attrs.get("id"):
+            self.used.ids.add(str(attrs["id"]))
+        # Alpine class bindings: :class="{ 'bg-x': open }" / x-bind:class="open ? 'a' : 'b'"
+        for name in (":class", "x-bind:class"):
+            for quoted in _QUOTED_RE.findall(attrs.get(name) or ""):
+                self.used.classes.update(quoted.split())
+
+    def handle_starttag(self, tag: str, attr_list: list[tuple[str, str | None]]) -> None:
+        attrs = dict(attr_list)
+        if attrs.get(KEY_ATTRIBUTE):
+            self.key = str(attrs[KEY_ATTRIBUTE])
+        if tag == "body":
+            self.in_body = True
+        if tag in ("html", "body") or (self.in_body and not self.done):
+            self._collect(tag, attrs)
+        if tag in _VOID_TAGS:
+            return
+
+        self.stack.append(tag)
+        if tag == "main" and self.main_depth is None:
+            self.main_depth = len(self.stack)
+        elif tag == "section" and self.main_depth is not None and self.section_depth is None:
+            self.section_depth = len(self.stack)
+
+    def handle_startendtag(self, tag: str, attr_list: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attr_list)
+        if tag not in _VOID_TAGS and self.stack and self.stack[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag not in self.stack:
+            return
+        while self.stack:
+            depth = len(self.stack)
+            closed = self.stack.pop()
+            if depth in (self.main_depth, self.section_depth):
+                self.done = True
+            if closed == tag:
+                break
+
+
+def above_the_fold(html: str, fragment: bool = False) -> tuple[str, Used]:
+    """
+    (template key written by ``{% critical_stylesheet %}``, selectors used above the fold).
+    A ``fragment`` (e.g. a rendered block) counts as above the fold in full.
+    """
+    parser = _FoldParser()
+    parser.in_body = fragment
+    parser.feed(html)
+    parser.close()
+    return parser.key, parser.used
+
+
+# ---------------------------------------------------------------------
+# STYLESHEET PRUNING
+# ---------------------------------------------------------------------
+
+
+@dataclass
+class Block:
+    prelude: str
+    children: list[Node]
+
+
+Node = Union[Block, str]
+
+
+class _Parser:
+    """
+    Minimal CSS block parser (strings, comments, nested blocks, balanced parentheses).
+    """
+
+    def __init__(self, css: str) -> None:
+        self.css = css
+        self.pos = 0
+
+    def parse(self) -> list[Node]:
+        items: list[Node] = []
+        buffer: list[str] = []
+        css, length = self.css, len(self.css)
+
+        def flush() -> None:
+            text = "".join(buffer).strip()
+            if text:
+                items.append(text)
+            buffer.clear()
+
+        while self.pos < length:
+            char = css[self.pos]
+            if css.startswith("/*", self.pos):
+                end = css.find("*/", self.pos + 2)
+                self.pos = length if end == -1 else end + 2
+            elif char in "\"'":
+                end = self.pos + 1
+                while end < length and css[end] != char:
+                    end += 2 if css[end] == "\\" else 1
+                buffer.append(css[self.pos : end + 1])
+                self.pos = end + 1
+            elif char == "\\":
+                buffer.append(css[self.pos : self.pos + 2])
+                self.pos += 2
+            elif char == "(":
+                depth, end = 0, self.pos
+                while end < length:
+                    if css[end] == "\\":
+                        end += 2
+                        continue
+                    depth += {"(": 1, ")": -1}.get(css[end], 0)
+                    end += 1
+                    if depth == 0:
+                        break
+                buffer.append(css[self.pos : end])
+                self.pos = end
+            elif char == "{":
+                prelude = "".join(buffer).strip()
+                buffer.clear()
+                self.pos += 1
+                items.append(Block(prelude, self.parse()))
+            elif char == "}":
+                self.pos += 1
+                flush()
+                return items
+            elif char == ";":
+                buffer.append(char)
+                self.pos += 1
+                flush()
+            else:
+                buffer.append(char)
+                self.pos += 1
+        flush()
+        return items
+
+
+def parse_css(css: str) -> list[Node]:
+    return _Parser(css).parse()
+
+
+def serialize(nodes: Iterable[Node]) -> str:
+    parts: list[str] = []
+    for node in nodes:
+        if isinstance(node, Block):
+            parts.append(f"{node.prelude}{{{serialize(node.children)}}}")
+        else:
+            parts.append(node)
+    return "".join(parts)
+
+
+_CLASS_RE = re.compile(r"\.((?:\\[0-9a-fA-F]{1,6}\s?|\\.|[\w-])+)")
+_ID_RE = re.compile(r"#((?:\\.|[\w-])+)")
+_ATTRIBUTE_RE = re.compile(r"(?<!\\)\[(?:[^\]\\]|\\.)*\]")
+_NOT_RE = re.compile(r":not\((?:[^()]|\([^()]*\))*\)")
+_PSEUDO_RE = re.compile(r"::?[\w-]+")
+_TAG_RE = re.compile(r"(?:^|[\s>+~(,])([a-zA-Z][\w-]*)")
+_PLACEHOLDER_RE = re.compile(r"\.\x00(\d+)\x00")
+_ESCAPE_RE = re.compile(r"\\([0-9a-fA-F]{1,6})\s?|\\(.)")
+
+
+def _unescape(name: str) -> str:
+    return _ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 16)) if m.group(1) else m.group(2), name)
+
+
+def _split_selectors(prelude: str) -> list[str]:
+    selectors, depth, start = [], 0, 0
+    for index, char in enumerate(prelude):
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0 and prelude[index - 1 : index] != "\\":
+            selectors.append(prelude[start:index])
+            start = index + 1
+    selectors.append(prelude[start:])
+    return [selector.strip() for selector in selectors if selector.strip()]
+
+
+def selector_matches(selector: str, used: Used) -> bool:
+    """
+    True when every class, id and type the selector requires is used (``:not()``,
+    attributes and pseudo-classes are ignored: they can't be known statically).
+    """
+    selector = _ATTRIBUTE_RE.sub("", selector)
+    classes: list[str] = []
+
+    def protect(match: re.Match[str]) -> str:
+        classes.append(_unescape(match.group(1)))
+        return f".\x00{len(classes) - 1}\x00"
+
+    selector = _NOT_RE.sub("", _CLASS_RE.sub(protect, selector))
+    required = [classes[int(index)] for index in _PLACEHOLDER_RE.findall(selector)]
+    if any(name not in used.classes for name in required):
+        return False
+
+    selector = _PLACEHOLDER_RE.sub("", selector)
+    if any(_unescape(name) not in used.ids for name in _ID_RE.findall(selector)):
+        return False
+
+    selector = _PSEUDO_RE.sub("", _ID_RE.sub("", selector))
+    return all(tag.lower() in used.tags for tag in _TAG_RE.findall(selector))
+
+
+def _prune(nodes: list[Node], used: Used, deferred: dict[str, list[Block]]) -> list[Node]:
+    kept: list[Node] = []
+    for node in nodes:
+        if isinstance(node, str):
+            kept.append(node)  # statements (@layer a,b;) or declarations of a kept rule
+            continue
+
+        prelude = node.prelude
+        if prelude.startswith(("@property", "@keyframes", "@-webkit-keyframes")):
+            deferred.setdefault(prelude.split()[0], []).append(node)
+        elif prelude.startswith(("@media", "@supports", "@layer", "@container")):
+            children = _prune(node.children, used, deferred)
+            if children:
+                kept.append(Block(prelude, children))
+        elif prelude.startswith("@"):
+            kept.append(node)  # @font-face and friends
+        else:
+            selectors = [s for s in _split_selectors(prelude) if selector_matches(s, used)]
+            if selectors:
+                # Nested rules (&:hover, @media inside) belong to a matched selector: keep as is.
+                kept.append(Block(",".join(selectors), node.children))
+    return kept
+
+
+def extract(css: str, used: Used) -> str:
+    deferred: dict[str, list[Block]] = {}
+    critical = serialize(_prune(parse_css(css), used, deferred))
+
+    extra: list[Block] = []
+    variables = set(re.findall(r"--[\w-]+", critical))
+    for block in deferred.get("@property", []):
+        if block.prelude.split()[1] in variables:
+            extra.append(block)
+    for keyword in ("@keyframes", "@-webkit-keyframes"):
+        for block in deferred.get(keyword, []):
+            if re.search(rf"animation[^;}}]*\b{re.escape(block.prelude.split()[1])}\b", critical):
+                extra.append(block)
+    return critical + serialize(extra)
+
+
+# ---------------------------------------------------------------------
+# MANIFEST (build output / runtime lookup)
+# ---------------------------------------------------------------------
+
+
+def write(entries: dict[str, str], fingerprint: str) -> None:
+    """
+    Replace the build output with ``entries`` ({template key: css}).
+    """
+    stylesheet = stylesheet_path()
+    target = directory()
+    target.mkdir(parents=True, exist_ok=True)
+    for stale in target.glob("*.css"):
+        stale.unlink()
+    pages = {}
+    for key, css in sorted(entries.items()):
+        pages[key] = file_name(key)
+        (target / pages[key]).write_text(css, encoding="utf-8")
+    manifest = {
+        "stylesheet": _sha256(stylesheet) if stylesheet else "",
+        "fingerprint": fingerprint,
+        "pages": pages,
+    }
+    (target / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def read_manifest() -> dict[str, object]:
+    try:
+        return dict(json.loads((directory() / MANIFEST).read_text(encoding="utf-8")))
+    except (OSError, ValueError):
+        return {}
+
+
+@lru_cache(maxsize=4)
+def _load(manifest_mtime: int, stylesheet_mtime: int, sources_mtime: int) -> dict[str, str]:
+    manifest = read_manifest()
+    stylesheet = stylesheet_path()
+    if (
+        not manifest
+        or stylesheet is None
+        or manifest.get("stylesheet") != _sha256(stylesheet)
+        or manifest.get("fingerprint") != source_fingerprint()
+    ):
+        if manifest:
+            logger.warning("Critical CSS is stale (run manage.py build_critical_css); using the blocking stylesheet.")
+        return {}
+    pages = manifest.get("pages") or {}
+    return {key: (directory() / str(name)).read_text(encoding="utf-8") for key, name in dict(pages).items()}
+
+
+def _mtime(path: Path | None) -> int:
+    try:
+        return path.stat().st_mtime_ns if path else 0
+    except OSError:
+        return 0
+
+
+def _sources_mtime() -> int:
+    # Templates only change with a deploy (and a restart) outside DEBUG: skip the stat calls there.
+    if not settings.DEBUG:
+        return 0
+    return max((_mtime(path) for path in _source_files()), default=0)
+
+
+def get(key: str) -> str | None:
+    """
+    Critical CSS for the template ``key``, or None when there's no fresh entry.
+    """
+    return _load(_mtime(directory() / MANIFEST), _mtime(stylesheet_path()), _sources_mtime()).get(key)
@@ -0,0 +1,185 @@
+"""
+First-party image endpoint for Wagtail images (``IMAGE_DELIVERY = "self"``).
+
+A hedge against Cloudinary cost and outages: ``/img/<preset>/<image id>/`` (format
+negotiated from ``Accept``) and ``/img/<preset>/<image id>/<width>.<format>`` (one
+rung of the preset's width ladder, used by ``cld_picture``) resize the image with
+the same Pillow pipeline as the local media backend (apps/core/local_transform.py).
+
+* Only named presets (``settings.CLOUDINARY_PRESETS``) and their ladder widths are
+  served, so the set of variants per image is small and bounded.
+* Variants are cached on disk under ``IMAGE_ENDPOINT_CACHE_ROOT``, keyed by the
+  source content hash, the transformation and the format; the key is the ETag.
+* Generated URLs carry ``?v=<image version>``; only a current version is served
+  ``immutable``, so an edited image or focal point never sticks in a browser cache.
+* Concurrent misses for the same variant are coalesced: one thread encodes and
+  the others wait on its future; a lock file per variant (next to its cache file)
+  does the same across worker processes. Encoding runs in a process pool, off the request threads.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from wagtail.images.models import Filter
+
+from . import local_transform, pictures, presets, renditions
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows dev machines: in-process coalescing only
+    fcntl = None  # type: ignore[assignment]
+
+SELF = "self"
+
+# Explicit formats for sized variants (the unsized URL negotiates from Accept).
+FORMATS = ("avif", "webp", "jpg", "png")
+
+_inflight: dict[str, Future[tuple[Path, str]]] = {}
+_inflight_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return getattr(settings, "IMAGE_DELIVERY", "cloudinary") == SELF
+
+
+def servable(image: Any) -> bool:
+    return bool(image is not None and image.pk and image.width and image.height) and not image.is_svg()
+
+
+def version(image: Any) -> str:
+    """
+    Changes with the image file and focal point (same inputs as the rendition cache key).
+    """
+    return renditions.image_key(image).rsplit(":", 1)[1]
+
+
+# ---------------------------------------------------------------------
+# URLS
+# ---------------------------------------------------------------------
+
+
+def _base() -> str:
+    return settings.IMAGE_ENDPOINT_URL.rstrip("/")
+
+
+def variant_url(image: Any, preset: str, width: int | None = None, fmt: str = "") -> str:
+    path = f"{_base()}/{preset}/{image.pk}/"
+    if width:
+        path += f"{width}.{fmt}"
+    return f"{path}?v={version(image)}"
+
+
+def widths(preset: presets.Preset) -> list[int]:
+    return pictures.width_ladder(*pictures.width_range(preset.layout()))
+
+
+def get_rendition(image: Any, preset_name: str) -> renditions.RenditionInfo:
+    """
+    Rendition-like object pointing at the endpoint (sizes from Wagtail's own transform maths).
+    """
+    spec = presets.get_preset(preset_name).filter_spec()
+    width, height = (int(round(v)) for v in Filter(spec=spec).get_transform(image).size)
+    return renditions.RenditionInfo(image, spec, variant_url(image, preset_name), width, height)
+
+
+def build_picture(image: Any, preset_name: str) -> pictures.Picture:
+    layout = presets.get_preset(preset_name).layout()
+    return pictures.assemble(layout, lambda fmt, width: variant_url(image, preset_name, width, fmt))
+
+
+# ---------------------------------------------------------------------
+# VARIANTS
+# ---------------------------------------------------------------------
+
+
+def transformation(image: Any, preset: presets.Preset, width: int | None = None) -> str:
+    """
+    Pillow steps for the preset (focal point aware); raises ValueError for unsupported specs.
+    """
+    result = renditions.transformation_for(image, preset.filter_spec(width))
+    if result is None:
+        raise ValueError(f"Preset {preset.name!r} can't be rendered by the image endpoint.")
+    return result[0]
+
+
+def cache_path(image: Any, steps: str, fmt: str) -> Path:
+    source = image.file_hash or renditions.image_key(image)
+    key = hashlib.sha256(f"{source}|{steps}|{fmt}".encode()).hexdigest()
+    return Path(settings.IMAGE_ENDPOINT_CACHE_ROOT) / key[:2] / key
+
+
+def cached(target: Path) -> tuple[Path, str] | None:
+    content_type_file = target.with_suffix(".type")
+    if target.is_file() and content_type_file.is_file():
+        return target, content_type_file.read_text(encoding="ascii")
+    return None
+
+
+@lru_cache(maxsize=1)
+def _executor() -> ProcessPoolExecutor:
+    # "spawn": workers only import local_transform (Pillow), never a forked copy of Django's threads.
+    return ProcessPoolExecutor(
+        max_workers=getattr(settings, "IMAGE_ENDPOINT_WORKERS", None) or None,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _produce(image: Any, steps: str, fmt: str, target: Path) -> tuple[Path, str]:
+    # Per variant: misses for other variants in the same bucket don't wait on this one.
+    lock_path = target.with_suffix(".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        # Another process may have written it while we waited.
+        hit = cached(target)
+        if hit is not None:
+            return hit
+
+        with image.open_file() as source:
+            data = source.read()
+        content, content_type = _executor().submit(local_transform.render, data, steps, fmt).result()
+
+        # Content type first: a file without its type is treated as a miss.
+        local_transform.atomic_write(target.with_suffix(".type"), content_type.encode("ascii"))
+        local_transform.atomic_write(target, content)
+        return target, content_type
+
+
+def get_variant(image: Any, steps: str, fmt: str) -> tuple[Path, str]:
+    """
+    (cached file, content type), encoding it first on a miss. Blocking: call from a worker thread.
+    """
+    target = cache_path(image, steps, fmt)
+    hit = cached(target)
+    if hit is not None:
+        return hit
+
+    key = target.name
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if future is None:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+
+    try:
+        result = _produce(image, steps, fmt, target)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
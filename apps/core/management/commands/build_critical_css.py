@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from wagtail.models import Page
+
+from apps.cms_integration import baking
+from apps.cms_integration.blocks import HeroBlock
+from apps.core import critical_css
+
+# Rendered into the HomePage entry so the hero's CSS is included whatever the live page's body holds.
+REPRESENTATIVE_HERO = {
+    "title": "Representative headline",
+    "lead": "Lead",
+    "description": "Main paragraph",
+    "paragraphs": ["Extra paragraph"],
+    "video_public_id": "critical-css/video",
+    "poster_public_id": "critical-css/poster",
+    "cta_buttons": [
+        {"label": "Primary", "url": "/", "style": "primary"},
+        {"label": "Secondary", "url": "/", "style": "secondary"},
+        {"label": "Ghost", "url": "/", "style": "ghost"},
+    ],
+}
+HOME_TEMPLATE = "cms_integration/home_page.html"
+
+
+def _representative_paths() -> list[tuple[Any, str]]:
+    """
+    Every live page, plus the first detail route of each routable index page.
+    """
+    targets = []
+    for page in Page.objects.live().filter(depth__gt=1).specific():
+        paths = list(baking.iter_page_paths(page))
+        targets += paths[:2]
+    return targets
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract the above-the-fold (header + hero) CSS per page template from static/css/tailwind.css "
+        "and write it to CRITICAL_CSS_DIR for {% critical_stylesheet %}."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Exit with an error when input.css, the stylesheet or a template changed since the last build.",
+        )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Rebuild whenever input.css, the stylesheet or a template changes.",
+        )
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds between --watch polls.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["check"]:
+            if critical_css.read_manifest().get("fingerprint") != critical_css.source_fingerprint():
+                raise CommandError("Critical CSS is out of date: run manage.py build_critical_css.")
+            self.stdout.write(self.style.SUCCESS("Critical CSS is up to date."))
+            return
+
+        self.build()
+        if not options["watch"]:
+            return
+
+        fingerprint = critical_css.source_fingerprint()
+        try:
+            while True:
+                time.sleep(options["interval"])
+                current = critical_css.source_fingerprint()
+                if current != fingerprint:
+                    fingerprint = current
+                    self.build()
+        except KeyboardInterrupt:
+            pass
+
+    def build(self) -> None:
+        stylesheet = critical_css.stylesheet_path()
+        if stylesheet is None:
+            raise CommandError(f"{critical_css.STYLESHEET} not found; run `bun run build:site` first.")
+        fingerprint = critical_css.source_fingerprint()
+        css = stylesheet.read_text(encoding="utf-8")
+
+        used_by_key: dict[str, critical_css.Used] = {}
+        for site, path in _representative_paths():
+            content = baking.render_path(site, path)
+            if content is None:
+                self.stderr.write(f"  skipped {site.hostname}{path} (did not render)")
+                continue
+            key, used = critical_css.above_the_fold(content.decode("utf-8"))
+            if not key:
+                continue
+            used_by_key.setdefault(key, critical_css.Used()).update(used)
+            self.stdout.write(f"  {site.hostname}{path} -> {key}")
+
+        if HOME_TEMPLATE in used_by_key:
+            hero = HeroBlock()
+            _key, used = critical_css.above_the_fold(hero.render(hero.to_python(REPRESENTATIVE_HERO)), fragment=True)
+            used_by_key[HOME_TEMPLATE].update(used)
+
+        entries = {key: critical_css.extract(css, used) for key, used in used_by_key.items()}
+        critical_css.write(entries, fingerprint)
+
+        for key, extracted in sorted(entries.items()):
+            self.stdout.write(f"{len(extracted.encode()):8,d} bytes  {key}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(entries)} templates; full stylesheet is {len(css.encode()):,d} bytes "
+                f"({critical_css.directory()})."
+            )
+        )
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Iterator
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.template.base import Lexer, TokenType
+from django.template.utils import get_app_template_dirs
+
+from apps.core import pictures, presets
+from apps.core.templatetags import cloudinary_helper
+
+PLACEHOLDER = "__public_id__"
+
+_TRANSFORMATION_RE = re.compile(rf"/upload/([^/\s]+)/{PLACEHOLDER}")
+_KWARG_RE = re.compile(r"^(\w+)=(.+)$")
+_LAYOUT_KWARGS = {"columns", "max_width", "aspect_ratio", "gravity", "crop", "fallback", "preset"}
+
+DYNAMIC = "(dynamic)"
+
+
+def _literal(bit: str) -> Any:
+    if len(bit) >= 2 and bit[0] == bit[-1] and bit[0] in "\"'":
+        return bit[1:-1]
+    try:
+        return int(bit)
+    except ValueError:
+        return DYNAMIC
+
+
+def _template_files() -> Iterator[Path]:
+    base_dir = Path(settings.BASE_DIR).resolve()
+    dirs = [Path(d) for engine in settings.TEMPLATES for d in engine.get("DIRS", [])]
+    dirs += [Path(d) for d in get_app_template_dirs("templates")]
+    seen: set[Path] = set()
+    for directory in dirs:
+        directory = directory.resolve()
+        # Project templates only (skip Wagtail/Django admin templates in site-packages).
+        if not directory.is_relative_to(base_dir) or "site-packages" in directory.parts:
+            continue
+        for path in sorted(directory.rglob("*.html")):
+            if path not in seen:
+                seen.add(path)
+                yield path
+
+
+def _transformations(output: str) -> list[str]:
+    return _TRANSFORMATION_RE.findall(output)
+
+
+def _evaluate(name: str, args: list[str], kwargs: dict[str, Any]) -> list[str]:
+    """
+    Transformations a tag produces for its literal arguments (dynamic ones use the defaults).
+    """
+    literal = {key: value for key, value in kwargs.items() if value != DYNAMIC}
+    if name == "cld_img":
+        return _transformations(cloudinary_helper.cld_img(PLACEHOLDER, **literal))
+    if name == "cld_srcset":
+        return _transformations(cloudinary_helper.cld_srcset(PLACEHOLDER, **literal))
+    if name == "cld_video":
+        return [f"video:{t}" for t in _transformations(cloudinary_helper.cld_video(PLACEHOLDER, **literal))]
+    if name == "cld_video_sources":
+        return [f"video:{t}" for t in _transformations(cloudinary_helper.cld_video_sources(PLACEHOLDER))]
+    if name == "cld_video_stream":
+        return ["video:sp_auto (HLS)"]
+    if name == "cld_picture":
+        layout_kwargs = {key: value for key, value in literal.items() if key in _LAYOUT_KWARGS}
+        preset = layout_kwargs.pop("preset", "")
+        if preset:
+            layout = presets.get_preset(preset).layout()
+        else:
+            if "fallback" in layout_kwargs:
+                layout_kwargs["fallback_format"] = layout_kwargs.pop("fallback")
+            layout = pictures.Layout.parse(**layout_kwargs)
+        picture = pictures.build_picture(PLACEHOLDER, layout)
+        return _transformations(" ".join([picture.src, picture.srcset, *(srcset for _mime, srcset in picture.sources)]))
+    if name == "cld_image":
+        # Wagtail filter specs: the Cloudinary transformation also depends on the image size.
+        specs = []
+        for bit in args[1:]:
+            if bit == "as":
+                break
+            if "=" in bit:
+                continue  # <img> attribute
+            if bit.startswith(cloudinary_helper.PRESET_SPEC_PREFIX):
+                bit = presets.get_preset(bit.removeprefix(cloudinary_helper.PRESET_SPEC_PREFIX)).filter_spec()
+            specs.append(bit)
+        return [f"wagtail:{'|'.join(specs)}"]
+    return []
+
+
+class Command(BaseCommand):
+    help = "List the distinct Cloudinary transformations the project templates produce (keep this list short)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--locations",
+            action="store_true",
+            help="Show every template line that produces each transformation.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        tags = {
+            "cld_img",
+            "cld_srcset",
+            "cld_video",
+            "cld_video_sources",
+            "cld_video_stream",
+            "cld_picture",
+            "cld_image",
+        }
+        found: dict[str, list[str]] = defaultdict(list)
+        dynamic: list[str] = []
+        tag_count = 0
+        base_dir = Path(settings.BASE_DIR).resolve()
+
+        for path in _template_files():
+            source = path.read_text(encoding="utf-8")
+            for token in Lexer(source).tokenize():
+                if token.token_type != TokenType.BLOCK:
+                    continue
+                bits = token.split_contents()
+                if not bits or bits[0] not in tags:
+                    continue
+                tag_count += 1
+                location = f"{path.relative_to(base_dir)}:{token.lineno}"
+
+                positional: list[str] = []
+                kwargs: dict[str, Any] = {}
+                for bit in bits[1:]:
+                    match = _KWARG_RE.match(bit)
+                    if match and bits[0] != "cld_image":
+                        kwargs[match.group(1)] = _literal(match.group(2))
+                    else:
+                        positional.append(bit)
+
+                dynamic_keys = sorted(
+                    key
+                    for key, value in kwargs.items()
+                    if value == DYNAMIC and (bits[0] != "cld_picture" or key in _LAYOUT_KWARGS)
+                )
+                if dynamic_keys:
+                    dynamic.append(f"{location} ({', '.join(dynamic_keys)})")
+                for transformation in _evaluate(bits[0], positional, kwargs):
+                    found[transformation].append(location)
+
+        for transformation in sorted(found):
+            locations = found[transformation]
+            self.stdout.write(f"{len(locations):4d}  {transformation}")
+            if options["locations"]:
+                for location in sorted(set(locations)):
+                    self.stdout.write(f"        {location}")
+
+        if dynamic:
+            self.stdout.write(self.style.WARNING("\nTags with non-literal transformation arguments (not expanded):"))
+            for entry in dynamic:
+                self.stdout.write(f"  {entry}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n{len(found)} distinct transformations from {tag_count} tags; "
+                f"{len(presets.get_presets())} presets defined in settings.CLOUDINARY_PRESETS."
+            )
+        )
@@ -0,0 +1,171 @@
+"""
+Pluggable media backend: where uploads go and where delivery URLs point.
+
+``MEDIA_BACKEND = "cloudinary"`` (default) talks to Cloudinary. ``"local"`` is an
+offline stand-in for development, CI and benchmarks:
+
+* uploads are stored content-addressed under ``LOCAL_MEDIA_BACKEND_ROOT``
+  (``objects/<sha256>``), with ``public/<public_id>`` pointing at the object;
+* delivery URLs keep Cloudinary's shape (``<base>/image/upload/<transformation>/<public id>``)
+  but point at ``LOCAL_MEDIA_BACKEND_URL``, served by ``apps.core.views.local_media``
+  with Pillow (apps/core/local_transform.py), caching each transformed file on disk.
+
+Both backends return Cloudinary-shaped upload results (``public_id``, ``eager``),
+so callers don't branch on the backend.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+import urllib.request
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any, Mapping, Protocol
+
+import cloudinary.uploader
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+CLOUDINARY = "cloudinary"
+LOCAL = "local"
+
+
+class MediaBackend(Protocol):
+    def upload(self, source: str | IO[bytes], **options: Any) -> Mapping[str, Any]: ...
+
+    def explicit(self, public_id: str, **options: Any) -> Mapping[str, Any]: ...
+
+    def delivery_base(self, resource_type: str = "image") -> str: ...
+
+
+class CloudinaryBackend:
+    def upload(self, source: str | IO[bytes], **options: Any) -> Mapping[str, Any]:
+        return dict(cloudinary.uploader.upload(source, **options))
+
+    def explicit(self, public_id: str, **options: Any) -> Mapping[str, Any]:
+        return dict(cloudinary.uploader.explicit(public_id, **options))
+
+    def delivery_base(self, resource_type: str = "image") -> str:
+        from .renditions import cloud_name
+
+        return f"https://res.cloudinary.com/{cloud_name()}/{resource_type}/upload"
+
+
+class LocalBackend:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    # --- storage layout -------------------------------------------------
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def ref_path(self, public_id: str) -> Path:
+        path = (self.root / "public" / public_id).resolve()
+        if not path.is_relative_to((self.root / "public").resolve()):
+            raise ValueError(f"Invalid public id: {public_id!r}")
+        return path
+
+    def cache_dir(self) -> Path:
+        return self.root / "cache"
+
+    def resolve(self, public_id: str) -> tuple[str, Path] | None:
+        """
+        (content hash, object path) for ``public_id``, or None when it was never uploaded.
+        """
+        try:
+            digest = self.ref_path(public_id).read_text(encoding="ascii").strip()
+        except (OSError, ValueError):
+            return None
+        path = self.object_path(digest)
+        return (digest, path) if path.is_file() else None
+
+    # --- backend API ------------------------------------------------------
+
+    def _store(self, source: str | IO[bytes]) -> str:
+        self.root.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(dir=self.root, delete=False) as tmp:
+            if isinstance(source, str):
+                with urllib.request.urlopen(source) if "://" in source else open(source, "rb") as stream:
+                    _copy(stream, tmp, digest)
+            else:
+                _copy(source, tmp, digest)
+        target = self.object_path(digest.hexdigest())
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            os.unlink(tmp.name)
+        else:
+            os.replace(tmp.name, target)
+        return digest.hexdigest()
+
+    def _link(self, public_id: str, digest: str) -> None:
+        ref = self.ref_path(public_id)
+        ref.parent.mkdir(parents=True, exist_ok=True)
+        tmp = ref.with_name(f".{ref.name}.tmp")
+        tmp.write_text(digest, encoding="ascii")
+        os.replace(tmp, ref)
+
+    def _eager(self, public_id: str, eager: Any) -> list[dict[str, str]]:
+        from .local_transform import transform_to_cache
+
+        results = []
+        for transformation in eager or []:
+            transform_to_cache(self, str(transformation), public_id)
+            results.append({"transformation": str(transformation), "status": "processed"})
+        return results
+
+    def upload(self, source: str | IO[bytes], **options: Any) -> Mapping[str, Any]:
+        digest = self._store(source)
+        public_id = options.get("public_id") or digest[:20]
+        if options.get("folder"):
+            public_id = f"{options['folder'].strip('/')}/{public_id}"
+        self._link(public_id, digest)
+        return {"public_id": public_id, "etag": digest, "eager": self._eager(public_id, options.get("eager"))}
+
+    def explicit(self, public_id: str, **options: Any) -> Mapping[str, Any]:
+        if self.resolve(public_id) is None:
+            raise FileNotFoundError(f"Resource not found - {public_id}")
+        return {"public_id": public_id, "eager": self._eager(public_id, options.get("eager"))}
+
+    def delivery_base(self, resource_type: str = "image") -> str:
+        return f"{settings.LOCAL_MEDIA_BACKEND_URL.rstrip('/')}/{resource_type}/upload"
+
+
+def _copy(stream: IO[bytes], target: IO[bytes], digest: Any) -> None:
+    while chunk := stream.read(1024 * 1024):
+        digest.update(chunk)
+        target.write(chunk)
+
+
+@lru_cache(maxsize=1)
+def get_backend() -> MediaBackend:
+    name = getattr(settings, "MEDIA_BACKEND", CLOUDINARY)
+    if name == LOCAL:
+        return LocalBackend(Path(settings.LOCAL_MEDIA_BACKEND_ROOT))
+    return CloudinaryBackend()
+
+
+@receiver(setting_changed)
+def _reset_backend(setting: str, **kwargs: Any) -> None:
+    if setting in ("MEDIA_BACKEND", "LOCAL_MEDIA_BACKEND_ROOT"):
+        get_backend.cache_clear()
+
+
+def is_local() -> bool:
+    return isinstance(get_backend(), LocalBackend)
+
+
+def delivery_url(transformation: str, public_id: str, resource_type: str = "image") -> str:
+    base = get_backend().delivery_base(resource_type)
+    return f"{base}/{transformation}/{public_id}" if transformation else f"{base}/{public_id}"
+
+
+def clear_local_cache() -> None:
+    backend = get_backend()
+    if isinstance(backend, LocalBackend):
+        shutil.rmtree(backend.cache_dir(), ignore_errors=True)
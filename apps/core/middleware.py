@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from django.http import HttpRequest, HttpResponse
+
+from . import static_assets
+
+
+class EarlyHintsMiddleware:
+    """
+    Add ``Link: rel=preload`` for the hashed stylesheet, fonts and core scripts to HTML pages.
+
+    This sets a header on the final 200 response; it does not send a ``103 Early
+    Hints`` itself (WSGI has no way to emit an informational response). Browsers
+    start those fetches as soon as the headers arrive. A CDN that supports it (e.g.
+    Cloudflare) caches the header and sends it as a 103 ahead of later responses for
+    the same URL.
+
+    The header is built once, from the staticfiles manifest, when the middleware is
+    loaded. Place it right after WhiteNoise so baked pages get it too; HTMX partial
+    swaps, 304s and error pages don't.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        self.link = static_assets.link_header()
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+        if (
+            self.link
+            and response.status_code == 200
+            and not request.headers.get("HX-Request")
+            and response.get("Content-Type", "").startswith("text/html")
+            and "Link" not in response
+        ):
+            response["Link"] = self.link
+        return response
@@ -0,0 +1,246 @@
+"""
+Responsive ``<picture>`` markup for Cloudinary public ids.
+
+A template describes *how the image is laid out* (columns per breakpoint, max
+display width, aspect ratio) and ``build_picture`` derives the rest:
+
+* ``sizes``: the slot width per breakpoint, switching to a fixed px value once
+  the slot stops growing (max width or container reached);
+* a width ladder covering the smallest phone slot up to the largest slot at
+  2x DPR, taken from the shared width steps (``width_steps()``, overridable with
+  ``settings.CLOUDINARY_WIDTH_STEPS``) so every layout reuses the same derived assets;
+* AVIF and WebP ``<source>`` entries plus a JPEG/PNG fallback ``<img>``.
+
+Results are memoized per ``(delivery base URL, public id, layout)``: the markup only
+depends on those, so a grid of 200 cards builds each URL set once per process.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+from django.conf import settings
+from django.forms.utils import flatatt
+from django.utils.html import escape
+
+from . import media_backends
+
+# Tailwind breakpoints matched by the positions of ``Layout.columns`` (base, md, lg, xl).
+BREAKPOINTS: tuple[int, ...] = (0, 768, 1024, 1280)
+
+CONTAINER_WIDTH = 1536
+MIN_VIEWPORT = 320
+MAX_DPR = 2
+MAX_IMAGE_WIDTH = 2560
+DEFAULT_WIDTH_STEPS: tuple[int, ...] = (160, 240, 320, 400, 480, 640, 800, 960, 1200, 1440, 1600, 1920, 2560)
+
+_MEMO_SIZE = 2048
+
+MODERN_FORMATS: tuple[tuple[str, str], ...] = (("avif", "image/avif"), ("webp", "image/webp"))
+
+
+@dataclass(frozen=True)
+class Layout:
+    """
+    Layout hint. ``columns`` are per breakpoint (base, md, lg, xl); the last value repeats.
+    """
+
+    columns: tuple[int, ...] = (1,)
+    max_width: int | None = None
+    aspect_ratio: str = ""
+    gravity: str = "auto"
+    crop: str = "fill"
+    fallback_format: str = "jpg"
+
+    @classmethod
+    def parse(
+        cls,
+        columns: str | int | tuple[int, ...] = 1,
+        max_width: int | str | None = None,
+        aspect_ratio: str = "",
+        gravity: str = "auto",
+        crop: str = "fill",
+        fallback_format: str = "jpg",
+    ) -> Layout:
+        if isinstance(columns, (str, int)):
+            columns = tuple(int(part) for part in str(columns).replace(",", " ").split())
+        return cls(
+            columns=tuple(max(1, int(c)) for c in columns) or (1,),
+            max_width=int(max_width) if max_width else None,
+            aspect_ratio=aspect_ratio,
+            gravity=gravity,
+            crop=crop,
+            fallback_format=fallback_format,
+        )
+
+    def columns_at(self, index: int) -> int:
+        return self.columns[min(index, len(self.columns) - 1)]
+
+    def ratio(self) -> float | None:
+        if not self.aspect_ratio:
+            return None
+        width, _sep, height = self.aspect_ratio.partition(":")
+        try:
+            return float(width) / float(height)
+        except (ValueError, ZeroDivisionError):
+            return None
+
+
+@dataclass(frozen=True)
+class Picture:
+    sizes: str
+    sources: tuple[tuple[str, str], ...]  # (mime type, srcset)
+    srcset: str
+    src: str
+    width: int
+    height: int | None
+
+
+# ---------------------------------------------------------------------
+# LAYOUT MATHS
+# ---------------------------------------------------------------------
+
+
+def _tiers(layout: Layout) -> list[tuple[int, int | None, int]]:
+    """
+    (min viewport, max viewport, columns) per breakpoint, collapsing repeated column counts.
+    """
+    tiers: list[tuple[int, int | None, int]] = []
+    for index, lower in enumerate(BREAKPOINTS):
+        columns = layout.columns_at(index)
+        if tiers and tiers[-1][2] == columns:
+            continue
+        tiers.append((lower, None, columns))
+    return [
+        (lower, tiers[i + 1][0] if i + 1 < len(tiers) else None, columns)
+        for i, (lower, _upper, columns) in enumerate(tiers)
+    ]
+
+
+def _slot_cap(layout: Layout, columns: int) -> int:
+    cap = CONTAINER_WIDTH // columns
+    return min(cap, layout.max_width) if layout.max_width else cap
+
+
+def sizes_for(layout: Layout) -> str:
+    """
+    ``sizes`` attribute: ``vw`` while the slot scales with the viewport, ``px`` once it's capped.
+    """
+    entries: list[str] = []
+    for lower, upper, columns in reversed(_tiers(layout)):
+        cap = _slot_cap(layout, columns)
+        capped_from = cap * columns
+        if upper is None or capped_from < upper:
+            media = max(lower, capped_from)
+            entries.append(f"(min-width: {media}px) {cap}px" if media else f"{cap}px")
+        if capped_from > lower:
+            vw = f"{100 / columns:.4g}vw"
+            entries.append(f"(min-width: {lower}px) {vw}" if lower else vw)
+    return ", ".join(entries)
+
+
+def width_range(layout: Layout) -> tuple[int, int]:
+    """
+    Smallest slot on a phone at 1x, largest slot at ``MAX_DPR``.
+    """
+    tiers = _tiers(layout)
+    smallest = min(
+        min(_slot_cap(layout, columns), max(lower, MIN_VIEWPORT) // columns) for lower, _upper, columns in tiers
+    )
+    largest = max(_slot_cap(layout, columns) for _lower, _upper, columns in tiers)
+    return max(smallest, 1), min(largest * MAX_DPR, MAX_IMAGE_WIDTH)
+
+
+def width_steps() -> tuple[int, ...]:
+    return tuple(getattr(settings, "CLOUDINARY_WIDTH_STEPS", DEFAULT_WIDTH_STEPS))
+
+
+def snap_width(width: int) -> int:
+    """
+    Smallest width step >= ``width`` (the largest step when ``width`` exceeds them all).
+    """
+    steps = width_steps()
+    return next((step for step in steps if step >= width), steps[-1])
+
+
+def width_ladder(smallest: int, largest: int) -> list[int]:
+    """
+    The width steps spanning ``smallest``..``largest`` (both snapped up to a step).
+    """
+    low, high = snap_width(smallest), snap_width(largest)
+    return [step for step in width_steps() if low <= step <= high]
+
+
+# ---------------------------------------------------------------------
+# URLS
+# ---------------------------------------------------------------------
+
+
+def _transformation(layout: Layout, fmt: str, width: int) -> str:
+    parts = [f"f_{fmt}", "q_auto"]
+    if layout.ratio() is not None:
+        parts += [f"c_{layout.crop}", f"g_{layout.gravity}", f"ar_{layout.aspect_ratio}"]
+    else:
+        parts.append("c_limit")
+    parts.append(f"w_{width}")
+    return ",".join(parts)
+
+
+def transformations(layout: Layout) -> list[str]:
+    """
+    Every transformation a <picture> for ``layout`` can request (all formats x widths).
+    """
+    widths = width_ladder(*width_range(layout))
+    formats = [fmt for fmt, _mime in MODERN_FORMATS] + [layout.fallback_format]
+    return [_transformation(layout, fmt, width) for fmt in formats for width in widths]
+
+
+def assemble(layout: Layout, url: Callable[[str, int], str]) -> Picture:
+    """
+    Picture for ``layout`` with ``url(format, width)`` building each candidate URL.
+    """
+    widths = width_ladder(*width_range(layout))
+
+    def srcset(fmt: str) -> str:
+        return ", ".join(f"{url(fmt, w)} {w}w" for w in widths)
+
+    # Intrinsic size for width/height attributes (reserves space, avoids layout shift).
+    display_width = width_range(layout)[1] // MAX_DPR
+    ratio = layout.ratio()
+    return Picture(
+        sizes=sizes_for(layout),
+        sources=tuple((mime, srcset(fmt)) for fmt, mime in MODERN_FORMATS),
+        srcset=srcset(layout.fallback_format),
+        src=url(layout.fallback_format, widths[len(widths) // 2]),
+        width=display_width,
+        height=round(display_width / ratio) if ratio else None,
+    )
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _build(base: str, public_id: str, layout: Layout) -> Picture:
+    return assemble(layout, lambda fmt, width: f"{base}/{_transformation(layout, fmt, width)}/{public_id}")
+
+
+def build_picture(public_id: str, layout: Layout) -> Picture:
+    return _build(media_backends.get_backend().delivery_base(), public_id, layout)
+
+
+def render_picture(picture: Picture, img_attrs: dict[str, object]) -> str:
+    attrs: dict[str, object] = {
+        "src": picture.src,
+        "srcset": picture.srcset,
+        "sizes": picture.sizes,
+        "width": picture.width,
+    }
+    if picture.height:
+        attrs["height"] = picture.height
+    attrs.update({key: value for key, value in img_attrs.items() if value is not None and value is not False})
+
+    sources = "".join(
+        f'<source type="{mime}" srcset="{escape(srcset)}" sizes="{escape(picture.sizes)}">'
+        for mime, srcset in picture.sources
+    )
+    return f"<picture>{sources}<img{flatatt(attrs)}></picture>"
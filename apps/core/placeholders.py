@@ -0,0 +1,103 @@
+"""
+Inline image placeholders: a tiny blurred preview (LQIP) and a dominant colour.
+
+Both are computed once when an image is uploaded (see
+apps/cms_integration/uploads.py) and stored on the snippet, so cards can paint
+something close to the final image as their background before the lazily loaded
+``<img>`` arrives, without an extra request.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import urllib.request
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from PIL import Image, ImageFilter, ImageOps
+
+from . import media_backends
+
+# Budget for the whole data URI (it is repeated in every card of a grid).
+MAX_LQIP_LENGTH = 300
+LQIP_SIZES = (16, 12, 8)
+LQIP_QUALITIES = (40, 25)
+
+# Stored when no colour could be computed, so the source isn't fetched again on every run.
+UNKNOWN_COLOR = "transparent"
+
+# Small rendition fetched for public ids that have no local file.
+THUMBNAIL_TRANSFORMATION = "c_limit,w_64,h_64,f_png"
+FETCH_TIMEOUT = 10
+
+
+@dataclass(frozen=True)
+class Placeholder:
+    lqip: str
+    color: str
+
+
+def _lqip(image: Image.Image) -> str:
+    for size in LQIP_SIZES:
+        preview = image.copy()
+        preview.thumbnail((size, size), Image.Resampling.LANCZOS)
+        preview = preview.filter(ImageFilter.GaussianBlur(0.6))
+        for quality in LQIP_QUALITIES:
+            buffer = io.BytesIO()
+            preview.save(buffer, "WEBP", quality=quality, method=6)
+            uri = f"data:image/webp;base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+            if len(uri) <= MAX_LQIP_LENGTH:
+                return uri
+    return ""
+
+
+def _dominant_color(image: Image.Image) -> str:
+    """
+    Most common colour among the opaque pixels (transparent logo backgrounds don't count).
+    """
+    sample = image.copy()
+    sample.thumbnail((64, 64))
+    pixels = [pixel[:3] for pixel in sample.getdata() if pixel[3] >= 128]
+    if not pixels:
+        return UNKNOWN_COLOR
+
+    opaque = Image.new("RGB", (len(pixels), 1))
+    opaque.putdata(pixels)
+    quantized = opaque.quantize(colors=6, method=Image.Quantize.MEDIANCUT)
+    index, _count = Counter(quantized.getdata()).most_common(1)[0]
+    palette = quantized.getpalette() or []
+    red, green, blue = palette[index * 3 : index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def from_bytes(data: bytes) -> Placeholder:
+    image = Image.open(io.BytesIO(data))
+    image.draft("RGB", (128, 128))  # JPEG: decode at reduced scale
+    image = ImageOps.exif_transpose(image).convert("RGBA")
+    return Placeholder(lqip=_lqip(image), color=_dominant_color(image))
+
+
+def for_image(image: Any) -> Placeholder:
+    """
+    Placeholder for a Wagtail image (reads the original from its storage).
+    """
+    with image.open_file() as source:
+        return from_bytes(source.read())
+
+
+def for_public_id(public_id: str) -> Placeholder:
+    """
+    Placeholder for a media backend public id, from a small thumbnail rendition.
+    """
+    backend = media_backends.get_backend()
+    if isinstance(backend, media_backends.LocalBackend):
+        resolved = backend.resolve(public_id)
+        if resolved is None:
+            raise FileNotFoundError(public_id)
+        return from_bytes(resolved[1].read_bytes())
+
+    url = media_backends.delivery_url(THUMBNAIL_TRANSFORMATION, public_id)
+    with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as response:
+        return from_bytes(response.read())
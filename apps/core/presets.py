@@ -0,0 +1,148 @@
+"""
+Named Cloudinary transformation presets (``settings.CLOUDINARY_PRESETS``).
+
+Every distinct transformation string is a separate derived asset on Cloudinary
+and a separate CDN cache entry, so ``w_400`` next to ``w_420`` or ``g_face``
+next to ``g_auto`` for the same card costs an extra transformation and a colder
+cache. Templates name a preset instead; ad-hoc parameters passed to
+``cld_img`` are snapped to the nearest preset of the same shape, or failing
+that to the shared width steps (``pictures.width_steps()``).
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from . import pictures
+
+# A preset is used for ad-hoc parameters within these tolerances.
+RATIO_TOLERANCE = 0.05
+WIDTH_TOLERANCE = 1.25
+
+GRAVITIES = ("auto", "face")
+
+
+@dataclass(frozen=True)
+class Preset:
+    name: str
+    width: int
+    height: int | None = None
+    crop: str = "fill"
+    gravity: str = "auto"
+    fallback: str = "jpg"
+    columns: str = "1"
+
+    @property
+    def ratio(self) -> float | None:
+        return self.width / self.height if self.height else None
+
+    @property
+    def aspect_ratio(self) -> str:
+        if not self.height:
+            return ""
+        divisor = math.gcd(self.width, self.height)
+        return f"{self.width // divisor}:{self.height // divisor}"
+
+    def transformation(self) -> str:
+        """
+        Single-URL transformation (``cld_img``).
+        """
+        parts = ["f_auto", "q_auto", "dpr_auto", f"w_{self.width}"]
+        if self.height:
+            parts += [f"h_{self.height}", f"c_{self.crop}"]
+            if self.crop == "fill":
+                parts.append(f"g_{self.gravity}")
+        elif self.crop != "fill":
+            parts.append(f"c_{self.crop}")
+        return ",".join(parts)
+
+    def layout(self) -> pictures.Layout:
+        """
+        ``<picture>`` layout (``cld_picture``): the preset width is the max display width.
+        """
+        return pictures.Layout.parse(
+            self.columns,
+            self.width,
+            self.aspect_ratio if self.crop == "fill" else "",
+            self.gravity,
+            self.crop,
+            self.fallback,
+        )
+
+    def derivatives(self) -> list[str]:
+        """
+        Transformations to build eagerly when an asset for this preset is uploaded.
+        """
+        return pictures.transformations(self.layout())
+
+    def filter_spec(self, width: int | None = None) -> str:
+        """
+        Equivalent Wagtail filter spec, for ``{% cld_image img preset-<name> %}``;
+        ``width`` scales it to another rung of the width ladder.
+        """
+        width = width or self.width
+        if not self.height:
+            return f"width-{width}"
+        operation = "fill" if self.crop == "fill" else "max"
+        return f"{operation}-{width}x{max(1, round(width * self.height / self.width))}"
+
+
+@lru_cache(maxsize=1)
+def get_presets() -> dict[str, Preset]:
+    configured: dict[str, dict[str, Any]] = getattr(settings, "CLOUDINARY_PRESETS", {})
+    return {name: Preset(name=name, **options) for name, options in configured.items()}
+
+
+@receiver(setting_changed)
+def _reset_presets(setting: str, **kwargs: Any) -> None:
+    if setting in ("CLOUDINARY_PRESETS", "CLOUDINARY_WIDTH_STEPS"):
+        get_presets.cache_clear()
+        normalize.cache_clear()
+
+
+def get_preset(name: str) -> Preset:
+    try:
+        return get_presets()[name]
+    except KeyError:
+        raise KeyError(f"Unknown Cloudinary preset {name!r}; add it to settings.CLOUDINARY_PRESETS.") from None
+
+
+def derivatives_for(names: Iterable[str]) -> list[str]:
+    """
+    De-duplicated eager transformation list for the presets ``names``.
+    """
+    return list(dict.fromkeys(t for name in names for t in get_preset(name).derivatives()))
+
+
+@lru_cache(maxsize=512)
+def normalize(width: int, height: int | None = None, gravity: str = "auto") -> Preset:
+    """
+    Nearest preset of the same shape that is at least as wide (and not much wider);
+    otherwise an unnamed preset with the width snapped up to a width step.
+    """
+    ratio = width / height if height else None
+    candidates = [
+        preset
+        for preset in get_presets().values()
+        if (preset.ratio is None) == (ratio is None)
+        and (preset.crop == "fill" or ratio is None)
+        and (ratio is None or abs(preset.ratio - ratio) / ratio <= RATIO_TOLERANCE)  # type: ignore[operator]
+        and width <= preset.width <= width * WIDTH_TOLERANCE
+    ]
+    if candidates:
+        return min(candidates, key=lambda preset: preset.width)
+
+    snapped = pictures.snap_width(width)
+    return Preset(
+        name="",
+        width=snapped,
+        height=round(snapped / ratio) if ratio else None,
+        gravity=gravity if gravity in GRAVITIES else "auto",
+    )
@@ -0,0 +1,276 @@
+"""
+Cloudinary-native renditions for Wagtail images.
+
+For images stored with ``MediaCloudinaryStorage`` a Wagtail filter spec
+(``fill-400x400``, ``max-520x220``, ``width-500|format-webp`` ...) is turned into
+a Cloudinary transformation URL, so no original is downloaded, no Pillow work is
+done and no rendition row is written. The crop box and output size come from
+Wagtail's own ``Filter.get_transform`` (focal points included), which only needs
+the stored width/height.
+
+Anything else (local storage, SVGs, unknown operations) falls back to the
+regular ``image.get_rendition``.
+
+Either way the resulting (url, width, height) is memoized per image, in process
+and in the shared cache, so a template tag is a dict lookup once ``warm`` has
+fetched the metadata for every image on the page in one ``get_many``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from cloudinary_storage import app_settings
+from cloudinary_storage.storage import MediaCloudinaryStorage
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.forms.utils import flatatt
+from django.utils.safestring import SafeString, mark_safe
+from wagtail.images.image_operations import (
+    AvifQualityOperation,
+    BackgroundColorOperation,
+    DoNothingOperation,
+    FormatOperation,
+    JPEGQualityOperation,
+    TransformOperation,
+    WebPQualityOperation,
+)
+from wagtail.images.models import Filter
+from wagtail.images.shortcuts import get_rendition_or_not_found
+
+from . import media_backends
+
+_QUALITY_OPERATIONS: dict[type, str] = {
+    JPEGQualityOperation: "jpeg",
+    WebPQualityOperation: "webp",
+    AvifQualityOperation: "avif",
+}
+
+
+def cloud_name() -> str:
+    """
+    Single source of truth for Cloudinary cloud name.
+    """
+    storage = getattr(settings, "CLOUDINARY_STORAGE", {})
+    return storage.get("CLOUD_NAME") or "demo"
+
+
+@dataclass(frozen=True)
+class RenditionInfo:
+    """
+    Quacks like a Wagtail rendition (url, width, height, alt, attrs, img_tag).
+    """
+
+    image: Any
+    filter_spec: str
+    url: str
+    width: int
+    height: int
+
+    @property
+    def alt(self) -> str:
+        return str(self.image.default_alt_text)
+
+    @property
+    def full_url(self) -> str:
+        return self.url
+
+    @property
+    def attrs_dict(self) -> OrderedDict[str, Any]:
+        return OrderedDict([("src", self.url), ("width", self.width), ("height", self.height), ("alt", self.alt)])
+
+    @property
+    def attrs(self) -> str:
+        return flatatt(self.attrs_dict)
+
+    def img_tag(self, extra_attributes: dict[str, Any] | None = None) -> SafeString:
+        attrs = self.attrs_dict.copy()
+        attrs.update(apps.get_app_config("wagtailimages").default_attrs)
+        if extra_attributes:
+            attrs.update(extra_attributes)
+        return mark_safe(f"<img{flatatt(attrs)}>")
+
+    def __html__(self) -> str:
+        return self.img_tag()
+
+
+def is_cloudinary_image(image: Any) -> bool:
+    file = getattr(image, "file", None)
+    return bool(file) and isinstance(file.storage, MediaCloudinaryStorage)
+
+
+def public_id(image: Any) -> str:
+    """
+    The Cloudinary public id ``MediaCloudinaryStorage`` saved the file under: its
+    name behind ``CLOUDINARY_STORAGE["PREFIX"]`` (``MEDIA_URL`` by default).
+    """
+    prefix = app_settings.PREFIX.lstrip("/")
+    if prefix and not prefix.endswith("/"):
+        prefix += "/"
+    name = str(image.file.name)
+    return name if name.startswith(prefix) else prefix + name
+
+
+def transformation_for(image: Any, filter_spec: str) -> tuple[str, tuple[int, int]] | None:
+    """
+    Cloudinary transformation string + output size for ``filter_spec``, or None when
+    the spec uses an operation Cloudinary can't reproduce.
+    """
+    image_filter = Filter(spec=filter_spec)
+
+    output_format = ""
+    qualities: dict[str, int] = {}
+    background = ""
+    for operation in image_filter.operations:
+        if isinstance(operation, (TransformOperation, DoNothingOperation)):
+            continue
+        if isinstance(operation, FormatOperation):
+            output_format = operation.format
+        elif type(operation) in _QUALITY_OPERATIONS:
+            qualities[_QUALITY_OPERATIONS[type(operation)]] = operation.quality
+        elif isinstance(operation, BackgroundColorOperation):
+            background = "b_rgb:{:02x}{:02x}{:02x}".format(*operation.color[:3])
+        else:
+            return None
+
+    transform = image_filter.get_transform(image)
+    width, height = (int(round(v)) for v in transform.size)
+    left, top, right, bottom = (int(round(v)) for v in transform.get_rect())
+
+    steps: list[str] = []
+    if (left, top, right, bottom) != (0, 0, image.width, image.height):
+        steps.append(f"c_crop,x_{left},y_{top},w_{right - left},h_{bottom - top}")
+    if (width, height) != (right - left, bottom - top):
+        steps.append(f"c_scale,w_{width},h_{height}")
+
+    if output_format:
+        quality = qualities.get(output_format)
+    else:
+        # f_auto picks the format per browser; honour a single explicit quality.
+        quality = next(iter(qualities.values())) if len(qualities) == 1 else None
+
+    delivery = [f"f_{output_format or 'auto'}", f"q_{quality or 'auto'}"]
+    if background:
+        delivery.append(background)
+    steps.append(",".join(delivery))
+
+    return "/".join(steps), (width, height)
+
+
+def _build(image: Any, filter_spec: str) -> tuple[str, int, int] | None:
+    """
+    (url, width, height) for ``filter_spec``; None when Wagtail couldn't render it.
+    """
+    if is_cloudinary_image(image) and not image.is_svg() and image.width and image.height:
+        result = transformation_for(image, filter_spec)
+        if result is not None:
+            transformation, (width, height) = result
+            url = media_backends.delivery_url(transformation, public_id(image))
+            return url, width, height
+
+    rendition = get_rendition_or_not_found(image, filter_spec)
+    if rendition.pk is None:
+        # "not found" placeholder (missing source file): don't memoize it.
+        return None
+    return rendition.url, rendition.width, rendition.height
+
+
+# ---------------------------------------------------------------------
+# METADATA CACHE (in-process LRU + shared cache)
+# ---------------------------------------------------------------------
+
+_PREFIX = "odin:renditions:"
+_LOCAL_MAXSIZE = 1024
+
+# image key -> {filter_spec: (url, width, height)}
+_local: OrderedDict[str, dict[str, tuple[str, int, int]]] = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _timeout() -> int:
+    return int(getattr(settings, "RENDITION_CACHE_TIMEOUT", 60 * 60 * 24 * 30))
+
+
+def image_key(image: Any) -> str:
+    """
+    Key per image *file state*: a new file or focal point gives a new key, so stale
+    entries are never read again and simply expire.
+    """
+    raw = "|".join(
+        str(part)
+        for part in (
+            image.file.name,
+            getattr(image, "file_hash", ""),
+            image.width,
+            image.height,
+            image.focal_point_x,
+            image.focal_point_y,
+            image.focal_point_width,
+            image.focal_point_height,
+        )
+    )
+    return f"{_PREFIX}{image.pk}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _local_get(key: str) -> dict[str, tuple[str, int, int]] | None:
+    with _local_lock:
+        entry = _local.get(key)
+        if entry is not None:
+            _local.move_to_end(key)
+        return entry
+
+
+def _local_set(key: str, entry: dict[str, tuple[str, int, int]]) -> None:
+    with _local_lock:
+        _local[key] = entry
+        _local.move_to_end(key)
+        while len(_local) > _LOCAL_MAXSIZE:
+            _local.popitem(last=False)
+
+
+def warm(images: Iterable[Any]) -> None:
+    """
+    Load the cached rendition metadata for ``images`` with a single multi-get.
+    """
+    keys = {image_key(image) for image in images if image is not None and image.pk}
+    missing = [key for key in keys if _local_get(key) is None]
+    if not missing:
+        return
+    for key, entry in cache.get_many(missing).items():
+        _local_set(key, entry)
+
+
+def get_rendition(image: Any, filter_spec: str) -> Any:
+    """
+    Rendition-like object for ``image``/``filter_spec``, served from the metadata cache
+    when possible. Cloudinary images never touch the DB; others use Wagtail renditions.
+    """
+    key = image_key(image) if image.pk else None
+    entry: dict[str, tuple[str, int, int]] = {}
+    if key is not None:
+        local = _local_get(key)
+        if local is not None:
+            entry = local
+        else:
+            # Only hits are kept in process: a miss is asked again, so entries another process builds are found.
+            entry = cache.get(key) or {}
+            if entry:
+                _local_set(key, entry)
+
+    cached = entry.get(filter_spec)
+    if cached is None:
+        cached = _build(image, filter_spec)
+        if cached is None:
+            return get_rendition_or_not_found(image, filter_spec)
+        if key is not None:
+            entry = {**entry, filter_spec: cached}
+            _local_set(key, entry)
+            cache.set(key, entry, timeout=_timeout())
+
+    url, width, height = cached
+    return RenditionInfo(image, filter_spec, url, width, height)
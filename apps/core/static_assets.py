@@ -0,0 +1,117 @@
+"""
+Self-hosted front-end assets (htmx, GSAP, the Alpine bundle, fonts, CSS).
+
+* ``integrity(path)``: Subresource Integrity value for a static script, so a
+  tampered file on the CDN in front of ``STATIC_URL`` is refused by the browser.
+  ``manage.py check --deploy`` fails while one of those scripts isn't built
+  (apps/core/checks.py).
+* ``link_header()``: the ``Link: rel=preload`` value for the assets every page
+  needs, with the hashed URLs from the staticfiles manifest. Sent on HTML
+  responses by ``apps.core.middleware.EarlyHintsMiddleware``.
+
+Third-party scripts are copied into ``static/vendor/`` by ``bun run build:vendor``
+(versions pinned in package.json) and go through collectstatic like our own files:
+hashed names, gzip/Brotli variants (WhiteNoise compresses with Brotli when the
+``Brotli`` package is installed) and far-future caching.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+logger = logging.getLogger(__name__)
+
+HTMX = "vendor/htmx.min.js"
+GSAP = "vendor/gsap.min.js"
+ALPINE_BUNDLE = "dist/alpine.js"
+
+
+@dataclass(frozen=True)
+class Preload:
+    path: str
+    as_: str
+    type: str = ""
+    rel: str = "preload"
+    crossorigin: bool = False
+
+    def link(self, url: str) -> str:
+        parts = [f"<{url}>", f"rel={self.rel}"]
+        if self.rel == "preload":
+            parts.append(f"as={self.as_}")
+        if self.type:
+            parts.append(f'type="{self.type}"')
+        if self.crossorigin:
+            parts.append("crossorigin")
+        return "; ".join(parts)
+
+
+# Needed by every page, in priority order (keep in step with the <head> of templates/base.html).
+PRELOADS: tuple[Preload, ...] = (
+    Preload("css/tailwind.css", "style"),
+    Preload("fonts/Satoshi-Regular.woff2", "font", "font/woff2", crossorigin=True),
+    Preload("fonts/ClashDisplay-Bold.woff2", "font", "font/woff2", crossorigin=True),
+    Preload(HTMX, "script"),
+    Preload(ALPINE_BUNDLE, "script", rel="modulepreload"),
+)
+
+
+def _source(path: str) -> Path | None:
+    found = finders.find(path)
+    return Path(found) if isinstance(found, str) else None
+
+
+# ---------------------------------------------------------------------
+# SUBRESOURCE INTEGRITY
+# ---------------------------------------------------------------------
+
+
+@lru_cache(maxsize=64)
+def _digest(source: Path, mtime_ns: int) -> str:
+    digest = hashlib.sha384(source.read_bytes()).digest()
+    return f"sha384-{base64.b64encode(digest).decode('ascii')}"
+
+
+def integrity(path: str) -> str:
+    """
+    ``sha384-…`` for a static script ("" when it isn't built, so the attribute is a no-op).
+
+    Hashes the source file: collectstatic copies JS unchanged (only CSS gets its
+    url()s rewritten), so don't use this for stylesheets.
+    """
+    source = _source(path)
+    if source is None:
+        logger.warning("No static file %s to compute its integrity from.", path)
+        return ""
+    # Keyed on mtime so `bun run dev:js` rebuilds don't serve a stale hash.
+    return _digest(source, source.stat().st_mtime_ns)
+
+
+# ---------------------------------------------------------------------
+# PRELOAD LINKS
+# ---------------------------------------------------------------------
+
+
+def link_header(preloads: tuple[Preload, ...] = PRELOADS) -> str:
+    """
+    ``Link`` header value for ``preloads``; files that aren't built/collected are skipped.
+    """
+    links = []
+    for preload in preloads:
+        if _source(preload.path) is None:
+            logger.warning("Not preloading %s: static file not found.", preload.path)
+            continue
+        try:
+            url = static(preload.path)
+        except ValueError:  # ManifestStaticFilesStorage: not in staticfiles.json (collectstatic not run)
+            logger.warning("Not preloading %s: missing from the staticfiles manifest.", preload.path)
+            continue
+        links.append(preload.link(url))
+    return ", ".join(links)
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import re
+from typing import Any
+
 from django import template
-from django.conf import settings
+from django.template.base import Parser, Token
+from django.utils.html import format_html
+from django.utils.safestring import SafeString, mark_safe
+from wagtail.images.models import Filter
+from wagtail.images.templatetags.wagtailimages_tags import ImageNode
+from wagtail.images.templatetags.wagtailimages_tags import image as parse_image_tag
+
+from apps.core import image_endpoint, media_backends, pictures, presets, renditions
 
 register = template.Library()
 
+PRESET_SPEC_PREFIX = "preset-"
 
-def _cloud_name() -> str:
-    """
-    Single source of truth for Cloudinary cloud name.
-    """
-    storage = getattr(settings, "CLOUDINARY_STORAGE", {})
-    return storage.get("CLOUD_NAME") or "demo"
+# Hero/background video renditions (``cld_video_sources``); the client picks one for its viewport.
+VIDEO_WIDTHS: tuple[int, ...] = (640, 960, 1280, 1920)
+
+_COLOR_RE = re.compile(r"^(#[0-9a-f]{6}|transparent)$")
+_LQIP_RE = re.compile(r"^data:image/webp;base64,[A-Za-z0-9+/=]+$")
 
 
 @register.simple_tag
@@ -22,64 +32,226 @@ def cld_video(public_id: str | None, width: int = 1080) -> str:
     if not public_id:
         return ""
 
-    cloud_name = _cloud_name()
-    return (
-        f"https://res.cloudinary.com/{cloud_name}/video/upload/"
-        f"f_auto,q_auto:eco,vc_auto,w_{width},c_limit/{public_id}"
-    )
+    return media_backends.delivery_url(f"f_auto,q_auto:eco,vc_auto,w_{width},c_limit", public_id, "video")
+
+
+@register.simple_tag
+def cld_video_stream(public_id: str | None) -> str:
+    """
+    Adaptive (HLS, ``sp_auto``) stream URL for a Cloudinary video; "" on the local
+    media backend, which doesn't transcode.
+    """
+    if not public_id or media_backends.is_local():
+        return ""
+
+    return media_backends.delivery_url("sp_auto", f"{public_id}.m3u8", "video")
+
+
+@register.simple_tag
+def cld_video_sources(public_id: str | None) -> str:
+    """
+    MP4 renditions as "<width> <url>, ..." for clients without HLS (``data-sources`` on the hero video).
+    """
+    if not public_id:
+        return ""
+
+    return ", ".join(f"{width} {cld_video(public_id, width)}" for width in VIDEO_WIDTHS)
 
 
 @register.simple_tag
 def cld_img(
-    public_id: str | None,
+    public_id: Any,
     width: int = 800,
     height: int | None = None,
     gravity: str = "auto",
     fmt: str = "auto",
     quality: str = "auto",
+    preset: str = "",
 ) -> str:
     """
-    Generates an optimized Cloudinary image URL.
+    Generates an optimized Cloudinary image URL for a named preset, or for ad-hoc
+    width/height/gravity snapped to the nearest preset (see apps/core/presets.py).
+    Also accepts a Wagtail image (served by the /img/ endpoint when IMAGE_DELIVERY = "self").
     """
     if not public_id:
         return ""
 
-    cloud_name = _cloud_name()
-
-    fmt_str = f"f_{fmt}" if fmt and fmt != "auto" else "f_auto"
-    quality_str = f"q_{quality}" if quality and quality != "auto" else "q_auto"
-    transforms: list[str] = [fmt_str, quality_str, "dpr_auto", f"w_{width}"]
+    chosen = presets.get_preset(preset) if preset else presets.normalize(int(width), height and int(height), gravity)
+    if not isinstance(public_id, str):
+        image = public_id
+        if chosen.name and image_endpoint.enabled() and image_endpoint.servable(image):
+            return image_endpoint.variant_url(image, chosen.name)
+        if not renditions.is_cloudinary_image(image) or image.is_svg():
+            return renditions.get_rendition(image, chosen.filter_spec()).url
+        public_id = renditions.public_id(image)
+    transform_str = chosen.transformation()
 
-    if height is not None:
-        transforms.extend(
-            [
-                f"h_{height}",
-                "c_fill",
-                f"g_{gravity}",
-            ]
-        )
+    # Explicit format/quality overrides are kept (rare; they opt out of the shared variant).
+    if fmt and fmt != "auto":
+        transform_str = transform_str.replace("f_auto", f"f_{fmt}", 1)
+    if quality and quality != "auto":
+        transform_str = transform_str.replace("q_auto", f"q_{quality}", 1)
 
-    transform_str = ",".join(transforms)
-    return f"https://res.cloudinary.com/{cloud_name}/image/upload/{transform_str}/{public_id}"
+    return media_backends.delivery_url(transform_str, public_id)
 
 
 @register.simple_tag
 def cld_srcset(public_id: str | None, aspect_ratio: str = "4:3") -> str:
     """
-    Generates a responsive srcset string.
-    Output: "url 600w, url 800w, url 1200w"
+    Generates a responsive srcset string on the shared width steps.
+    Output: "url 640w, url 800w, url 1200w"
     Uses: f_auto,q_auto,c_fill,g_auto + enforced aspect ratio.
     """
     if not public_id:
         return ""
 
-    cloud_name = _cloud_name()
-    base_url = f"https://res.cloudinary.com/{cloud_name}/image/upload"
-
+    base_url = media_backends.get_backend().delivery_base()
     base_params = f"f_auto,q_auto,c_fill,g_auto,ar_{aspect_ratio}"
+    widths = sorted({pictures.snap_width(width) for width in (600, 800, 1200)})
+    return ", ".join(f"{base_url}/{base_params},w_{width}/{public_id} {width}w" for width in widths)
+
 
-    small = f"{base_url}/{base_params},w_600/{public_id} 600w"
-    medium = f"{base_url}/{base_params},w_800/{public_id} 800w"
-    large = f"{base_url}/{base_params},w_1200/{public_id} 1200w"
+@register.simple_tag
+def cld_picture(
+    source: Any,
+    columns: str | int = 1,
+    max_width: int | None = None,
+    aspect_ratio: str = "",
+    gravity: str = "auto",
+    crop: str = "fill",
+    fallback: str = "jpg",
+    preset: str = "",
+    **attrs: Any,
+) -> SafeString | str:
+    """
+    Responsive <picture> (AVIF, WebP, ``fallback``) for a public id or a Wagtail image.
+    Either name a preset (``preset="speaker_card"``) or describe the layout: ``columns``
+    is the grid column count per breakpoint (base md lg xl), e.g. ``columns="2 3 4"
+    max_width=400``. Other keyword arguments go on the <img>. With IMAGE_DELIVERY = "self"
+    Wagtail images and a preset use the /img/ endpoint instead of Cloudinary.
+    """
+    if not source:
+        return ""
 
-    return f"{small}, {medium}, {large}"
+    if preset:
+        layout = presets.get_preset(preset).layout()
+    else:
+        layout = pictures.Layout.parse(columns, max_width, aspect_ratio, gravity, crop, fallback)
+    if isinstance(source, str):
+        public_id = source
+    else:
+        attrs.setdefault("alt", source.default_alt_text)
+        if preset and image_endpoint.enabled() and image_endpoint.servable(source):
+            return mark_safe(pictures.render_picture(image_endpoint.build_picture(source, preset), attrs))
+        if not renditions.is_cloudinary_image(source) or source.is_svg():
+            # Local storage: a single Wagtail rendition at the largest display size.
+            width = pictures.width_range(layout)[1]
+            spec = presets.get_preset(preset).filter_spec(width) if preset else f"max-{width}x{width}"
+            return str(renditions.get_rendition(source, spec).img_tag(attrs))
+        public_id = renditions.public_id(source)
+
+    attrs.setdefault("alt", "")
+    return mark_safe(pictures.render_picture(pictures.build_picture(public_id, layout), attrs))
+
+
+@register.simple_tag
+def cld_preload(source: Any, preset: str) -> SafeString | str:
+    """
+    ``<link rel="preload">`` for the LCP image rendered by ``{% cld_picture source preset=... %}``.
+    Preloads the AVIF candidates (``type`` makes other browsers skip it rather than fetch
+    a file the <picture> won't use); local renditions preload their single URL.
+    """
+    if not source:
+        return ""
+
+    if isinstance(source, str):
+        picture = pictures.build_picture(source, presets.get_preset(preset).layout())
+    elif image_endpoint.enabled() and image_endpoint.servable(source):
+        picture = image_endpoint.build_picture(source, preset)
+    elif renditions.is_cloudinary_image(source) and not source.is_svg():
+        picture = pictures.build_picture(renditions.public_id(source), presets.get_preset(preset).layout())
+    else:
+        width = pictures.width_range(presets.get_preset(preset).layout())[1]
+        url = renditions.get_rendition(source, presets.get_preset(preset).filter_spec(width)).url
+        return format_html('<link rel="preload" as="image" href="{}" fetchpriority="high">', url)
+
+    mime, srcset = picture.sources[0]
+    return format_html(
+        '<link rel="preload" as="image" type="{}" imagesrcset="{}" imagesizes="{}" fetchpriority="high">',
+        mime,
+        srcset,
+        picture.sizes,
+    )
+
+
+@register.simple_tag
+def placeholder_style(obj: Any, fit: str = "cover") -> str:
+    """
+    Inline CSS painting a snippet's stored placeholder (dominant colour + blurred preview)
+    behind its image, e.g. ``<div style="{% placeholder_style speaker %}">``. Use
+    ``fit="contain"`` for logos.
+    """
+    color = getattr(obj, "placeholder_color", "")
+    lqip = getattr(obj, "placeholder_lqip", "")
+    rules = []
+    if color and _COLOR_RE.match(color):
+        rules.append(f"background-color:{color}")
+    if lqip and _LQIP_RE.match(lqip):
+        size = "contain" if fit == "contain" else "cover"
+        rules.append(f"background-image:url({lqip});background-size:{size};background-position:center;background-repeat:no-repeat")
+    return ";".join(rules)
+
+
+class CloudinaryImageNode(ImageNode):
+    def preset_name(self) -> str:
+        """
+        The preset when the tag names exactly one (``preset-<name>``), else "".
+        """
+        if len(self.filter_specs) == 1 and self.filter_specs[0].startswith(PRESET_SPEC_PREFIX):
+            return self.filter_specs[0].removeprefix(PRESET_SPEC_PREFIX)
+        return ""
+
+    def get_filter(self) -> Any:
+        # "preset-<name>" expands to the preset's Wagtail filter spec.
+        specs = [
+            presets.get_preset(spec.removeprefix(PRESET_SPEC_PREFIX)).filter_spec()
+            if spec.startswith(PRESET_SPEC_PREFIX)
+            else spec
+            for spec in self.filter_specs
+        ]
+        return Filter(spec="|".join(specs))
+
+    def render(self, context: template.Context) -> str:
+        image = self.validate_image(context)
+        if not image:
+            return ""
+
+        preset = self.preset_name()
+        if preset and image_endpoint.enabled() and image_endpoint.servable(image):
+            rendition = image_endpoint.get_rendition(image, preset)
+        else:
+            rendition = renditions.get_rendition(image, self.get_filter().spec)
+
+        if self.output_var_name:
+            context[self.output_var_name] = rendition
+            return ""
+
+        resolved_attrs: dict[str, Any] = {key: value.resolve(context) for key, value in self.attrs.items()}
+        return str(rendition.img_tag(resolved_attrs))
+
+
+@register.tag
+def cld_image(parser: Parser, token: Token) -> CloudinaryImageNode:
+    """
+    Drop-in for ``{% image %}`` (same arguments, same ``as`` form) that renders
+    Cloudinary-stored images as Cloudinary transformation URLs. ``preset-<name>``
+    may be used in place of a filter spec.
+    """
+    _tag_name, _sep, arguments = token.contents.partition(" ")
+    node = parse_image_tag(parser, Token(token.token_type, f"image {arguments}", token.position, token.lineno))
+    return CloudinaryImageNode(
+        node.image_expr,
+        node.filter_specs,
+        output_var_name=node.output_var_name,
+        attrs=node.attrs,
+    )
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import SafeString, mark_safe
+
+from apps.core import critical_css
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def critical_stylesheet(context: template.Context, path: str = critical_css.STYLESHEET) -> SafeString:
+    """
+    Inline the critical CSS built for the page's template and load ``path`` without
+    blocking render; a plain blocking <link> when none is built (see apps/core/critical_css.py).
+    """
+    origin = getattr(context.template, "origin", None)
+    key = getattr(origin, "template_name", None) or ""
+    href = static(path)
+
+    css = critical_css.get(key) if key and path == critical_css.STYLESHEET else None
+    if css is None:
+        return format_html('<link rel="stylesheet" href="{}" {}="{}" />', href, critical_css.KEY_ATTRIBUTE, key)
+
+    # The CSS comes from our own build output; "</" can't appear in it unescaped.
+    inline = mark_safe(css.replace("</", "<\\/"))
+    return format_html(
+        '<style {}="{}">{}</style>\n'
+        '    <link rel="preload" href="{}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'" />\n'
+        '    <noscript><link rel="stylesheet" href="{}" /></noscript>',
+        critical_css.KEY_ATTRIBUTE,
+        key,
+        inline,
+        href,
+        href,
+    )
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from django import template
+
+from apps.core import static_assets
+
+register = template.Library()
+
+
+@register.simple_tag
+def integrity(path: str) -> str:
+    """
+    Subresource Integrity value for a static script: ``integrity="{% integrity 'vendor/htmx.min.js' %}"``.
+    """
+    return static_assets.integrity(path)
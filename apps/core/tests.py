@@ -1,2 +1,812 @@
+from __future__ import annotations
 
-# Create your tests here.
+import base64
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.checks import Tags, run_checks
+from django.core.files.images import ImageFile
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, override_settings
+from PIL import Image as PILImage
+from wagtail.images import get_image_model
+from wagtail.images.models import Filter
+
+from . import (
+    checks,
+    critical_css,
+    image_endpoint,
+    local_transform,
+    media_backends,
+    pictures,
+    placeholders,
+    presets,
+    renditions,
+    static_assets,
+    views,
+)
+from .middleware import EarlyHintsMiddleware
+from .templatetags import cloudinary_helper
+from .templatetags import critical_css as critical_css_tags
+
+# Media in memory, static files without a manifest: no network, no collectstatic.
+TEST_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+def image_bytes(size: tuple[int, int] = (1000, 500), fmt: str = "PNG", color: str = "#2255aa") -> bytes:
+    buffer = io.BytesIO()
+    PILImage.new("RGB", size, color).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+TEST_CLOUDINARY = {"CLOUD_NAME": "odin", "API_KEY": "key", "API_SECRET": "secret"}
+
+
+@override_settings(STORAGES=TEST_STORAGES, CLOUDINARY_STORAGE=TEST_CLOUDINARY)
+class CoreTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        renditions._local.clear()
+        self.addCleanup(cache.clear)
+
+    def make_image(self, size: tuple[int, int] = (1000, 500), **fields: Any) -> Any:
+        file = ImageFile(io.BytesIO(image_bytes(size)), name="test.png")
+        return get_image_model().objects.create(title="Test", file=file, **fields)
+
+    def as_cloudinary(self) -> Any:
+        """
+        Treat every image as stored on Cloudinary (``<folder>/test``), without the network.
+        """
+        patches = (
+            mock.patch.object(renditions, "is_cloudinary_image", return_value=True),
+            mock.patch.object(renditions, "public_id", return_value="folder/test"),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+
+# ---------------------------------------------------------------------
+# CLOUDINARY RENDITIONS
+# ---------------------------------------------------------------------
+
+
+class TransformationTests(CoreTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.image = get_image_model()(width=1000, height=500)
+
+    def test_public_id_is_the_file_name_behind_the_storage_prefix(self) -> None:
+        image = mock.Mock(file=mock.Mock())
+        for prefix, name, expected in (
+            ("/media/", "original_images/a.png", "media/original_images/a.png"),
+            ("media", "media/original_images/a.png", "media/original_images/a.png"),
+            ("", "original_images/a.png", "original_images/a.png"),
+        ):
+            image.file.name = name
+            with self.subTest(prefix=prefix), mock.patch.object(renditions.app_settings, "PREFIX", prefix):
+                self.assertEqual(renditions.public_id(image), expected)
+
+    def test_fill_crops_around_the_centre_then_scales(self) -> None:
+        transformation, size = renditions.transformation_for(self.image, "fill-400x400")  # type: ignore[misc]
+
+        self.assertEqual(transformation, "c_crop,x_250,y_0,w_500,h_500/c_scale,w_400,h_400/f_auto,q_auto")
+        self.assertEqual(size, (400, 400))
+
+    def test_fill_follows_the_focal_point(self) -> None:
+        self.image.focal_point_x, self.image.focal_point_y = 900, 250
+        self.image.focal_point_width = self.image.focal_point_height = 10
+
+        transformation, _size = renditions.transformation_for(self.image, "fill-400x400")  # type: ignore[misc]
+
+        # Same crop box as Wagtail's own transform, moved right of the centre (x_250).
+        rect = Filter(spec="fill-400x400").get_transform(self.image).get_rect()
+        left, top, right, bottom = (int(round(value)) for value in rect)
+        self.assertGreater(left, 250)
+        self.assertTrue(transformation.startswith(f"c_crop,x_{left},y_{top},w_{right - left},h_{bottom - top}/"))
+
+    def test_explicit_format_and_quality(self) -> None:
+        transformation, size = renditions.transformation_for(  # type: ignore[misc]
+            self.image, "width-500|format-webp|webpquality-70"
+        )
+
+        self.assertEqual(transformation, "c_scale,w_500,h_250/f_webp,q_70")
+        self.assertEqual(size, (500, 250))
+
+    def test_no_resize_only_sets_delivery(self) -> None:
+        transformation, size = renditions.transformation_for(self.image, "max-2000x2000")  # type: ignore[misc]
+
+        self.assertEqual(transformation, "f_auto,q_auto")
+        self.assertEqual(size, (1000, 500))
+
+    def test_cloudinary_images_never_write_renditions(self) -> None:
+        self.as_cloudinary()
+        image = self.make_image()
+
+        rendition = renditions.get_rendition(image, "fill-400x400")
+
+        self.assertEqual(
+            rendition.url,
+            "https://res.cloudinary.com/odin/image/upload/c_crop,x_250,y_0,w_500,h_500/c_scale,w_400,h_400/"
+            "f_auto,q_auto/folder/test",
+        )
+        self.assertEqual((rendition.width, rendition.height), (400, 400))
+        self.assertFalse(image.renditions.exists())
+        self.assertIn('width="400"', rendition.img_tag())
+
+    def test_other_storages_fall_back_to_wagtail(self) -> None:
+        image = self.make_image()
+
+        rendition = renditions.get_rendition(image, "fill-100x100")
+
+        self.assertEqual((rendition.width, rendition.height), (100, 100))
+        self.assertTrue(image.renditions.filter(filter_spec="fill-100x100").exists())
+
+
+# ---------------------------------------------------------------------
+# RENDITION METADATA CACHE
+# ---------------------------------------------------------------------
+
+
+class RenditionCacheTests(CoreTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.as_cloudinary()
+        self.image = self.make_image()
+
+    def spy_build(self) -> Any:
+        return mock.patch.object(renditions, "_build", wraps=renditions._build)
+
+    def test_repeat_lookups_are_memoized_in_process(self) -> None:
+        first = renditions.get_rendition(self.image, "fill-400x400")
+
+        with self.spy_build() as build, self.assertNumQueries(0):
+            second = renditions.get_rendition(self.image, "fill-400x400")
+
+        build.assert_not_called()
+        self.assertEqual(first.url, second.url)
+
+    def test_other_processes_read_the_shared_cache(self) -> None:
+        renditions.get_rendition(self.image, "fill-400x400")
+        renditions._local.clear()
+
+        with self.spy_build() as build:
+            renditions.get_rendition(self.image, "fill-400x400")
+
+        build.assert_not_called()
+
+    def test_misses_are_not_memoized_in_process(self) -> None:
+        with mock.patch.object(renditions, "_build", return_value=None):
+            renditions.get_rendition(self.image, "fill-400x400")
+        # Built meanwhile by another process.
+        cache.set(renditions.image_key(self.image), {"fill-400x400": ("https://example.com/x.png", 400, 400)})
+
+        with self.spy_build() as build:
+            rendition = renditions.get_rendition(self.image, "fill-400x400")
+
+        build.assert_not_called()
+        self.assertEqual(rendition.url, "https://example.com/x.png")
+
+    def test_warm_fetches_every_image_in_one_round_trip(self) -> None:
+        other = self.make_image(size=(800, 800))
+        for image in (self.image, other):
+            renditions.get_rendition(image, "fill-400x400")
+        renditions._local.clear()
+
+        with mock.patch.object(renditions.cache, "get_many", wraps=renditions.cache.get_many) as get_many:
+            renditions.warm([self.image, other, None])
+        with mock.patch.object(renditions.cache, "get") as get, self.spy_build() as build:
+            renditions.get_rendition(self.image, "fill-400x400")
+            renditions.get_rendition(other, "fill-400x400")
+
+        get_many.assert_called_once()
+        get.assert_not_called()
+        build.assert_not_called()
+
+    def test_focal_point_change_gives_a_new_key(self) -> None:
+        key = renditions.image_key(self.image)
+        self.image.set_focal_point(None)
+        self.image.focal_point_x, self.image.focal_point_y = 10, 10
+        self.image.focal_point_width = self.image.focal_point_height = 5
+
+        self.assertNotEqual(renditions.image_key(self.image), key)
+
+
+# ---------------------------------------------------------------------
+# RESPONSIVE <picture>
+# ---------------------------------------------------------------------
+
+
+class PictureTests(CoreTestCase):
+    layout = pictures.Layout.parse("1 2 3", max_width=400, aspect_ratio="4:3")
+
+    def test_sizes_switch_to_px_once_the_slot_is_capped(self) -> None:
+        self.assertEqual(
+            pictures.sizes_for(self.layout),
+            "(min-width: 1200px) 400px, (min-width: 1024px) 33.33vw, (min-width: 800px) 400px, "
+            "(min-width: 768px) 50vw, (min-width: 400px) 400px, 100vw",
+        )
+        self.assertEqual(pictures.sizes_for(pictures.Layout.parse(1)), "(min-width: 1536px) 1536px, 100vw")
+
+    def test_width_ladder_spans_phone_to_max_width_at_2x(self) -> None:
+        self.assertEqual(pictures.width_range(self.layout), (320, 800))
+        self.assertEqual(pictures.width_ladder(*pictures.width_range(self.layout)), [320, 400, 480, 640, 800])
+
+    def test_width_steps_default_to_the_module_constant(self) -> None:
+        self.assertEqual(pictures.width_steps(), pictures.DEFAULT_WIDTH_STEPS)
+        self.assertEqual(pictures.snap_width(301), 320)
+
+    @override_settings(CLOUDINARY_WIDTH_STEPS=(300, 600, 900))
+    def test_ladder_uses_the_shared_width_steps(self) -> None:
+        self.assertEqual(pictures.snap_width(301), 600)
+        self.assertEqual(pictures.snap_width(5000), 900)
+        self.assertEqual(pictures.width_ladder(320, 800), [600, 900])
+
+    def test_assemble_builds_modern_sources_and_a_fallback(self) -> None:
+        picture = pictures.assemble(self.layout, lambda fmt, width: f"{fmt}-{width}")
+
+        self.assertEqual([mime for mime, _srcset in picture.sources], ["image/avif", "image/webp"])
+        self.assertEqual(
+            picture.sources[0][1], "avif-320 320w, avif-400 400w, avif-480 480w, avif-640 640w, avif-800 800w"
+        )
+        self.assertEqual(picture.srcset.split(", ")[0], "jpg-320 320w")
+        self.assertEqual(picture.src, "jpg-480")
+        self.assertEqual((picture.width, picture.height), (400, 300))
+
+    def test_template_tag_renders_cloudinary_urls(self) -> None:
+        html = Template(
+            '{% load cloudinary_helper %}'
+            '{% cld_picture "speakers/ada" columns="1 2 3" max_width=400 aspect_ratio="4:3" alt="Ada" %}'
+        ).render(Context())
+
+        self.assertTrue(html.startswith('<picture><source type="image/avif"'))
+        self.assertIn(
+            'src="https://res.cloudinary.com/odin/image/upload/f_jpg,q_auto,c_fill,g_auto,ar_4:3,w_480/speakers/ada"',
+            html,
+        )
+        self.assertIn('alt="Ada" height="300"', html)
+
+    def test_pictures_are_memoized_per_layout(self) -> None:
+        first = pictures.build_picture("speakers/ada", self.layout)
+
+        self.assertIs(pictures.build_picture("speakers/ada", self.layout), first)
+        self.assertIsNot(pictures.build_picture("speakers/grace", self.layout), first)
+
+
+# ---------------------------------------------------------------------
+# TRANSFORMATION PRESETS
+# ---------------------------------------------------------------------
+
+
+class PresetTests(CoreTestCase):
+    def test_preset_transformation_and_filter_spec(self) -> None:
+        card = presets.get_preset("speaker_card")
+
+        self.assertEqual(card.transformation(), "f_auto,q_auto,dpr_auto,w_400,h_400,c_fill,g_face")
+        self.assertEqual(card.filter_spec(), "fill-400x400")
+        self.assertEqual(presets.get_preset("partner_logo").filter_spec(640), "width-640")
+
+    def test_unknown_preset_names_the_setting(self) -> None:
+        with self.assertRaisesMessage(KeyError, "CLOUDINARY_PRESETS"):
+            presets.get_preset("nope")
+
+    def test_ad_hoc_sizes_snap_to_a_preset_of_the_same_shape(self) -> None:
+        self.assertEqual(presets.normalize(380, 380, "face").name, "speaker_card")
+        # Too far below the preset width: snapped to a width step instead.
+        self.assertEqual(presets.normalize(200, 200), presets.Preset(name="", width=240, height=240))
+        self.assertEqual(presets.normalize(700), presets.Preset(name="", width=800))
+        self.assertEqual(presets.normalize(1000, 333, "weird").gravity, "auto")
+
+    def test_cld_img_shares_one_url_between_preset_and_nearby_sizes(self) -> None:
+        html = Template(
+            '{% load cloudinary_helper %}'
+            '{% cld_img "a/b" preset="speaker_card" %}|{% cld_img "a/b" width=380 height=380 gravity="face" %}'
+        ).render(Context())
+
+        named, ad_hoc = html.split("|")
+        self.assertEqual(named, ad_hoc)
+        self.assertEqual(
+            named, "https://res.cloudinary.com/odin/image/upload/f_auto,q_auto,dpr_auto,w_400,h_400,c_fill,g_face/a/b"
+        )
+
+    def test_derivatives_are_deduplicated(self) -> None:
+        card = presets.get_preset("speaker_card")
+
+        self.assertEqual(presets.derivatives_for(["speaker_card", "speaker_card"]), card.derivatives())
+        self.assertEqual(card.derivatives(), pictures.transformations(card.layout()))
+
+    @override_settings(CLOUDINARY_PRESETS={"tile": {"width": 300, "height": 300}})
+    def test_presets_follow_the_setting(self) -> None:
+        self.assertEqual(list(presets.get_presets()), ["tile"])
+        self.assertEqual(presets.normalize(290, 290).name, "tile")
+
+
+# ---------------------------------------------------------------------
+# LOCAL MEDIA BACKEND
+# ---------------------------------------------------------------------
+
+
+class LocalBackendTests(CoreTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_BACKEND=media_backends.LOCAL, LOCAL_MEDIA_BACKEND_ROOT=root))
+        self.backend = media_backends.get_backend()
+        assert isinstance(self.backend, media_backends.LocalBackend)
+
+    def upload(self, public_id: str = "ada", **options: Any) -> Any:
+        source = io.BytesIO(image_bytes((800, 400)))
+        return self.backend.upload(source, folder="speakers", public_id=public_id, **options)
+
+    def get(self, path: str, headers: dict[str, str] | None = None) -> Any:
+        request = RequestFactory().get(f"/cld/image/upload/{path}", headers=headers)
+        return views.local_media(request, "image", path)
+
+    def test_uploads_are_content_addressed(self) -> None:
+        first, second = self.upload("ada"), self.upload("grace")
+
+        self.assertEqual((first["public_id"], second["public_id"]), ("speakers/ada", "speakers/grace"))
+        self.assertEqual(first["etag"], second["etag"])
+        self.assertEqual(self.backend.resolve("speakers/ada"), self.backend.resolve("speakers/grace"))
+        self.assertEqual(len(list((self.backend.root / "objects").rglob("*"))), 2)  # one directory, one object
+        self.assertIsNone(self.backend.resolve("speakers/nobody"))
+
+    def test_public_ids_cannot_escape_the_root(self) -> None:
+        with self.assertRaises(ValueError):
+            self.backend.ref_path("../../etc/passwd")
+        self.assertIsNone(self.backend.resolve("../../etc/passwd"))
+
+    def test_delivery_urls_keep_cloudinary_shape(self) -> None:
+        self.assertEqual(
+            media_backends.delivery_url("f_auto,w_400", "speakers/ada"), "/cld/image/upload/f_auto,w_400/speakers/ada"
+        )
+
+    def test_eager_and_explicit_build_cached_files(self) -> None:
+        result = self.upload(eager=["c_fill,w_100,h_100"])
+        self.assertEqual(result["eager"], [{"transformation": "c_fill,w_100,h_100", "status": "processed"}])
+        self.assertEqual(len(list(self.backend.cache_dir().rglob("*.type"))), 1)
+
+        self.backend.explicit("speakers/ada", eager=["c_limit,w_200"])
+        self.assertEqual(len(list(self.backend.cache_dir().rglob("*.type"))), 2)
+        with self.assertRaises(FileNotFoundError):
+            self.backend.explicit("speakers/nobody", eager=["c_limit,w_200"])
+
+    def test_render_applies_the_transformation_subset(self) -> None:
+        source = image_bytes((800, 400))
+
+        def size(transformation: str, fmt: str = "png") -> tuple[int, int]:
+            data, _content_type = local_transform.render(source, transformation, fmt)
+            return PILImage.open(io.BytesIO(data)).size
+
+        self.assertEqual(size("c_fill,w_100,h_100"), (100, 100))
+        self.assertEqual(size("c_limit,w_2000"), (800, 400))
+        self.assertEqual(size("c_scale,w_200"), (200, 100))
+        self.assertEqual(size("c_fill,g_auto,ar_4:3,w_400"), (400, 300))
+        self.assertEqual(size("c_crop,x_100,y_0,w_300,h_200/c_scale,w_150"), (150, 100))
+        self.assertEqual(local_transform.render(source, "w_100", "webp")[1], "image/webp")
+        self.assertEqual(local_transform.render(source, "w_100")[1], "image/jpeg")
+
+    def test_format_negotiation(self) -> None:
+        self.assertEqual(local_transform.negotiate("auto", "image/avif,image/webp,*/*"), "avif")
+        self.assertEqual(local_transform.negotiate("auto", "image/webp,*/*"), "webp")
+        self.assertEqual(local_transform.negotiate("auto", "*/*"), "")
+        with mock.patch.object(local_transform.features, "check", return_value=False):
+            self.assertEqual(local_transform.negotiate("avif", ""), "webp")
+
+    def test_split_path_separates_steps_and_version(self) -> None:
+        self.assertEqual(
+            local_transform.split_path("c_fill,w_400/f_auto/v123/speakers/ada"),
+            (["c_fill,w_400", "f_auto"], "speakers/ada"),
+        )
+
+    def test_view_serves_cached_variants_with_etags(self) -> None:
+        self.upload()
+
+        path = "f_auto,c_fill,w_100,h_100/speakers/ada"
+        response = self.get(path, {"Accept": "image/webp"})
+        self.assertEqual((response.status_code, response["Content-Type"]), (200, "image/webp"))
+        self.assertEqual(response["Vary"], "Accept")
+        self.assertIn("immutable", response["Cache-Control"])
+
+        repeat = self.get(path, {"Accept": "image/webp", "If-None-Match": response["ETag"]})
+        self.assertEqual(repeat.status_code, 304)
+
+        with self.assertRaises(Http404):
+            self.get("w_100/speakers/nobody")
+
+    def test_other_backends_do_not_serve(self) -> None:
+        with override_settings(MEDIA_BACKEND=media_backends.CLOUDINARY), self.assertRaises(Http404):
+            self.get("w_100/speakers/ada")
+
+
+# ---------------------------------------------------------------------
+# SELF-HOSTED IMAGE ENDPOINT
+# ---------------------------------------------------------------------
+
+
+class ImageEndpointTests(CoreTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        self.enterContext(override_settings(IMAGE_DELIVERY=image_endpoint.SELF, IMAGE_ENDPOINT_CACHE_ROOT=root))
+        # Encode in a thread instead of the spawned process pool, so render can be observed.
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        self.enterContext(mock.patch.object(image_endpoint, "_executor", return_value=executor))
+        self.image = self.make_image()
+        self.preset = presets.get_preset("speaker_card")
+
+    def spy_render(self) -> Any:
+        return mock.patch.object(local_transform, "render", wraps=local_transform.render)
+
+    def test_variants_are_encoded_once_then_served_from_disk(self) -> None:
+        url = image_endpoint.variant_url(self.image, "speaker_card")
+
+        with self.spy_render() as render:
+            first = self.client.get(url, headers={"Accept": "image/webp"})
+            second = self.client.get(url, headers={"Accept": "image/webp"})
+
+        render.assert_called_once()
+        self.assertEqual((first.status_code, first["Content-Type"]), (200, "image/webp"))
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(PILImage.open(io.BytesIO(first.content)).size, (400, 400))
+        self.assertIn("Accept", first["Vary"])
+        self.assertIn("immutable", first["Cache-Control"])
+
+    def test_etag_gives_304(self) -> None:
+        url = image_endpoint.variant_url(self.image, "speaker_card")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_stale_versions_must_revalidate(self) -> None:
+        response = self.client.get(f"/img/speaker_card/{self.image.pk}/?v=old")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("immutable", response["Cache-Control"])
+
+    def test_only_presets_and_ladder_widths_are_served(self) -> None:
+        width = image_endpoint.widths(self.preset)[0]
+
+        self.assertEqual(self.client.get(f"/img/nope/{self.image.pk}/").status_code, 404)
+        self.assertEqual(self.client.get(f"/img/speaker_card/{self.image.pk}/{width + 1}.jpg").status_code, 404)
+        self.assertEqual(self.client.get(f"/img/speaker_card/{self.image.pk}/{width}.gif").status_code, 404)
+        self.assertEqual(self.client.get(f"/img/speaker_card/{self.image.pk + 1}/").status_code, 404)
+        self.assertEqual(self.client.get(f"/img/speaker_card/{self.image.pk}/{width}.jpg").status_code, 200)
+
+    def test_avif_falls_back_to_webp_without_an_encoder(self) -> None:
+        width = image_endpoint.widths(self.preset)[0]
+
+        with mock.patch.object(local_transform.features, "check", return_value=False):
+            response = self.client.get(image_endpoint.variant_url(self.image, "speaker_card", width, "avif"))
+
+        self.assertEqual(response["Content-Type"], "image/webp")
+        self.assertNotIn("Accept", response.get("Vary", ""))
+
+    def test_each_variant_has_its_own_lock_file(self) -> None:
+        steps = image_endpoint.transformation(self.image, self.preset)
+
+        variants = {fmt: image_endpoint.get_variant(self.image, steps, fmt) for fmt in ("webp", "jpg")}
+
+        locks = {path.with_suffix(".lock") for path, _content_type in variants.values()}
+        self.assertEqual(len(locks), 2)
+        self.assertTrue(all(lock.is_file() for lock in locks))
+        for fmt, (path, content_type) in variants.items():
+            self.assertEqual(content_type, local_transform.FORMATS[fmt][2])
+            self.assertEqual(path.with_suffix(".type").read_text(), content_type)
+
+    def test_concurrent_misses_wait_for_the_leader(self) -> None:
+        steps = image_endpoint.transformation(self.image, self.preset)
+        target = image_endpoint.cache_path(self.image, steps, "webp")
+        leader: Future[tuple[Path, str]] = Future()
+        leader.set_result((target, "image/webp"))
+        image_endpoint._inflight[target.name] = leader
+        self.addCleanup(image_endpoint._inflight.clear)
+
+        with self.spy_render() as render:
+            self.assertEqual(image_endpoint.get_variant(self.image, steps, "webp"), (target, "image/webp"))
+
+        render.assert_not_called()
+
+    def test_preset_tags_point_at_the_endpoint(self) -> None:
+        html = Template("{% load cloudinary_helper %}{% cld_img image preset='speaker_card' %}").render(
+            Context({"image": self.image})
+        )
+
+        self.assertEqual(html, image_endpoint.variant_url(self.image, "speaker_card"))
+        self.assertTrue(html.startswith(f"/img/speaker_card/{self.image.pk}/?v="))
+
+
+# ---------------------------------------------------------------------
+# PLACEHOLDERS
+# ---------------------------------------------------------------------
+
+
+class PlaceholderTests(CoreTestCase):
+    def test_lqip_fits_the_budget(self) -> None:
+        placeholder = placeholders.from_bytes(image_bytes((1600, 900), "JPEG"))
+
+        self.assertTrue(placeholder.lqip.startswith("data:image/webp;base64,"))
+        self.assertLessEqual(len(placeholder.lqip), placeholders.MAX_LQIP_LENGTH)
+
+    def test_dominant_colour_ignores_transparent_pixels(self) -> None:
+        logo = PILImage.new("RGBA", (100, 100), (0, 0, 0, 0))
+        logo.paste((204, 17, 34, 255), (30, 30, 70, 70))
+        buffer = io.BytesIO()
+        logo.save(buffer, "PNG")
+
+        self.assertEqual(placeholders.from_bytes(buffer.getvalue()).color, "#cc1122")
+        self.assertEqual(placeholders.from_bytes(image_bytes(color="#2255aa")).color, "#2255aa")
+
+    def test_fully_transparent_images_have_no_colour(self) -> None:
+        buffer = io.BytesIO()
+        PILImage.new("RGBA", (10, 10), (0, 0, 0, 0)).save(buffer, "PNG")
+
+        self.assertEqual(placeholders.from_bytes(buffer.getvalue()).color, placeholders.UNKNOWN_COLOR)
+
+    def test_style_tag_paints_colour_and_preview(self) -> None:
+        snippet = mock.Mock(placeholder_color="#2255aa", placeholder_lqip="data:image/webp;base64,AAAA")
+
+        style = Template('{% load cloudinary_helper %}{% placeholder_style snippet fit="contain" %}').render(
+            Context({"snippet": snippet})
+        )
+
+        self.assertEqual(
+            style,
+            "background-color:#2255aa;background-image:url(data:image/webp;base64,AAAA);background-size:contain;"
+            "background-position:center;background-repeat:no-repeat",
+        )
+
+    def test_style_tag_drops_unexpected_values(self) -> None:
+        snippet = mock.Mock(placeholder_color="red;position:fixed", placeholder_lqip="javascript:alert(1)")
+
+        self.assertEqual(cloudinary_helper.placeholder_style(snippet), "")
+
+
+# ---------------------------------------------------------------------
+# HERO VIDEO
+# ---------------------------------------------------------------------
+
+
+class VideoTagTests(CoreTestCase):
+    def test_stream_is_adaptive_hls(self) -> None:
+        self.assertEqual(
+            cloudinary_helper.cld_video_stream("hero/loop"),
+            "https://res.cloudinary.com/odin/video/upload/sp_auto/hero/loop.m3u8",
+        )
+        self.assertEqual(cloudinary_helper.cld_video_stream(""), "")
+
+    def test_sources_list_every_width(self) -> None:
+        sources = cloudinary_helper.cld_video_sources("hero/loop").split(", ")
+
+        self.assertEqual([source.split()[0] for source in sources], [str(w) for w in cloudinary_helper.VIDEO_WIDTHS])
+        self.assertEqual(
+            sources[0],
+            "640 https://res.cloudinary.com/odin/video/upload/f_auto,q_auto:eco,vc_auto,w_640,c_limit/hero/loop",
+        )
+
+    @override_settings(MEDIA_BACKEND=media_backends.LOCAL)
+    def test_local_backend_has_no_stream(self) -> None:
+        self.assertEqual(cloudinary_helper.cld_video_stream("hero/loop"), "")
+        self.assertTrue(cloudinary_helper.cld_video_sources("hero/loop").startswith("640 /cld/video/upload/"))
+
+    def test_preload_targets_the_avif_candidates(self) -> None:
+        html = cloudinary_helper.cld_preload("hero/poster", preset="hero_poster")
+        picture = pictures.build_picture("hero/poster", presets.get_preset("hero_poster").layout())
+
+        self.assertIn('rel="preload" as="image" type="image/avif"', html)
+        self.assertIn('fetchpriority="high"', html)
+        self.assertIn(f'imagesrcset="{picture.sources[0][1]}"', html)
+        self.assertEqual(cloudinary_helper.cld_preload(None, preset="hero_poster"), "")
+
+
+# ---------------------------------------------------------------------
+# CRITICAL CSS
+# ---------------------------------------------------------------------
+
+
+class CriticalCssTests(CoreTestCase):
+    PAGE = """
+        <html><head><title>x</title></head>
+        <body class="bg-odin-bg">
+          <header id="top" class="sticky" :class="{ 'shadow-lg': scrolled }"><img class="logo" src="x"></header>
+          <main>
+            <section class="hero-section"><h1 class="text-white">Hi</h1></section>
+            <section class="below-fold"><p class="muted">Later</p></section>
+          </main>
+        </body></html>
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        self.enterContext(override_settings(CRITICAL_CSS_DIR=root))
+
+    def test_above_the_fold_stops_after_the_first_section(self) -> None:
+        _key, used = critical_css.above_the_fold(self.PAGE)
+
+        self.assertTrue({"bg-odin-bg", "sticky", "shadow-lg", "logo", "hero-section", "text-white"} <= used.classes)
+        self.assertNotIn("below-fold", used.classes)
+        self.assertNotIn("muted", used.classes)
+        self.assertIn("top", used.ids)
+        self.assertTrue({"html", "body", "header", "main", "section", "h1", "img"} <= used.tags)
+        self.assertNotIn("p", used.tags)
+
+    def test_selector_matching(self) -> None:
+        used = critical_css.Used(classes={"sticky", "md:flex", "hero-section"}, ids={"top"}, tags={"html", "body", "a"})
+
+        self.assertTrue(critical_css.selector_matches(".sticky", used))
+        self.assertTrue(critical_css.selector_matches(r".md\:flex:hover", used))
+        self.assertTrue(critical_css.selector_matches("body .hero-section > a[href]", used))
+        self.assertTrue(critical_css.selector_matches("#top:not(.hidden)", used))
+        self.assertFalse(critical_css.selector_matches(".sticky .muted", used))
+        self.assertFalse(critical_css.selector_matches("section.hero-section", used))
+
+    def test_extract_keeps_only_what_the_fold_uses(self) -> None:
+        css = (
+            "@layer base{html{color:red}p{margin:0}}"
+            "@media (min-width:768px){.sticky{top:0}.muted{color:gray}}"
+            ".hero-section{animation:fade 1s;--tw-x:1}.muted{color:gray}"
+            "@keyframes fade{from{opacity:0}}@keyframes spin{to{rotate:1turn}}"
+            "@property --tw-x{syntax:'*'}@property --tw-y{syntax:'*'}"
+            "@font-face{font-family:Inter}"
+        )
+        used = critical_css.above_the_fold(self.PAGE)[1]
+
+        self.assertEqual(
+            critical_css.extract(css, used),
+            "@layer base{html{color:red}}@media (min-width:768px){.sticky{top:0}}"
+            ".hero-section{animation:fade 1s;--tw-x:1}@font-face{font-family:Inter}"
+            "@property --tw-x{syntax:'*'}@keyframes fade{from{opacity:0}}",
+        )
+
+    def render_tag(self, key: str) -> str:
+        context = Context()
+        context.template = mock.Mock(origin=mock.Mock(template_name=key))
+        return critical_css_tags.critical_stylesheet(context)
+
+    def test_fresh_entries_are_inlined(self) -> None:
+        critical_css.write(
+            {"cms_integration/home_page.html": ".hero-section{color:red}</style>"}, critical_css.source_fingerprint()
+        )
+
+        html = self.render_tag("cms_integration/home_page.html")
+
+        self.assertIn(".hero-section{color:red}<\\/style>", html)
+        self.assertIn('rel="preload"', html)
+        self.assertIn("<noscript>", html)
+        self.assertTrue((Path(settings.CRITICAL_CSS_DIR) / "cms_integration--home_page.css").is_file())
+
+    def test_missing_or_stale_entries_fall_back_to_the_blocking_link(self) -> None:
+        self.assertIn('<link rel="stylesheet"', self.render_tag("cms_integration/home_page.html"))
+
+        critical_css.write(
+            {"cms_integration/home_page.html": ".hero-section{color:red}"}, critical_css.source_fingerprint()
+        )
+        manifest = critical_css.read_manifest()
+        manifest["stylesheet"] = "0" * 64
+        (Path(settings.CRITICAL_CSS_DIR) / critical_css.MANIFEST).write_text(json.dumps(manifest))
+
+        self.assertIsNone(critical_css.get("cms_integration/home_page.html"))
+        self.assertIn('<link rel="stylesheet"', self.render_tag("cms_integration/home_page.html"))
+
+    def test_template_changes_make_entries_stale(self) -> None:
+        templates = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, templates, ignore_errors=True)
+        engine = {**settings.TEMPLATES[0], "DIRS": [*settings.TEMPLATES[0]["DIRS"], templates]}
+        self.enterContext(override_settings(TEMPLATES=[engine], DEBUG=True))
+        page = templates / "landing.html"
+        page.write_text('<section class="hero-section"></section>')
+        critical_css.write({"landing.html": ".hero-section{color:red}"}, critical_css.source_fingerprint())
+        self.assertEqual(critical_css.get("landing.html"), ".hero-section{color:red}")
+
+        page.write_text('<section class="hero-section text-white"></section>')
+        os.utime(page, ns=(page.stat().st_atime_ns, page.stat().st_mtime_ns + 10**9))
+
+        self.assertIsNone(critical_css.get("landing.html"))
+
+
+# ---------------------------------------------------------------------
+# STATIC ASSETS AND EARLY HINTS
+# ---------------------------------------------------------------------
+
+
+class StaticAssetTests(CoreTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        (self.root / "vendor").mkdir()
+        self.script = self.root / "vendor" / "htmx.min.js"
+        self.script.write_bytes(b"window.htmx = {};")
+        self.enterContext(override_settings(STATICFILES_DIRS=[self.root, *settings.STATICFILES_DIRS]))
+
+    def test_integrity_is_the_sha384_of_the_file(self) -> None:
+        expected = "sha384-" + base64.b64encode(hashlib.sha384(b"window.htmx = {};").digest()).decode()
+
+        self.assertEqual(static_assets.integrity(static_assets.HTMX), expected)
+        self.assertEqual(static_assets.integrity("vendor/missing.js"), "")
+
+    def test_integrity_follows_rebuilds(self) -> None:
+        before = static_assets.integrity(static_assets.HTMX)
+        self.script.write_bytes(b"window.htmx = {v: 2};")
+        os.utime(self.script, ns=(self.script.stat().st_atime_ns, self.script.stat().st_mtime_ns + 10**9))
+
+        self.assertNotEqual(static_assets.integrity(static_assets.HTMX), before)
+
+    def test_link_header_skips_files_that_are_not_built(self) -> None:
+        preloads = (
+            static_assets.Preload(static_assets.HTMX, "script"),
+            static_assets.Preload("fonts/missing.woff2", "font", "font/woff2", crossorigin=True),
+            static_assets.Preload(static_assets.HTMX, "script", rel="modulepreload"),
+        )
+
+        self.assertEqual(
+            static_assets.link_header(preloads),
+            "</static/vendor/htmx.min.js>; rel=preload; as=script, </static/vendor/htmx.min.js>; rel=modulepreload",
+        )
+        font = static_assets.Preload("fonts/x.woff2", "font", "font/woff2", crossorigin=True)
+        self.assertEqual(font.link("/f.woff2"), '</f.woff2>; rel=preload; as=font; type="font/woff2"; crossorigin')
+
+
+    def test_deploy_check_fails_until_the_scripts_are_built(self) -> None:
+        with override_settings(STATICFILES_DIRS=[self.root]):
+            errors = run_checks(include_deployment_checks=True, tags=[Tags.staticfiles])
+
+            self.assertEqual(
+                [(error.id, error.msg) for error in errors if error.id == "core.E001"],
+                [
+                    ("core.E001", "Static file vendor/gsap.min.js not found."),
+                    ("core.E001", "Static file dist/alpine.js not found."),
+                ],
+            )
+
+            (self.root / "vendor" / "gsap.min.js").write_bytes(b"window.gsap = {};")
+            (self.root / "dist").mkdir()
+            (self.root / "dist" / "alpine.js").write_bytes(b"export {};")
+
+            self.assertEqual(checks.check_front_end_assets(), [])
+
+
+class EarlyHintsTests(CoreTestCase):
+    LINK = "</static/css/tailwind.css>; rel=preload; as=style"
+
+    def respond(self, response: HttpResponse, headers: dict[str, str] | None = None) -> HttpResponse:
+        with mock.patch.object(static_assets, "link_header", return_value=self.LINK):
+            middleware = EarlyHintsMiddleware(lambda request: response)
+        return middleware(RequestFactory().get("/", headers=headers))
+
+    def test_html_pages_get_the_link_header(self) -> None:
+        self.assertEqual(self.respond(HttpResponse("<html>"))["Link"], self.LINK)
+
+    def test_other_responses_do_not(self) -> None:
+        self.assertNotIn("Link", self.respond(HttpResponse("<div>"), {"HX-Request": "true"}))
+        self.assertNotIn("Link", self.respond(HttpResponseNotModified()))
+        self.assertNotIn("Link", self.respond(HttpResponse("<html>", status=404)))
+        self.assertNotIn("Link", self.respond(HttpResponse("{}", content_type="application/json")))
+
+    def test_an_existing_link_header_is_kept(self) -> None:
+        response = HttpResponse("<html>")
+        response["Link"] = "</other>; rel=preload; as=image"
+
+        self.assertEqual(self.respond(response)["Link"], "</other>; rel=preload; as=image")
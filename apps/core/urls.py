@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from django.urls import path
+
+from . import views
+
+app_name = "core"
+
+urlpatterns = [
+    path("<str:resource_type>/upload/<path:path>", views.local_media, name="local_media"),
+]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from asgiref.sync import sync_to_async
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_safe
+from wagtail.images import get_image_model
+
+from . import image_endpoint, local_transform, media_backends, presets
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Unversioned or outdated ``?v=``: the URL may serve different bytes later.
+REVALIDATE = "public, max-age=300"
+
+
+@require_safe
+def local_media(request: HttpRequest, resource_type: str, path: str) -> HttpResponse:
+    """
+    Serve a Cloudinary-style delivery URL from the local media backend (MEDIA_BACKEND = "local").
+    """
+    backend = media_backends.get_backend()
+    if not isinstance(backend, media_backends.LocalBackend):
+        raise Http404
+
+    steps, public_id = local_transform.split_path(path)
+    transformation = "/".join(steps)
+    try:
+        file_path, content_type = local_transform.transform_to_cache(
+            backend,
+            transformation,
+            public_id,
+            accept=request.headers.get("Accept", ""),
+            resource_type=resource_type,
+        )
+    except (FileNotFoundError, ValueError) as exc:
+        raise Http404(str(exc)) from exc
+
+    etag = f'"{file_path.name}"'
+    if request.headers.get("If-None-Match") == etag:
+        response: HttpResponse = HttpResponseNotModified()
+    else:
+        response = FileResponse(file_path.open("rb"), content_type=content_type)
+    response["ETag"] = etag
+    response["Cache-Control"] = IMMUTABLE
+    if "f_auto" in transformation:
+        patch_vary_headers(response, ["Accept"])
+    return response
+
+
+@require_safe
+async def image_variant(
+    request: HttpRequest,
+    preset: str,
+    image_id: int,
+    width: int | None = None,
+    fmt: str = "",
+) -> HttpResponse:
+    """
+    A Wagtail image resized to a named preset (see apps/core/image_endpoint.py).
+    """
+    try:
+        chosen = presets.get_preset(preset)
+        image = await get_image_model().objects.aget(pk=image_id)
+    except (KeyError, get_image_model().DoesNotExist) as exc:
+        raise Http404 from exc
+    if not image_endpoint.servable(image):
+        raise Http404
+    if width is not None and (width not in image_endpoint.widths(chosen) or fmt not in image_endpoint.FORMATS):
+        raise Http404
+
+    # An explicit avif falls back to webp when Pillow can't encode AVIF.
+    negotiated = local_transform.negotiate(fmt or "auto", request.headers.get("Accept", "")) or chosen.fallback
+    try:
+        steps = image_endpoint.transformation(image, chosen, width)
+    except ValueError as exc:
+        raise Http404(str(exc)) from exc
+
+    hit = image_endpoint.cached(image_endpoint.cache_path(image, steps, negotiated))
+    if hit is None:
+        # Encoding happens in the process pool; wait for it off the event loop.
+        hit = await sync_to_async(image_endpoint.get_variant, thread_sensitive=False)(image, steps, negotiated)
+    file_path, content_type = hit
+
+    etag = f'"{file_path.name}"'
+    if request.headers.get("If-None-Match") == etag:
+        response: HttpResponse = HttpResponseNotModified()
+    else:
+        response = HttpResponse(file_path.read_bytes(), content_type=content_type)
+    response["ETag"] = etag
+    response["Cache-Control"] = IMMUTABLE if request.GET.get("v") == image_endpoint.version(image) else REVALIDATE
+    if not fmt:
+        patch_vary_headers(response, ["Accept"])
+    return response
@@ -93,6 +93,8 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "apps.core.middleware.EarlyHintsMiddleware",
+    "apps.cms_integration.middleware.BakedPageMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -149,6 +151,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "apps.cms_integration.context_processors.site_settings",
             ],
         },
     },
@@ -183,6 +186,9 @@ STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
+# Above-the-fold CSS per page template, built by `manage.py build_critical_css` (apps/core/critical_css.py).
+CRITICAL_CSS_DIR = BASE_DIR / "static" / "css" / "critical"
+
 # Cloudinary Configuration
 CLOUDINARY_STORAGE = {
     "CLOUD_NAME": config("CLOUDINARY_CLOUD_NAME", default=""),
@@ -190,6 +196,40 @@ CLOUDINARY_STORAGE = {
     "API_SECRET": config("CLOUDINARY_API_SECRET", default=""),
 }
 
+# Named Cloudinary transformation presets (apps/core/presets.py). Templates refer to these
+# by name ({% cld_img id preset="speaker_card" %}, {% cld_picture id preset=... %},
+# {% cld_image img preset-og_image %}) so every card shares one set of derived URLs.
+# Ad-hoc cld_img() widths/gravities are snapped to the nearest preset or width step.
+CLOUDINARY_PRESETS: dict[str, dict[str, object]] = {
+    "speaker_card": {"width": 400, "height": 400, "gravity": "face", "columns": "2 3 4"},
+    "sponsor_logo": {"width": 520, "height": 220, "crop": "limit", "fallback": "png", "columns": "2 3 4"},
+    "partner_logo": {"width": 480, "crop": "limit", "fallback": "png", "columns": "2 3 4"},
+    "feature_image": {"width": 800, "height": 600, "columns": "1 1 2"},
+    "testimonial_logo": {"width": 100, "crop": "limit", "fallback": "png"},
+    "hero_poster": {"width": 1920, "crop": "limit"},
+    "og_image": {"width": 1200, "height": 630},
+}
+
+# Shared width steps for srcsets and snapped ad-hoc widths: apps/core/pictures.py
+# (DEFAULT_WIDTH_STEPS). Define CLOUDINARY_WIDTH_STEPS here to override them.
+
+# Preset derivatives are built eagerly at upload (apps/cms_integration/uploads.py).
+# Async lets Cloudinary build them after the upload returns (shorter worker jobs).
+CLOUDINARY_EAGER_ASYNC: bool = config("CLOUDINARY_EAGER_ASYNC", default=False, cast=bool)
+
+# Media backend for uploads and delivery URLs: "cloudinary", or "local" for an offline
+# stand-in (content-addressed files + a Pillow transformation endpoint) in dev/CI/benchmarks.
+MEDIA_BACKEND: str = config("MEDIA_BACKEND", default="cloudinary")
+LOCAL_MEDIA_BACKEND_ROOT = BASE_DIR / "media-backend"
+LOCAL_MEDIA_BACKEND_URL = "/cld/"
+
+# Delivery of Wagtail images in preset tags: "cloudinary" (transformation URLs) or "self" to serve
+# them from the first-party /img/ endpoint (apps/core/image_endpoint.py), e.g. during an outage.
+IMAGE_DELIVERY: str = config("IMAGE_DELIVERY", default="cloudinary")
+IMAGE_ENDPOINT_URL = "/img/"
+IMAGE_ENDPOINT_CACHE_ROOT = BASE_DIR / "image-cache"
+IMAGE_ENDPOINT_WORKERS: int = config("IMAGE_ENDPOINT_WORKERS", default=2, cast=int)
+
 # Modern Storage API
 STORAGES = {
     "default": {
@@ -229,6 +269,32 @@ else:
         }
     }
 
+# Full-page cache for anonymous page views (seconds, 0 disables).
+# Entries are invalidated by version counters, so this is only an upper bound.
+PAGE_CACHE_TIMEOUT: int = config("PAGE_CACHE_TIMEOUT", default=60 * 60 * 24, cast=int)
+
+# HTMX grid partials (/hx/speakers/ etc.): rendered HTML cache (seconds, 0 disables) and
+# how long a CDN may hold a response before revalidating (browsers always revalidate).
+PARTIAL_CACHE_TIMEOUT: int = config("PARTIAL_CACHE_TIMEOUT", default=60 * 60 * 24, cast=int)
+PARTIAL_CDN_MAX_AGE: int = config("PARTIAL_CDN_MAX_AGE", default=30, cast=int)
+
+# Rows per page of the speaker/sponsor/partner listings (keyset pagination, see pagination.py).
+LISTING_PAGE_SIZE: int = config("LISTING_PAGE_SIZE", default=24, cast=int)
+
+# StreamField fragment cache ({% include_stream_cached %}). Bump BLOCK_CACHE_VERSION
+# when shared partials (cards) change; block templates are fingerprinted automatically.
+BLOCK_CACHE_TIMEOUT: int = config("BLOCK_CACHE_TIMEOUT", default=60 * 60 * 24 * 7, cast=int)
+BLOCK_CACHE_VERSION: str = config("BLOCK_CACHE_VERSION", default="1")
+
+# Rendition metadata ({% cld_image %}): (url, width, height) per image + filter spec.
+# Keys embed the image file/focal point, so replacing either invalidates them.
+RENDITION_CACHE_TIMEOUT: int = config("RENDITION_CACHE_TIMEOUT", default=60 * 60 * 24 * 30, cast=int)
+
+# Static bake (`manage.py bake_site`): pre-rendered pages served by BakedPageMiddleware,
+# or by the web server directly (e.g. nginx `try_files /baked/$host$uri/index.html @django`).
+BAKE_ENABLED: bool = config("BAKE_ENABLED", default=False, cast=bool)
+BAKE_ROOT = Path(config("BAKE_ROOT", default=str(BASE_DIR / "baked")))
+
 # ---------------------------------------------------------------------------
 # 10. API & Security (DRF, JWT, CORS)
 # ---------------------------------------------------------------------------
@@ -8,15 +8,30 @@ from wagtail import urls as wagtail_urls
 from wagtail.admin import urls as wagtailadmin_urls
 from wagtail.documents import urls as wagtaildocs_urls
 
+from apps.core import views as core_views
+
+_img = settings.IMAGE_ENDPOINT_URL.strip("/")
+
 urlpatterns = [
     path("django-admin/", admin.site.urls),
     path("admin/", include(wagtailadmin_urls)),
     path("documents/", include(wagtaildocs_urls)),
     # ✅ Put your HTMX endpoints under /hx/
     path("hx/", include("apps.cms_integration.urls")),
+    # First-party image variants (apps/core/image_endpoint.py), used when IMAGE_DELIVERY = "self".
+    path(f"{_img}/<slug:preset>/<int:image_id>/", core_views.image_variant, name="image_variant"),
+    path(
+        f"{_img}/<slug:preset>/<int:image_id>/<int:width>.<slug:fmt>",
+        core_views.image_variant,
+        name="image_variant_sized",
+    ),
     # ✅ Wagtail owns /
     path("", include(wagtail_urls)),
 ]
+if settings.MEDIA_BACKEND == "local":
+    # Offline stand-in for res.cloudinary.com (apps/core/media_backends.py).
+    urlpatterns.insert(0, path(settings.LOCAL_MEDIA_BACKEND_URL.strip("/") + "/", include("apps.core.urls")))
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)  # type: ignore
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)  # type: ignore
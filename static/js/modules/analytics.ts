@@ -0,0 +1,30 @@
+// Analytics & third-party scripts. Imported by alpine.ts only after cookie
+// consent, once the page is idle.
+
+let loaded = false;
+
+export function loadScripts() {
+  if (loaded) return;
+  loaded = true;
+
+  console.log("🚀 User consented. Loading Analytics & Third-party scripts...");
+
+  // Example: Google Analytics (GTM)
+  // You can replace this with the actual GTM snippet provided by Google
+  /*
+  const gtmId = 'GTM-XXXXXX'; // Replace with real ID
+  (function(w,d,s,l,i){w[l]=w[l]||[];w[l].push({'gtm.start':
+  new Date().getTime(),event:'gtm.js'});var f=d.getElementsByTagName(s)[0],
+  j=d.createElement(s),dl=l!='dataLayer'?'&l='+l:'';j.async=true;j.src=
+  'https://www.googletagmanager.com/gtm.js?id='+i+dl;f.parentNode.insertBefore(j,f);
+  })(window,document,'script','dataLayer', gtmId);
+  */
+
+  // Example: HubSpot
+  /*
+  const script = document.createElement('script');
+  script.src = "//js.hs-scripts.com/YOUR_HUB_ID.js";
+  script.async = true;
+  document.body.appendChild(script);
+  */
+}
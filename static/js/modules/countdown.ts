@@ -0,0 +1,53 @@
+// Countdown ticking for CountdownBlock, loaded on demand by the "countdown"
+// Alpine component registered in alpine.ts.
+
+export type CountdownState = {
+  expired: boolean;
+  days: string;
+  hours: string;
+  minutes: string;
+  seconds: string;
+};
+
+const pad = (value: number) => Math.floor(value).toString().padStart(2, "0");
+
+// Starts ticking `state` (the reactive Alpine component) towards `expiryRaw`;
+// returns a function that stops the timer.
+export function startCountdown(
+  state: CountdownState,
+  expiryRaw: string,
+): () => void {
+  // Parse safely (supports ISO, and also "YYYY-MM-DD HH:MM:SS")
+  const normalized = (expiryRaw || "").includes("T")
+    ? expiryRaw
+    : (expiryRaw || "").replace(" ", "T");
+
+  const ts = new Date(normalized).getTime();
+  const expiry = Number.isFinite(ts) ? ts : 0;
+  let timer: number | null = null;
+
+  const stop = () => {
+    if (timer) window.clearInterval(timer);
+    timer = null;
+  };
+
+  const tick = () => {
+    const dist = expiry ? expiry - Date.now() : 0;
+
+    if (dist <= 0) {
+      state.expired = true;
+      state.days = state.hours = state.minutes = state.seconds = "00";
+      stop();
+      return;
+    }
+
+    state.days = pad(dist / (1000 * 60 * 60 * 24));
+    state.hours = pad((dist % (1000 * 60 * 60 * 24)) / (1000 * 60 * 60));
+    state.minutes = pad((dist % (1000 * 60 * 60)) / (1000 * 60));
+    state.seconds = pad((dist % (1000 * 60)) / 1000);
+  };
+
+  tick();
+  if (!state.expired) timer = window.setInterval(tick, 1000);
+  return stop;
+}
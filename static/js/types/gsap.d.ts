@@ -1,7 +1,7 @@
 export { };
 
 declare global {
-  // GSAP is loaded globally via CDN in base.html
+  // GSAP is loaded on demand as a classic script by modules/carousel.ts
   const gsap: {
     set(targets: any, vars: Record<string, any>): any;
     to(targets: any, vars: Record<string, any>): any;